@@ -1,9 +1,14 @@
 from fastapi import HTTPException
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
 import logging
+import math
 
-from app.models.elicitation import ElicitationRequest, ElicitationResponse, ClarifyingQuestion, UserPersona
+from app.models.elicitation import ElicitationRequest, ElicitationResult, ClarifyingQuestion, UserPersona
 from app.services.gemini_service import gemini_service
+from app.services.rate_limit import QuotaExceededError, UpstreamUnavailableError
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.cache import elicitation_cache
+from app.services.single_flight import elicitation_flights
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +16,7 @@ class ElicitationController:
     """Controller for handling elicitation requests."""
     
     @staticmethod
-    async def process_elicitation(request: ElicitationRequest) -> ElicitationResponse:
+    async def process_elicitation(request: ElicitationRequest) -> ElicitationResult:
         """
         Process an elicitation request and return clarifying questions and personas.
         
@@ -19,63 +24,153 @@ class ElicitationController:
             request (ElicitationRequest): The user's project idea
             
         Returns:
-            ElicitationResponse: Structured response with questions and personas
+            ElicitationResult: Structured response with questions and personas
         """
         try:
-            print(f"🎯 Processing elicitation request...")
-            print(f"📝 Request idea: {request.idea[:100]}...")
+            logger.debug("Processing elicitation request for idea: %.100s", request.idea)
             
-            # Generate content using Gemini AI
-            print(f"🤖 Calling Gemini service...")
-            ai_response = gemini_service.generate_elicitation_content(request.idea)
-            print(f"✅ Received AI response: {ai_response}")
+            # Reuse an earlier generation for the same idea unless a fresh one is requested
+            cache_key = elicitation_cache.make_key(request.idea, gemini_service.model, gemini_service.prompt_version)
+            ai_response = None if request.bypass_cache else await elicitation_cache.get(cache_key)
             
-            # Convert AI response to structured models
-            print(f"🔄 Converting AI response to structured models...")
-            questions = [
-                ClarifyingQuestion(
-                    question=q["question"],
-                    category=q["category"],
-                    priority=q["priority"]
-                )
-                for q in ai_response.get("questions", [])
-            ]
-            print(f"❓ Created {len(questions)} questions")
-            
-            personas = [
-                UserPersona(
-                    name=p["name"],
-                    role=p["role"],
-                    description=p["description"],
-                    goals=p["goals"],
-                    pain_points=p["pain_points"]
+            if ai_response is None:
+                # Generate content using Gemini AI; identical ideas submitted at the
+                # same time share one upstream call
+                ai_response = await elicitation_flights.do(
+                    cache_key,
+                    lambda: ElicitationController._generate(request.idea, cache_key)
                 )
-                for p in ai_response.get("personas", [])
-            ]
-            print(f"👥 Created {len(personas)} personas")
+                logger.debug("Received AI response")
+            else:
+                logger.debug("Serving cached elicitation result")
             
-            # Create response
-            response = ElicitationResponse(
-                questions=questions,
-                personas=personas,
-                summary=ai_response.get("summary", "Analysis completed"),
-                next_steps=ai_response.get("next_steps", [])
-            )
+            # Convert AI response to structured models
+            response = ElicitationController._to_response(ai_response)
             
-            print(f"✅ Successfully created ElicitationResponse")
-            logger.info(f"Successfully processed elicitation for idea: {request.idea[:50]}...")
+            logger.info("Successfully processed elicitation for idea: %.50s", request.idea)
             return response
             
+        except QuotaExceededError as e:
+            logger.warning("Gemini quota exhausted: %s", e)
+            raise HTTPException(
+                status_code=429,
+                detail="Elicitation quota reached. Please retry shortly.",
+                headers={"Retry-After": str(math.ceil(e.retry_after))}
+            )
+        except CircuitOpenError as e:
+            logger.warning("Failing fast: %s", e)
+            raise HTTPException(
+                status_code=503,
+                detail="Elicitation service is temporarily unavailable. Please retry shortly.",
+                headers={"Retry-After": str(math.ceil(e.retry_after))}
+            )
+        except UpstreamUnavailableError as e:
+            logger.warning("Gemini unavailable: %s", e)
+            raise HTTPException(
+                status_code=503,
+                detail="Elicitation service is temporarily unavailable. Please retry shortly."
+            )
         except Exception as e:
-            print(f"❌ Error in process_elicitation: {str(e)}")
-            print(f"❌ Error type: {type(e)}")
-            import traceback
-            print(f"❌ Full traceback: {traceback.format_exc()}")
-            logger.error(f"Error processing elicitation: {str(e)}")
+            logger.exception("Error processing elicitation: %s", e)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to process elicitation request: {str(e)}"
             )
 
+    @staticmethod
+    async def _generate(idea: str, cache_key: str) -> Dict[str, Any]:
+        """Call Gemini once and cache the result."""
+        ai_response = await gemini_service.generate_elicitation_content_async(idea)
+        
+        # Never persist the canned fallback returned for unparseable output
+        if not ai_response.get("is_fallback"):
+            await elicitation_cache.set(cache_key, ai_response)
+        return ai_response
+    
+    @staticmethod
+    async def stream_elicitation(request: ElicitationRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream an elicitation, yielding questions and personas as they are generated.
+        
+        Cached results are replayed as the same sequence of events. The last event
+        is ``result`` with the full ElicitationResult, or ``error`` on failure.
+        
+        Args:
+            request (ElicitationRequest): The user's project idea
+            
+        Yields:
+            Dicts with an ``event`` of ``question``, ``persona``, ``result`` or ``error``
+        """
+        try:
+            cache_key = elicitation_cache.make_key(request.idea, gemini_service.model, gemini_service.prompt_version)
+            ai_response = None if request.bypass_cache else await elicitation_cache.get(cache_key)
+            
+            if ai_response is None:
+                async for event in gemini_service.stream_elicitation_content(request.idea):
+                    if event["event"] == "result":
+                        ai_response = event["data"]
+                    else:
+                        yield event
+                
+                # Never persist the canned fallback returned for unparseable output
+                if not ai_response.get("is_fallback"):
+                    await elicitation_cache.set(cache_key, ai_response)
+            else:
+                logger.debug("Serving cached elicitation result")
+                for question in ai_response.get("questions", []):
+                    yield {"event": "question", "data": question}
+                for persona in ai_response.get("personas", []):
+                    yield {"event": "persona", "data": persona}
+            
+            response = ElicitationController._to_response(ai_response)
+            yield {"event": "result", "data": response.model_dump()}
+            
+        except QuotaExceededError as e:
+            logger.warning("Gemini quota exhausted: %s", e)
+            yield {"event": "error", "status": 429, "detail": "Elicitation quota reached. Please retry shortly.",
+                   "retry_after": math.ceil(e.retry_after)}
+        except CircuitOpenError as e:
+            logger.warning("Failing fast: %s", e)
+            yield {"event": "error", "status": 503, "detail": "Elicitation service is temporarily unavailable. Please retry shortly.",
+                   "retry_after": math.ceil(e.retry_after)}
+        except UpstreamUnavailableError as e:
+            logger.warning("Gemini unavailable: %s", e)
+            yield {"event": "error", "status": 503, "detail": "Elicitation service is temporarily unavailable. Please retry shortly."}
+        except Exception as e:
+            logger.exception("Error streaming elicitation: %s", e)
+            yield {"event": "error", "status": 500, "detail": f"Failed to process elicitation request: {str(e)}"}
+    
+    @staticmethod
+    def _to_response(ai_response: Dict[str, Any]) -> ElicitationResult:
+        """Convert a parsed Gemini response to structured models."""
+        questions = [
+            ClarifyingQuestion(
+                question=q["question"],
+                category=q["category"],
+                priority=q["priority"]
+            )
+            for q in ai_response.get("questions", [])
+        ]
+        
+        personas = [
+            UserPersona(
+                name=p["name"],
+                role=p["role"],
+                description=p["description"],
+                goals=p["goals"],
+                pain_points=p["pain_points"]
+            )
+            for p in ai_response.get("personas", [])
+        ]
+        logger.debug("Created %d questions and %d personas", len(questions), len(personas))
+        
+        return ElicitationResult(
+            questions=questions,
+            personas=personas,
+            summary=ai_response.get("summary", "Analysis completed"),
+            next_steps=ai_response.get("next_steps", []),
+            is_fallback=ai_response.get("is_fallback", False)
+        )
+
 # Create a singleton instance
 elicitation_controller = ElicitationController() 
\ No newline at end of file
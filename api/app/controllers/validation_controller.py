@@ -1,9 +1,23 @@
 from fastapi import HTTPException
-from typing import Dict, Any
+from pydantic import ValidationError
+from typing import Dict, Any, AsyncIterator, List, Optional
 import logging
+import time
 
-from app.models.validation import ValidationRequest, ValidationResponse
+from app.models.validation import (
+    ValidationRequest, ValidationResponse,
+    ValidationBatchRequest, ValidationBatchResponse, ValidationBatchItem
+)
+from app.services.validation_pool import validation_pool, PoolSaturatedError, PoolTimeoutError
+from app.services.cache import validation_cache
 from app.services.validation_service import validation_service
+from app.services.single_flight import validation_flights
+from app.services.micro_batch import validation_batcher
+from app.core.config import settings
+from app.core.metrics import (
+    validation_stage_seconds, validation_stages_skipped_total, validation_serialization_seconds,
+    validation_document_chars, validation_issue_count
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,45 +35,293 @@ class ValidationController:
         Returns:
             ValidationResponse: Structured response with validation results
         """
+        # The budget starts when the request arrives, so pool queueing counts against it
+        deadline = time.time() + request.deadline_ms / 1000 if request.deadline_ms else None
         try:
-            print(f"🎯 Processing validation request...")
-            print(f"📄 Document length: {len(request.document)} characters")
-            print(f"🎯 Focus areas: {request.focus_areas}")
+            logger.debug("Processing validation request: %d characters, focus areas %s, %s mode",
+                         len(request.document), request.focus_areas, request.mode.value)
             
-            # Validate document using validation service
-            print(f"🔍 Calling validation service...")
-            validation_result = validation_service.validate_document(
-                request.document, 
-                request.focus_areas
+            # Serve repeated validations of the same document from the result cache
+            cache_key = validation_cache.make_key(
+                await validation_pool.ruleset_version(),
+                request.document,
+                request.focus_areas,
+                request.mode.value
             )
-            print(f"✅ Received validation result")
+            validation_result = await validation_cache.get(cache_key)
+            
+            if validation_result is None and deadline is not None:
+                # A deadline request neither waits for a micro-batch window nor
+                # shares a flight that may have a longer budget
+                validation_result = await ValidationController._validate(request, cache_key, deadline)
+            elif validation_result is None:
+                # Validate document on the worker pool so the event loop stays free;
+                # identical documents submitted at the same time share one pool task
+                validation_result = await validation_flights.do(
+                    cache_key,
+                    lambda: ValidationController._validate(request, cache_key)
+                )
+                logger.debug("Received validation result")
+            else:
+                logger.debug("Serving cached validation result")
             
             # Create response
-            response = ValidationResponse(
-                issues=validation_result["issues"],
-                summary=validation_result["summary"],
-                score=validation_result["score"],
-                suggestions=validation_result["suggestions"],
-                word_count=validation_result["word_count"],
-                issue_count=validation_result["issue_count"]
-            )
+            with validation_serialization_seconds.time():
+                response = ValidationController._to_response(validation_result)
+            ValidationController._observe(request, response)
             
-            print(f"✅ Successfully created ValidationResponse")
-            print(f"📊 Quality score: {response.score}")
-            print(f"❌ Issues found: {response.issue_count}")
-            logger.info(f"Successfully processed validation for document: {len(request.document)} chars")
+            logger.info("Successfully processed validation for document: %d chars, score %s, %d issues",
+                        len(request.document), response.score, response.issue_count)
             return response
             
+        except PoolSaturatedError as e:
+            logger.warning("Validation pool saturated: %s", e)
+            raise HTTPException(
+                status_code=503,
+                detail="Validation service is busy. Please retry shortly."
+            )
+        except PoolTimeoutError as e:
+            logger.warning("Validation timed out: %s", e)
+            raise HTTPException(
+                status_code=504,
+                detail=str(e)
+            )
         except Exception as e:
-            print(f"❌ Error in process_validation: {str(e)}")
-            print(f"❌ Error type: {type(e)}")
-            import traceback
-            print(f"❌ Full traceback: {traceback.format_exc()}")
-            logger.error(f"Error processing validation: {str(e)}")
+            logger.exception("Error processing validation: %s", e)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to process validation request: {str(e)}"
             )
 
+    @staticmethod
+    async def _validate(request: ValidationRequest, cache_key: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Validate on the pool and cache the JSON-ready result."""
+        if settings.validation_microbatch_enabled and deadline is None:
+            # Concurrent requests share one nlp.pipe call on a worker
+            validation_result = await validation_batcher.submit(request.document, request.focus_areas, request.mode.value)
+        else:
+            validation_result = await validation_pool.validate(
+                request.document, 
+                request.focus_areas,
+                request.mode.value,
+                deadline
+            )
+        # Stage timings go to the metrics, not into the cached result
+        for stage_name, seconds in validation_result.pop("timings", {}).items():
+            validation_stage_seconds.observe(seconds, stage=stage_name)
+        for stage_name in validation_result.get("stages_skipped", []):
+            validation_stages_skipped_total.inc(stage=stage_name, mode=request.mode.value)
+        validation_result = {
+            **validation_result,
+            "issues": [issue.model_dump(mode="json") for issue in validation_result["issues"]]
+        }
+        # Rule-only results from a worker still loading its model, and results
+        # cut short by a deadline, are not cached
+        if not validation_result.get("degraded") and not validation_result.get("stages_skipped"):
+            await validation_cache.set(cache_key, validation_result)
+        return validation_result
+    
+    @staticmethod
+    async def process_batch(request: ValidationBatchRequest) -> ValidationBatchResponse:
+        """
+        Validate many documents, reporting failures per document.
+        
+        Cached documents are answered from the cache; the rest are validated
+        together on the pool with spaCy's nlp.pipe. A document that is invalid
+        or fails to validate gets an ``error`` entry while the others succeed.
+        
+        Args:
+            request (ValidationBatchRequest): The documents to validate
+            
+        Returns:
+            ValidationBatchResponse: One result or error per document, in request order
+        """
+        try:
+            logger.debug("Processing batch validation request: %d documents, focus areas %s, %s mode",
+                         len(request.documents), request.focus_areas, request.mode.value)
+            ruleset_version = await validation_pool.ruleset_version()
+            
+            items: List[Optional[ValidationBatchItem]] = [None] * len(request.documents)
+            pending = []
+            for index, document in enumerate(request.documents):
+                error = ValidationController._document_error(document, request.focus_areas)
+                if error is not None:
+                    items[index] = ValidationBatchItem(index=index, error=error)
+                    continue
+                cache_key = validation_cache.make_key(ruleset_version, document, request.focus_areas, request.mode.value)
+                validation_result = await validation_cache.get(cache_key)
+                if validation_result is not None:
+                    items[index] = ValidationController._batch_item(index, document, validation_result)
+                else:
+                    pending.append((index, cache_key))
+            
+            if pending:
+                outcomes = await validation_pool.validate_batch(
+                    [request.documents[index] for index, _ in pending],
+                    request.focus_areas,
+                    request.batch_size,
+                    mode=request.mode.value
+                )
+                for (index, cache_key), outcome in zip(pending, outcomes):
+                    if "error" in outcome:
+                        items[index] = ValidationBatchItem(index=index, error=outcome["error"])
+                        continue
+                    for stage_name, seconds in outcome["result"].pop("timings", {}).items():
+                        validation_stage_seconds.observe(seconds, stage=stage_name)
+                    validation_result = {
+                        **outcome["result"],
+                        "issues": [issue.model_dump(mode="json") for issue in outcome["result"]["issues"]]
+                    }
+                    if not validation_result.get("degraded"):
+                        await validation_cache.set(cache_key, validation_result)
+                    items[index] = ValidationController._batch_item(index, request.documents[index], validation_result)
+            
+            failed_count = sum(1 for item in items if item.error is not None)
+            logger.info("Successfully processed batch validation: %d documents (%d validated, %d cached, %d failed)",
+                        len(items), len(pending), len(items) - len(pending) - failed_count, failed_count)
+            return ValidationBatchResponse(results=items, document_count=len(items), failed_count=failed_count)
+            
+        except PoolSaturatedError as e:
+            logger.warning("Validation pool saturated: %s", e)
+            raise HTTPException(
+                status_code=503,
+                detail="Validation service is busy. Please retry shortly."
+            )
+        except PoolTimeoutError as e:
+            logger.warning("Batch validation timed out: %s", e)
+            raise HTTPException(
+                status_code=504,
+                detail=str(e)
+            )
+        except Exception as e:
+            logger.exception("Error processing batch validation: %s", e)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to process batch validation request: {str(e)}"
+            )
+    
+    @staticmethod
+    def _document_error(document: str, focus_areas: Optional[List[str]]) -> Optional[str]:
+        """Apply the single-document request constraints to one batch document."""
+        try:
+            ValidationRequest(document=document, focus_areas=focus_areas)
+        except ValidationError as e:
+            return "; ".join(error["msg"] for error in e.errors())
+        return None
+    
+    @staticmethod
+    def _batch_item(index: int, document: str, validation_result: Dict[str, Any]) -> ValidationBatchItem:
+        response = ValidationController._to_response(validation_result)
+        validation_document_chars.observe(len(document))
+        validation_issue_count.observe(response.issue_count)
+        return ValidationBatchItem(index=index, result=response)
+    
+    @staticmethod
+    async def stream_validation(request: ValidationRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Validate a document stage by stage, yielding an event as each stage finishes.
+        
+        Stages run in plan order (rules, then NER, then completeness), each as its
+        own task on the worker pool, so cheap rule-based issues reach the client
+        before the spaCy parse is done. A stage expected to overrun the request's
+        deadline is reported as skipped. The last event carries the full
+        ValidationResponse; failures end the stream with an ``error`` event.
+        
+        Args:
+            request (ValidationRequest): The document to validate
+            
+        Yields:
+            Dicts with an ``event`` of ``stage``, ``result`` or ``error``
+        """
+        started = time.perf_counter()
+        deadline = time.time() + request.deadline_ms / 1000 if request.deadline_ms else None
+        mode = request.mode.value
+        try:
+            cache_key = validation_cache.make_key(
+                await validation_pool.ruleset_version(),
+                request.document,
+                request.focus_areas,
+                mode
+            )
+            validation_result = await validation_cache.get(cache_key)
+            
+            if validation_result is None:
+                all_issues = []
+                stages_run = []
+                stages_skipped = []
+                degraded = False
+                for stage in validation_service.plan_stages(request.focus_areas, mode):
+                    stage_result = await validation_pool.run_stage(stage.name, request.document, deadline)
+                    if stage_result["reason"] == "deadline":
+                        stages_skipped.append(stage.name)
+                        validation_stages_skipped_total.inc(stage=stage.name, mode=mode)
+                    elif stage_result["skipped"]:
+                        degraded = True
+                    else:
+                        validation_stage_seconds.observe(stage_result["seconds"], stage=stage.name)
+                        all_issues.extend(stage_result["issues"])
+                        stages_run.append(stage.name)
+                    yield {
+                        "event": "stage",
+                        "stage": stage.name,
+                        "skipped": stage_result["skipped"],
+                        "reason": stage_result["reason"],
+                        "issues": [issue.model_dump(mode="json") for issue in stage_result["issues"]],
+                        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+                    }
+                
+                with validation_stage_seconds.time(stage="scoring"):
+                    validation_result = validation_service.build_result(
+                        request.document, all_issues, stages_run, degraded, stages_skipped, mode
+                    )
+                validation_result = {
+                    **validation_result,
+                    "issues": [issue.model_dump(mode="json") for issue in all_issues]
+                }
+                if not degraded and not stages_skipped:
+                    await validation_cache.set(cache_key, validation_result)
+            else:
+                logger.debug("Serving cached validation result")
+            
+            with validation_serialization_seconds.time():
+                response = ValidationController._to_response(validation_result)
+            ValidationController._observe(request, response)
+            yield {
+                "event": "result",
+                "response": response.model_dump(mode="json"),
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+            }
+            
+        except PoolSaturatedError as e:
+            logger.warning("Validation pool saturated: %s", e)
+            yield {"event": "error", "status": 503, "detail": "Validation service is busy. Please retry shortly."}
+        except PoolTimeoutError as e:
+            logger.warning("Validation timed out: %s", e)
+            yield {"event": "error", "status": 504, "detail": str(e)}
+        except Exception as e:
+            logger.exception("Error streaming validation: %s", e)
+            yield {"event": "error", "status": 500, "detail": f"Failed to process validation request: {str(e)}"}
+    
+    @staticmethod
+    def _observe(request: ValidationRequest, response: ValidationResponse) -> None:
+        """Record the document size and issue count distributions."""
+        validation_document_chars.observe(len(request.document))
+        validation_issue_count.observe(response.issue_count)
+    
+    @staticmethod
+    def _to_response(validation_result: Dict[str, Any]) -> ValidationResponse:
+        return ValidationResponse(
+            issues=validation_result["issues"],
+            summary=validation_result["summary"],
+            score=validation_result["score"],
+            suggestions=validation_result["suggestions"],
+            word_count=validation_result["word_count"],
+            issue_count=validation_result["issue_count"],
+            degraded=validation_result.get("degraded", False),
+            stages_run=validation_result.get("stages_run", []),
+            stages_skipped=validation_result.get("stages_skipped", []),
+            mode=validation_result.get("mode", "standard")
+        )
+
 # Create a singleton instance
 validation_controller = ValidationController() 
\ No newline at end of file
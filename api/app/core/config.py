@@ -8,13 +8,68 @@ class Settings(BaseSettings):
     debug: bool = False
     reload: bool = False
     
+    # Logging Configuration
+    log_level: str = "INFO"  # "WARNING" in production keeps hot-path logging nearly free
+    log_format: str = "text"  # "text" or "json"
+    log_queue: bool = False  # write log records from a background thread
+    
     # Gemini API Configuration
     gemini_api_key: Optional[str] = None
+    gemini_base_url: Optional[str] = None  # e.g. the local fake in benchmarks/fake_gemini.py
+    gemini_max_connections: int = 64
+    
+    # Gemini Rate Limit Configuration
+    gemini_requests_per_minute: float = 30.0  # client-side token bucket, set to the project's RPM quota
+    gemini_burst: int = 5
+    gemini_max_concurrency: int = 8
+    gemini_max_retries: int = 4
+    gemini_backoff_base: float = 0.5  # seconds, doubled per retry with full jitter
+    gemini_backoff_max: float = 8.0
+    gemini_deadline: float = 30.0  # total seconds per elicitation, including waits and retries
+    
+    # Gemini Circuit Breaker Configuration
+    gemini_breaker_failure_threshold: int = 5  # consecutive failed elicitations before failing fast
+    gemini_breaker_reset_timeout: float = 30.0  # seconds between background recovery probes
+    gemini_health_ttl: float = 60.0  # seconds a health probe result is reused
     
     # Supabase Configuration
     supabase_url: Optional[str] = None
     supabase_key: Optional[str] = None
     
+    # spaCy Configuration
+    spacy_model: str = "en_core_web_sm"
+    spacy_auto_download: bool = True  # download a missing model in the background loader
+    spacy_pipeline_profile: str = "full"  # "full", or opt-in "ner" (ner + senter only, different sentence boundaries)
+    
+    # Validation Executor Configuration
+    validation_executor: str = "process"  # "process" or "thread"
+    validation_pool_size: int = 2
+    validation_queue_depth: int = 16
+    validation_task_timeout: float = 30.0
+    
+    # Validation Batch Configuration
+    validation_batch_size: int = 32  # documents per nlp.pipe batch
+    validation_batch_n_process: int = 1  # processes nlp.pipe parses with inside each worker
+    
+    # Validation Micro-batching Configuration
+    validation_microbatch_enabled: bool = True  # group concurrent /validate requests into one nlp.pipe call
+    validation_microbatch_window_ms: float = 5.0
+    validation_microbatch_max_size: int = 16
+    
+    # Validation Result Cache Configuration
+    validation_cache_enabled: bool = True
+    validation_cache_size: int = 512
+    validation_cache_ttl: float = 3600.0
+    validation_cache_path: Optional[str] = None  # SQLite file shared by workers, e.g. "validation_cache.db"
+    
+    # Elicitation Cache Configuration
+    elicitation_cache_enabled: bool = True
+    elicitation_cache_backend: str = "sqlite"  # "sqlite" or "supabase"
+    elicitation_cache_path: str = "elicitation_cache.db"
+    elicitation_cache_table: str = "elicitation_cache"
+    elicitation_cache_max_entries: int = 1000
+    elicitation_cache_ttl: Optional[float] = 7 * 24 * 3600.0
+    
     # CORS Configuration
     cors_origins: list = ["*"]
     
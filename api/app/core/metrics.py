@@ -0,0 +1,207 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond rule matching to slow Gemini calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """Value that can go up and down, e.g. a configured limit."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels (Prometheus semantics)."""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        # Per label set: [count per bucket (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the ``with`` block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = 'le="' + _format_value(bound) + '"'
+                    lines.append(f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_label_text(self.labelnames, key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_label_text(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds the API's metrics and renders them in the Prometheus text format.
+
+    Metrics are per process; when running several uvicorn workers, scrape each
+    worker or aggregate in Prometheus.
+    """
+
+    def __init__(self):
+        self._metrics: list = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float] = LATENCY_BUCKETS,
+                  labelnames: Sequence[str] = ()) -> Histogram:
+        metric = Histogram(name, documentation, buckets, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+# Create a singleton registry and the API's metrics
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "praxify_http_requests_total", "HTTP requests by route, method and status code",
+    ["route", "method", "status"]
+)
+http_request_seconds = registry.histogram(
+    "praxify_http_request_duration_seconds", "HTTP request latency by route",
+    labelnames=["route", "method"]
+)
+validation_stage_seconds = registry.histogram(
+    "praxify_validation_stage_seconds", "Time spent in each validate_document stage (rules, ner, completeness, consistency, scoring)",
+    labelnames=["stage"]
+)
+validation_stages_skipped_total = registry.counter(
+    "praxify_validation_stages_skipped_total", "Stages skipped because they were expected to overrun the request's deadline",
+    ["stage", "mode"]
+)
+validation_serialization_seconds = registry.histogram(
+    "praxify_validation_serialization_seconds", "Time spent building the ValidationResponse model"
+)
+validation_document_chars = registry.histogram(
+    "praxify_validation_document_chars", "Size of validated documents in characters",
+    buckets=(100, 250, 500, 1000, 2000, 4000, 6000, 8000, 10000)
+)
+validation_issue_count = registry.histogram(
+    "praxify_validation_issues", "Issues found per validated document",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250)
+)
+gemini_request_seconds = registry.histogram(
+    "praxify_gemini_request_seconds", "Latency of individual Gemini round trips by outcome",
+    labelnames=["operation", "outcome"]
+)
+gemini_parse_failures_total = registry.counter(
+    "praxify_gemini_parse_failures_total",
+    "Gemini completions that did not match the elicitation schema and were answered with fallback content"
+)
+microbatch_window_seconds = registry.gauge(
+    "praxify_validation_microbatch_window_seconds", "How long the micro-batcher waits for more validate requests"
+)
+microbatch_max_size = registry.gauge(
+    "praxify_validation_microbatch_max_size", "Documents that flush a micro-batch immediately"
+)
+microbatch_size = registry.histogram(
+    "praxify_validation_microbatch_size", "Documents per micro-batch sent to nlp.pipe",
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+microbatch_wait_seconds = registry.histogram(
+    "praxify_validation_microbatch_wait_seconds", "Time the first request of a micro-batch waited for it to flush"
+)
+microbatch_flushes_total = registry.counter(
+    "praxify_validation_microbatch_flushes_total", "Micro-batch flushes by trigger (window or full)",
+    ["reason"]
+)
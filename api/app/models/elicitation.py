@@ -8,11 +8,15 @@ class ElicitationRequest(BaseModel):
         min_length=10,
         max_length=2000
     )
+    bypass_cache: bool = Field(
+        default=False,
+        description="Skip cached results and request a fresh generation"
+    )
 
 class ClarifyingQuestion(BaseModel):
     question: str = Field(..., description="A clarifying question about the project")
-    category: str = Field(..., description="Category of the question (e.g., 'functional', 'technical', 'business')")
-    priority: str = Field(..., description="Priority level (high, medium, low)")
+    category: str = Field(..., description="Category of the question: functional, technical, business, user or legal/compliance")
+    priority: str = Field(..., description="Priority level: high, medium or low")
 
 class UserPersona(BaseModel):
     name: str = Field(..., description="Name of the persona")
@@ -25,4 +29,11 @@ class ElicitationResponse(BaseModel):
     questions: List[ClarifyingQuestion] = Field(..., description="List of clarifying questions")
     personas: List[UserPersona] = Field(..., description="List of user personas")
     summary: str = Field(..., description="Brief summary of the analysis")
-    next_steps: List[str] = Field(..., description="Recommended next steps") 
\ No newline at end of file
+    next_steps: List[str] = Field(..., description="Recommended next steps")
+
+class ElicitationResult(ElicitationResponse):
+    # Kept out of ElicitationResponse, which is also the schema Gemini generates against
+    is_fallback: bool = Field(
+        default=False,
+        description="True when Gemini's output could not be parsed and generic fallback content was returned"
+    )
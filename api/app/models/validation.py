@@ -15,6 +15,11 @@ class Severity(str, Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
+class ValidationMode(str, Enum):
+    FAST = "fast"  # compiled rules only
+    STANDARD = "standard"  # rules, completeness and NER
+    DEEP = "deep"  # everything, including the more expensive cross-document checks
+
 class ValidationIssue(BaseModel):
     type: IssueType = Field(..., description="Type of validation issue")
     severity: Severity = Field(..., description="Severity level of the issue")
@@ -22,6 +27,8 @@ class ValidationIssue(BaseModel):
     context: str = Field(..., description="Context where the issue was found")
     suggestion: str = Field(..., description="Suggested improvement")
     line_number: Optional[int] = Field(None, description="Line number where issue was found")
+    start_char: Optional[int] = Field(None, description="Character offset in the document where the flagged text starts")
+    end_char: Optional[int] = Field(None, description="Character offset in the document where the flagged text ends")
 
 class ValidationRequest(BaseModel):
     document: str = Field(
@@ -32,13 +39,58 @@ class ValidationRequest(BaseModel):
     )
     focus_areas: Optional[List[str]] = Field(
         default=["ambiguity", "completeness", "clarity"],
-        description="Areas to focus validation on"
+        description="Areas to focus validation on (ambiguity, clarity, vagueness, technical_debt, business_risk, entities, completeness, consistency); only stages serving them run"
+    )
+    mode: ValidationMode = Field(
+        ValidationMode.STANDARD,
+        description="Analysis tier: fast (compiled rules only), standard (rules, completeness and NER) "
+                    "or deep (standard plus the more expensive checks)"
+    )
+    deadline_ms: Optional[float] = Field(
+        None, gt=0, le=60000,
+        description="Latency budget in milliseconds; stages expected to overrun it are skipped "
+                    "and listed in stages_skipped (the fast tier's compiled rules always run)"
+    )
+
+class ValidationBatchRequest(BaseModel):
+    documents: List[str] = Field(
+        ...,
+        description="Requirements documents to validate; each must be 10 to 10000 characters, "
+                    "otherwise only that document reports an error",
+        min_length=1,
+        max_length=500
+    )
+    focus_areas: Optional[List[str]] = Field(
+        default=["ambiguity", "completeness", "clarity"],
+        description="Areas to focus validation on, applied to every document"
+    )
+    mode: ValidationMode = Field(
+        ValidationMode.STANDARD,
+        description="Analysis tier applied to every document (fast, standard or deep)"
+    )
+    batch_size: Optional[int] = Field(
+        None, ge=1, le=1000,
+        description="Documents per spaCy nlp.pipe batch (server default when omitted)"
     )
 
 class ValidationResponse(BaseModel):
     issues: List[ValidationIssue] = Field(..., description="List of validation issues found")
     summary: str = Field(..., description="Brief summary of validation results")
-    score: float = Field(..., description="Overall quality score (0-100)")
+    score: Optional[float] = Field(..., description="Overall quality score (0-100); null when no analysis stage ran within deadline_ms")
     suggestions: List[str] = Field(..., description="General improvement suggestions")
     word_count: int = Field(..., description="Total word count of document")
-    issue_count: int = Field(..., description="Total number of issues found") 
\ No newline at end of file
+    issue_count: int = Field(..., description="Total number of issues found")
+    degraded: bool = Field(False, description="True when NER was unavailable and only rule-based checks ran")
+    stages_run: List[str] = Field(default_factory=list, description="Analysis stages that ran for this request")
+    stages_skipped: List[str] = Field(default_factory=list, description="Planned stages skipped to stay within deadline_ms")
+    mode: ValidationMode = Field(ValidationMode.STANDARD, description="Analysis tier the result was produced with")
+
+class ValidationBatchItem(BaseModel):
+    index: int = Field(..., description="Position of the document in the request")
+    result: Optional[ValidationResponse] = Field(None, description="Validation result, when the document succeeded")
+    error: Optional[str] = Field(None, description="Why this document could not be validated")
+
+class ValidationBatchResponse(BaseModel):
+    results: List[ValidationBatchItem] = Field(..., description="One entry per document, in request order")
+    document_count: int = Field(..., description="Number of documents in the request")
+    failed_count: int = Field(..., description="Number of documents that could not be validated")
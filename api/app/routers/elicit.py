@@ -2,15 +2,19 @@ from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import JSONResponse
 import logging
 
-from app.models.elicitation import ElicitationRequest, ElicitationResponse
+from app.models.elicitation import ElicitationRequest, ElicitationResult
 from app.controllers.elicitation_controller import elicitation_controller
+from app.routers.streaming import event_stream_response, StreamFormat
 from app.core.config import settings
+from app.services.cache import elicitation_cache
+from app.services.gemini_service import gemini_service
+from app.services.single_flight import elicitation_flights
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/elicit", response_model=ElicitationResponse)
+@router.post("/elicit", response_model=ElicitationResult)
 async def elicit_requirements(request: ElicitationRequest):
     """
     Generate clarifying questions and user personas from a project idea.
@@ -25,48 +29,67 @@ async def elicit_requirements(request: ElicitationRequest):
         request (ElicitationRequest): Contains the user's project idea
         
     Returns:
-        ElicitationResponse: Structured response with questions, personas, summary, and next steps
+        ElicitationResult: Structured response with questions, personas, summary, and next steps;
+        ``is_fallback`` is True when Gemini's output could not be parsed
         
     Raises:
         HTTPException: If processing fails or API key is missing
     """
     try:
-        print(f"🚀 Elicitation endpoint called")
-        print(f"📝 Request idea: {request.idea[:100]}...")
+        logger.debug("Elicitation endpoint called for idea: %.100s", request.idea)
         
         # Validate that Gemini API key is available
-        print(f"🔑 Checking Gemini API key...")
         if not settings.gemini_api_key:
-            print(f"❌ Gemini API key not configured")
+            logger.error("Gemini API key not configured")
             raise HTTPException(
                 status_code=500,
                 detail="Gemini API key not configured. Please set GEMINI_API_KEY environment variable."
             )
-        print(f"✅ Gemini API key is configured")
         
         # Process the elicitation request
-        print(f"🔄 Processing elicitation request...")
         response = await elicitation_controller.process_elicitation(request)
         
-        print(f"✅ Successfully processed elicitation")
-        logger.info(f"Successfully generated elicitation for idea: {request.idea[:50]}...")
+        logger.info("Successfully generated elicitation for idea: %.50s", request.idea)
         return response
         
     except HTTPException:
-        print(f"❌ HTTPException raised, re-raising...")
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
-        print(f"❌ Unexpected error in elicitation endpoint: {str(e)}")
-        print(f"❌ Error type: {type(e)}")
-        import traceback
-        print(f"❌ Full traceback: {traceback.format_exc()}")
-        logger.error(f"Unexpected error in elicitation endpoint: {str(e)}")
+        logger.exception("Unexpected error in elicitation endpoint: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
 
+@router.post("/elicit/stream")
+async def stream_elicitation(request: ElicitationRequest, format: StreamFormat = "sse"):
+    """
+    Generate clarifying questions and user personas, streaming them as they are generated.
+    
+    Each question and persona is sent as its own ``question`` / ``persona`` event
+    as soon as Gemini has finished writing it. The final ``result`` event holds
+    the full ElicitationResult, which is authoritative (it replaces any
+    streamed items if the completion turned out to be malformed).
+    
+    Args:
+        request (ElicitationRequest): Contains the user's project idea
+        format (str): "sse" for text/event-stream, "ndjson" for newline-delimited JSON
+        
+    Returns:
+        StreamingResponse: The event stream
+    """
+    logger.debug("Streaming elicitation endpoint called (%s) for idea: %.100s", format, request.idea)
+    
+    if not settings.gemini_api_key:
+        logger.error("Gemini API key not configured")
+        raise HTTPException(
+            status_code=500,
+            detail="Gemini API key not configured. Please set GEMINI_API_KEY environment variable."
+        )
+    
+    return event_stream_response(elicitation_controller.stream_elicitation(request), format)
+
 @router.get("/elicit/health")
 async def elicitation_health_check():
     """
@@ -76,12 +99,11 @@ async def elicitation_health_check():
         JSONResponse: Status of the elicitation service
     """
     try:
-        print(f"🏥 Health check endpoint called")
+        logger.debug("Health check endpoint called")
         
         # Check if Gemini API key is configured
-        print(f"🔑 Checking Gemini API key in health check...")
         if not settings.gemini_api_key:
-            print(f"❌ Gemini API key not configured in health check")
+            logger.warning("Gemini API key not configured in health check")
             return JSONResponse(
                 status_code=503,
                 content={
@@ -91,22 +113,24 @@ async def elicitation_health_check():
                 }
             )
         
-        print(f"✅ Gemini API key is configured in health check")
+        # Reachability comes from a cached probe (refreshed at most every
+        # GEMINI_HEALTH_TTL seconds), not a live generation per check
+        upstream = await gemini_service.health()
         return JSONResponse(
             status_code=200,
             content={
-                "status": "healthy",
+                "status": "healthy" if upstream["ok"] and upstream["circuit"]["state"] == "closed" else "degraded",
                 "service": "elicitation",
-                "gemini_configured": True
+                "gemini_configured": True,
+                "upstream": upstream,
+                "gemini": gemini_service.stats(),
+                "cache": elicitation_cache.stats(),
+                "coalescing": elicitation_flights.stats()
             }
         )
         
     except Exception as e:
-        print(f"❌ Health check failed: {str(e)}")
-        print(f"❌ Error type: {type(e)}")
-        import traceback
-        print(f"❌ Full traceback: {traceback.format_exc()}")
-        logger.error(f"Health check failed: {str(e)}")
+        logger.exception("Health check failed: %s", e)
         return JSONResponse(
             status_code=503,
             content={
@@ -119,44 +143,41 @@ async def elicitation_health_check():
 @router.get("/elicit/test")
 async def test_gemini_service():
     """
-    Test endpoint to verify Gemini service initialization.
+    Test endpoint to verify the Gemini service can reach its model.
+    
+    Returns the cached health probe (a model metadata lookup, refreshed at most
+    every GEMINI_HEALTH_TTL seconds) instead of running a generation per call.
     
     Returns:
         JSONResponse: Test result
     """
     try:
-        print(f"🧪 Testing Gemini service initialization...")
-        
-        # Test if we can create the Gemini service
-        from app.services.gemini_service import gemini_service
-        print(f"✅ Gemini service created successfully")
-        
-        # Test if we can make a simple request
-        test_prompt = "Say hello in one word"
-        print(f"🧪 Testing simple Gemini request...")
-        
-        response = gemini_service.client.models.generate_content(
-            model=gemini_service.model,
-            contents=test_prompt
-        )
+        probe = await gemini_service.health()
         
-        print(f"✅ Simple Gemini request successful")
-        print(f"📄 Response: {response.text}")
+        if not probe["ok"]:
+            logger.warning("Gemini probe failed: %s", probe["error"])
+            return JSONResponse(
+                status_code=503,
+                content={
+                    "status": "error",
+                    "message": "Gemini service test failed",
+                    "error": probe["error"],
+                    "probe": probe
+                }
+            )
         
+        logger.debug("Gemini probe successful")
         return JSONResponse(
             status_code=200,
             content={
                 "status": "success",
                 "message": "Gemini service test passed",
-                "response": response.text
+                "probe": probe
             }
         )
         
     except Exception as e:
-        print(f"❌ Gemini service test failed: {str(e)}")
-        print(f"❌ Error type: {type(e)}")
-        import traceback
-        print(f"❌ Full traceback: {traceback.format_exc()}")
+        logger.exception("Gemini service test failed: %s", e)
         
         return JSONResponse(
             status_code=500,
@@ -0,0 +1,33 @@
+import json
+from typing import Any, AsyncIterator, Dict, Literal
+
+from fastapi.responses import StreamingResponse
+
+StreamFormat = Literal["sse", "ndjson"]
+
+
+def event_stream_response(events: AsyncIterator[Dict[str, Any]], format: StreamFormat) -> StreamingResponse:
+    """
+    Wrap an async iterator of event dicts in a streaming HTTP response.
+    
+    Args:
+        events: Dicts with an ``event`` key naming the event type
+        format (str): "sse" for text/event-stream, "ndjson" for newline-delimited JSON
+        
+    Returns:
+        StreamingResponse: The encoded event stream
+    """
+    async def encode():
+        async for event in events:
+            payload = json.dumps(event, ensure_ascii=False)
+            if format == "sse":
+                yield f"event: {event['event']}\ndata: {payload}\n\n"
+            else:
+                yield payload + "\n"
+    
+    return StreamingResponse(
+        encode(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        # Keep reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
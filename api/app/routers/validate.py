@@ -1,10 +1,16 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
+import json
 import logging
 
-from app.models.validation import ValidationRequest, ValidationResponse
+from app.models.validation import ValidationRequest, ValidationResponse, ValidationBatchRequest, ValidationBatchResponse
 from app.controllers.validation_controller import validation_controller
-from app.core.config import settings
+from app.services.validation_pool import validation_pool, PoolSaturatedError, PoolTimeoutError
+from app.services.live_validation import LiveValidationSession, LiveEditError
+from app.services.cache import validation_cache
+from app.services.single_flight import validation_flights
+from app.services.micro_batch import validation_batcher
+from app.routers.streaming import event_stream_response, StreamFormat
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +28,9 @@ async def validate_requirements(request: ValidationRequest):
     - Business risk factors
     - Overall quality score and suggestions
     
+    ``mode`` picks the analysis tier (fast, standard or deep). With ``deadline_ms``,
+    stages expected to overrun the budget are skipped and listed in ``stages_skipped``.
+    
     Args:
         request (ValidationRequest): Contains the document to validate
         
@@ -32,36 +41,137 @@ async def validate_requirements(request: ValidationRequest):
         HTTPException: If processing fails or API key is missing
     """
     try:
-        print(f"🚀 Validation endpoint called")
-        print(f"📄 Document length: {len(request.document)} characters")
-        print(f"🎯 Focus areas: {request.focus_areas}")
-        
-        # No external API dependencies for validation
-        print(f"✅ Using classic CS rule-based validation (no external APIs required)")
+        logger.debug("Validation endpoint called: %d characters, focus areas %s",
+                     len(request.document), request.focus_areas)
         
-        # Process the validation request
-        print(f"🔄 Processing validation request...")
+        # Process the validation request (classic CS rule-based validation, no external APIs)
         response = await validation_controller.process_validation(request)
         
-        print(f"✅ Successfully processed validation")
-        logger.info(f"Successfully validated document: {len(request.document)} chars")
+        logger.info("Successfully validated document: %d chars", len(request.document))
         return response
         
     except HTTPException:
-        print(f"❌ HTTPException raised, re-raising...")
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
-        print(f"❌ Unexpected error in validation endpoint: {str(e)}")
-        print(f"❌ Error type: {type(e)}")
-        import traceback
-        print(f"❌ Full traceback: {traceback.format_exc()}")
-        logger.error(f"Unexpected error in validation endpoint: {str(e)}")
+        logger.exception("Unexpected error in validation endpoint: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+@router.post("/validate/batch", response_model=ValidationBatchResponse)
+async def validate_batch(request: ValidationBatchRequest):
+    """
+    Validate many requirements documents in one request.
+    
+    All documents go through spaCy's nlp.pipe together, which is much cheaper
+    than one /validate call per document. Results come back in request order;
+    a document that is invalid or fails gets an ``error`` entry instead of
+    failing the whole batch.
+    
+    Args:
+        request (ValidationBatchRequest): The documents and shared focus areas
+        
+    Returns:
+        ValidationBatchResponse: One result or error per document
+    """
+    try:
+        logger.debug("Batch validation endpoint called: %d documents", len(request.documents))
+        return await validation_controller.process_batch(request)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Unexpected error in batch validation endpoint: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
 
+@router.post("/validate/stream")
+async def stream_validation(request: ValidationRequest, format: StreamFormat = "sse"):
+    """
+    Validate a requirements document and stream results as each stage finishes.
+    
+    Sends one ``stage`` event per analysis stage (rule-based issues first, then
+    NER, then completeness) and a final ``result`` event containing the full
+    ValidationResponse. Errors after the stream has started arrive as an
+    ``error`` event with the HTTP status the blocking endpoint would have used.
+    
+    Args:
+        request (ValidationRequest): Contains the document to validate
+        format (str): "sse" for text/event-stream, "ndjson" for newline-delimited JSON
+        
+    Returns:
+        StreamingResponse: The event stream
+    """
+    logger.debug("Streaming validation endpoint called (%s): %d characters", format, len(request.document))
+    
+    return event_stream_response(validation_controller.stream_validation(request), format)
+
+def _is_string_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+@router.websocket("/validate/live")
+async def live_validation(websocket: WebSocket):
+    """
+    Live validation over a WebSocket.
+    
+    The client first sends ``{"type": "init", "document": ..., "focus_areas": [...]}``
+    and receives a ``snapshot`` with all issues. Each later
+    ``{"type": "edit", "start": 0, "end": 1, "lines": [...]}`` replaces lines
+    ``start`` to ``end`` (0-based, end exclusive); only those lines are
+    re-analysed and the reply is a ``delta`` with added issues, removed issue
+    ids, the line shift for the rest of the document and the updated score.
+    Problems with a message are answered with ``{"type": "error", "detail": ...}``.
+    """
+    await websocket.accept()
+    session = None
+    logger.debug("Live validation session opened")
+    
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+                if not isinstance(message, dict):
+                    raise LiveEditError("Messages must be JSON objects")
+                if message.get("type") == "init":
+                    document = message.get("document", "")
+                    focus_areas = message.get("focus_areas")
+                    if not isinstance(document, str):
+                        raise LiveEditError("'document' must be a string")
+                    if focus_areas is not None and not _is_string_list(focus_areas):
+                        raise LiveEditError("'focus_areas' must be a list of strings")
+                    if len(document) > 10000:
+                        raise LiveEditError("Document too long (max 10000 characters)")
+                    session = LiveValidationSession(focus_areas)
+                    await websocket.send_json(await session.load(document))
+                elif message.get("type") == "edit":
+                    if session is None:
+                        raise LiveEditError("Send an 'init' message before editing")
+                    if not _is_string_list(message.get("lines")):
+                        raise LiveEditError("'lines' must be a list of strings")
+                    delta = await session.edit(int(message["start"]), int(message["end"]), message["lines"])
+                    await websocket.send_json(delta)
+                else:
+                    raise LiveEditError(f"Unknown message type '{message.get('type')}'")
+            except (LiveEditError, KeyError, TypeError, ValueError) as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+            except (PoolSaturatedError, PoolTimeoutError) as e:
+                await websocket.send_json({"type": "error", "detail": str(e), "retry": True})
+                
+    except WebSocketDisconnect:
+        logger.debug("Live validation session closed")
+    except Exception as e:
+        logger.exception("Live validation session failed: %s", e)
+        try:
+            await websocket.send_json({"type": "error", "detail": "Live validation failed; please reconnect"})
+            await websocket.close(code=1011)
+        except Exception:
+            pass  # the connection is already gone
+
 @router.get("/validate/health")
 async def validation_health_check():
     """
@@ -71,26 +181,29 @@ async def validation_health_check():
         JSONResponse: Status of the validation service
     """
     try:
-        print(f"🏥 Validation health check endpoint called")
+        logger.debug("Validation health check endpoint called")
         
-        # Validation service is self-contained (no external APIs)
-        print(f"✅ Validation service is self-contained")
+        # Validation service is self-contained (no external APIs); it is only
+        # degraded (rule-only) until the spaCy model has finished loading
+        model = validation_pool.model_status()
         return JSONResponse(
             status_code=200,
             content={
-                "status": "healthy",
+                "status": "healthy" if model["ready"] else "degraded",
                 "service": "validation",
                 "self_contained": True,
-                "features": ["ambiguity_check", "completeness_check", "rule_based_validation", "ner_enhanced_validation"]
+                "ready": model["ready"],
+                "model": model,
+                "features": ["ambiguity_check", "completeness_check", "rule_based_validation", "ner_enhanced_validation"],
+                "pool": validation_pool.stats(),
+                "cache": validation_cache.stats(),
+                "coalescing": validation_flights.stats(),
+                "microbatch": validation_batcher.stats()
             }
         )
         
     except Exception as e:
-        print(f"❌ Validation health check failed: {str(e)}")
-        print(f"❌ Error type: {type(e)}")
-        import traceback
-        print(f"❌ Full traceback: {traceback.format_exc()}")
-        logger.error(f"Validation health check failed: {str(e)}")
+        logger.exception("Validation health check failed: %s", e)
         return JSONResponse(
             status_code=503,
             content={
@@ -109,8 +222,6 @@ async def test_validation_service():
         JSONResponse: Test result
     """
     try:
-        print(f"🧪 Testing validation service...")
-        
         # Test document with known issues
         test_document = """
         The system should be fast and user-friendly.
@@ -120,15 +231,10 @@ async def test_validation_service():
         The system will be scalable and reliable.
         """
         
-        print(f"📄 Testing with sample document: {len(test_document)} characters")
-        
-        # Test validation service
-        from app.services.validation_service import validation_service
-        result = validation_service.validate_document(test_document)
+        # Test validation service through the same worker pool as real requests
+        result = await validation_pool.validate(test_document)
         
-        print(f"✅ Validation test successful")
-        print(f"📊 Quality score: {result['score']}")
-        print(f"❌ Issues found: {result['issue_count']}")
+        logger.debug("Validation test successful: score %s, %d issues", result["score"], result["issue_count"])
         
         return JSONResponse(
             status_code=200,
@@ -142,10 +248,7 @@ async def test_validation_service():
         )
         
     except Exception as e:
-        print(f"❌ Validation service test failed: {str(e)}")
-        print(f"❌ Error type: {type(e)}")
-        import traceback
-        print(f"❌ Full traceback: {traceback.format_exc()}")
+        logger.exception("Validation service test failed: %s", e)
         
         return JSONResponse(
             status_code=500,
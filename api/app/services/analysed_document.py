@@ -0,0 +1,38 @@
+from functools import cached_property
+from typing import Dict, List, Optional
+
+from spacy.tokens import Doc
+
+from app.services.requirement_patterns import PatternMatch, sentence_matches
+from app.services.rule_engine import line_starts, line_number_at
+
+
+class AnalysedDocument:
+    """
+    One request's document, indexed once and shared by every validation stage.
+
+    Holds the lowercased text and line start offsets up front. The spaCy parse
+    (``doc``) is attached by the NER stage, or by nlp.pipe in batch validation,
+    and its requirement pattern matches are grouped by sentence on first use.
+    Offsets are character offsets into ``text``, and ``lower`` is aligned with
+    it character for character.
+    """
+
+    def __init__(self, text: str, doc: Optional[Doc] = None):
+        self.text = text
+        self.lower = text.lower()
+        if len(self.lower) != len(text):
+            # A few characters (e.g. "İ") lowercase to two; keep offsets aligned with text
+            self.lower = "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+        self.lines = text.split('\n')
+        self.line_starts = line_starts(text)
+        self.doc = doc
+
+    def line_at(self, offset: int) -> int:
+        """1-based line number of a character offset."""
+        return line_number_at(self.line_starts, offset)
+
+    @cached_property
+    def sentence_matches(self) -> Dict[int, Dict[str, List[PatternMatch]]]:
+        """Requirement pattern matches of the parsed document, per sentence start character."""
+        return sentence_matches(self.doc)
@@ -0,0 +1,390 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable SHA-256 over JSON-serialisable parts, used as a cache key."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def normalize_idea(idea: str) -> str:
+    """Fold whitespace and case so trivially different submissions share a key."""
+    return " ".join(idea.split()).casefold()
+
+
+class LRUCache:
+    """In-process LRU cache with an entry limit and a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    Shared on-disk cache tier.
+
+    Uses SQLite in WAL mode so several uvicorn workers on the same host can read
+    and write the same file concurrently. Values are stored as JSON.
+    """
+
+    def __init__(self, path: str, table: str, max_entries: int, ttl_seconds: Optional[float]):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_created_at ON {table} (created_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds is not None and created_at + self.ttl_seconds < time.time():
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+            self._writes += 1
+            # Trim the table every few writes rather than on every insert
+            if self._writes % 32 == 0:
+                self._trim()
+            self._conn.commit()
+
+    def _trim(self) -> None:
+        """Drop expired rows and the oldest rows beyond ``max_entries``."""
+        if self.ttl_seconds is not None:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self.expirations += cursor.rowcount
+        cursor = self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self.evictions += cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+
+class ValidationResultCache:
+    """
+    Content-addressed cache for validate_document results.
+
+    Keys are a hash of (rule-set version, document, focus areas), so any change
+    to the validation rules produces new keys and stale results are never served.
+    An in-process LRU sits in front of an optional SQLite tier shared between
+    workers.
+    """
+
+    def __init__(self, enabled: bool, max_entries: int, ttl_seconds: float, shared_path: Optional[str] = None):
+        self.enabled = enabled
+        self.memory = LRUCache(max_entries, ttl_seconds)
+        self.shared: Optional[SQLiteCache] = None
+        if enabled and shared_path:
+            try:
+                self.shared = SQLiteCache(shared_path, "validation_results", max_entries * 8, ttl_seconds)
+            except sqlite3.Error as e:
+                logger.error("Shared validation cache disabled: %s", e)
+
+    @staticmethod
+    def make_key(ruleset_version: str, document: str, focus_areas: Optional[list], mode: str = "standard") -> str:
+        # Normalised like plan_stages, so requests that run the same stages share entries
+        areas = sorted({area.strip().lower() for area in focus_areas}) if focus_areas is not None else None
+        return content_hash(ruleset_version, document, areas, mode)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+
+        result = self.memory.get(key)
+        if result is None and self.shared is not None:
+            # The shared tier does disk I/O and may wait on another worker's write lock
+            result = await asyncio.to_thread(self.shared.get, key)
+            if result is not None:
+                self.memory.set(key, result)
+        return result
+
+    async def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a JSON-serialisable validation result."""
+        if not self.enabled:
+            return
+
+        self.memory.set(key, result)
+        if self.shared is not None:
+            try:
+                await asyncio.to_thread(self.shared.set, key, result)
+            except sqlite3.Error as e:
+                logger.warning("Could not write shared validation cache: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "enabled": self.enabled,
+            "entries": len(self.memory),
+            "hits": self.memory.hits,
+            "misses": self.memory.misses,
+            "evictions": self.memory.evictions,
+            "expirations": self.memory.expirations
+        }
+        if self.shared is not None:
+            stats["shared"] = {
+                "path": self.shared.path,
+                "hits": self.shared.hits,
+                "misses": self.shared.misses,
+                "evictions": self.shared.evictions,
+                "expirations": self.shared.expirations
+            }
+        return stats
+
+
+
+class SupabaseCache:
+    """
+    Cache tier stored in a Supabase table.
+
+    Expects a table with ``key text primary key``, ``value jsonb`` and
+    ``created_at double precision`` columns. Expiry is enforced on read;
+    row count limits are left to the database.
+    """
+
+    def __init__(self, url: str, key: str, table: str, ttl_seconds: Optional[float]):
+        from supabase import create_client
+
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self._client = create_client(url, key)
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        rows = self._client.table(self.table).select("value, created_at").eq("key", key).limit(1).execute().data
+        if not rows:
+            self.misses += 1
+            return None
+
+        row = rows[0]
+        if self.ttl_seconds is not None and row["created_at"] + self.ttl_seconds < time.time():
+            self._client.table(self.table).delete().eq("key", key).execute()
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return row["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        self._client.table(self.table).upsert(
+            {"key": key, "value": value, "created_at": time.time()}
+        ).execute()
+
+
+class ElicitationCache:
+    """
+    Persistent cache for Gemini elicitation results.
+
+    Keys combine the normalized idea text, the model name and a hash of the
+    prompt template, so changing the model or the prompt never serves old
+    generations. Backed by local SQLite by default, or a Supabase table.
+    Cache errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        backend: str,
+        max_entries: int,
+        ttl_seconds: Optional[float],
+        path: str,
+        table: str,
+        supabase_url: Optional[str] = None,
+        supabase_key: Optional[str] = None
+    ):
+        self.enabled = enabled
+        self.backend = backend
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.table = table
+        self.supabase_url = supabase_url
+        self.supabase_key = supabase_key
+        self.store = None
+        self.errors = 0
+        self._open_lock = threading.Lock()
+
+    def _open(self) -> Optional[Any]:
+        """
+        Open the backing store on first use.
+
+        Opening is deferred so importing this module (tests, validation pool
+        workers) never creates or locks a database file.
+        """
+        if self.store is not None or not self.enabled:
+            return self.store
+        with self._open_lock:
+            if self.store is None and self.enabled:
+                try:
+                    if self.backend == "supabase":
+                        if not (self.supabase_url and self.supabase_key):
+                            raise ValueError("SUPABASE_URL and SUPABASE_KEY are required for the supabase backend")
+                        self.store = SupabaseCache(self.supabase_url, self.supabase_key, self.table, self.ttl_seconds)
+                    else:
+                        self.store = SQLiteCache(self.path, self.table, self.max_entries, self.ttl_seconds)
+                except Exception as e:
+                    logger.error("Elicitation cache disabled: %s", e)
+                    self.enabled = False
+        return self.store
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        store = self._open()
+        return store.get(key) if store is not None else None
+
+    def _set(self, key: str, value: Dict[str, Any]) -> None:
+        store = self._open()
+        if store is not None:
+            store.set(key, value)
+
+    @staticmethod
+    def make_key(idea: str, model: str, prompt_version: str) -> str:
+        return content_hash(normalize_idea(idea), model, prompt_version)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            return await asyncio.to_thread(self._get, key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Elicitation cache read failed: %s", e)
+            return None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        try:
+            await asyncio.to_thread(self._set, key, value)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Elicitation cache write failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        if self.store is None:
+            return {"enabled": self.enabled, "backend": self.backend, "opened": False}
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend,
+            "hits": self.store.hits,
+            "misses": self.store.misses,
+            "expirations": self.store.expirations,
+            "evictions": getattr(self.store, "evictions", 0),
+            "errors": self.errors
+        }
+
+
+# Create a singleton instance
+validation_cache = ValidationResultCache(
+    enabled=settings.validation_cache_enabled,
+    max_entries=settings.validation_cache_size,
+    ttl_seconds=settings.validation_cache_ttl,
+    shared_path=settings.validation_cache_path
+)
+
+elicitation_cache = ElicitationCache(
+    enabled=settings.elicitation_cache_enabled,
+    backend=settings.elicitation_cache_backend,
+    max_entries=settings.elicitation_cache_max_entries,
+    ttl_seconds=settings.elicitation_cache_ttl,
+    path=settings.elicitation_cache_path,
+    table=settings.elicitation_cache_table,
+    supabase_url=settings.supabase_url,
+    supabase_key=settings.supabase_key
+)
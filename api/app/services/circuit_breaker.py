@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream that the breaker considers down."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with background recovery probing and a cached health probe.
+
+    After ``failure_threshold`` consecutive upstream failures the circuit opens
+    and calls fail fast with CircuitOpenError. While open, a background task
+    runs the (cheap) ``probe`` every ``reset_timeout`` seconds and closes the
+    circuit as soon as one succeeds, so user requests never serve as probes.
+
+    ``health()`` returns the last probe result while it is younger than
+    ``health_ttl``, so health checks do not hit the upstream every time.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], Awaitable[Any]],
+        failure_threshold: int,
+        reset_timeout: float,
+        health_ttl: float
+    ):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.health_ttl = health_ttl
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._last_probe: Optional[Dict[str, Any]] = None
+        self._last_probe_at = 0.0
+
+        self.times_opened = 0
+        self.rejected = 0
+        self.probes = 0
+
+    def check(self) -> None:
+        """
+        Raise CircuitOpenError if calls should not be attempted right now.
+        """
+        if self.state == self.OPEN:
+            self.rejected += 1
+            retry_after = max(1.0, self.opened_at + self.reset_timeout - time.monotonic())
+            raise CircuitOpenError(f"{self.name} circuit is open after repeated failures", retry_after=retry_after)
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        if self.state == self.OPEN:
+            self._close()
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.warning("%s circuit opened after %d consecutive failures", self.name, self.consecutive_failures)
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_until_closed())
+
+    def _close(self) -> None:
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        logger.info("%s circuit closed", self.name)
+
+    async def _probe_until_closed(self) -> None:
+        """Background recovery loop, running only while the circuit is open."""
+        while self.state == self.OPEN:
+            await asyncio.sleep(self.reset_timeout)
+            result = await self._run_probe()
+            if not result["ok"]:
+                # Keep failing fast for another full interval
+                self.opened_at = time.monotonic()
+
+    async def _run_probe(self) -> Dict[str, Any]:
+        self.probes += 1
+        started = time.monotonic()
+        try:
+            detail = await self.probe()
+            result = {"ok": True, "detail": detail}
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+        result["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+        result["checked_at"] = time.time()
+        self._last_probe = result
+        self._last_probe_at = time.monotonic()
+        if result["ok"] and self.state == self.OPEN:
+            self._close()
+        return result
+
+    async def health(self) -> Dict[str, Any]:
+        """
+        Last probe result, refreshed at most once per ``health_ttl`` seconds.
+
+        Concurrent health checks share a single refresh.
+        """
+        fresh = self._last_probe is not None and time.monotonic() - self._last_probe_at < self.health_ttl
+        if not fresh:
+            if self._health_task is None or self._health_task.done():
+                self._health_task = asyncio.get_running_loop().create_task(self._run_probe())
+            await asyncio.shield(self._health_task)
+
+        return {
+            **self._last_probe,
+            "cached_for_seconds": round(time.monotonic() - self._last_probe_at, 1),
+            "circuit": self.stats()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "probes": self.probes
+        }
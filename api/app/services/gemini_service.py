@@ -1,32 +1,103 @@
+import time
 import warnings
 from google import genai
-from google.genai import types
-import json
+from google.genai import types, errors
 import logging
-from typing import List, Dict, Any
+import httpx
+from typing import Dict, Any, Optional, AsyncIterator
 from app.core.config import settings
+from pydantic import ValidationError
+from app.models.elicitation import ClarifyingQuestion, UserPersona, ElicitationResponse
+from app.services.cache import content_hash
+from app.services.json_stream import IncrementalArrayParser
+from app.services.rate_limit import RateLimitedCaller, QuotaExceededError, UpstreamUnavailableError
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.metrics import gemini_request_seconds, gemini_parse_failures_total
 
 # Suppress Pydantic warnings from Google Generative AI SDK
 warnings.filterwarnings("ignore", message="Field name .* shadows an attribute in parent")
 
 logger = logging.getLogger(__name__)
 
+# HTTP statuses worth retrying: quota exhaustion and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TransportError, httpx.TimeoutException))
+
+def _is_quota_error(error: Exception) -> bool:
+    return isinstance(error, errors.APIError) and error.code == 429
+
 class GeminiService:
-    def __init__(self):
-        print(f"🔧 Initializing GeminiService...")
-        print(f"🔑 API Key available: {bool(settings.gemini_api_key)}")
-        if settings.gemini_api_key:
-            print(f"🔑 API Key preview: {settings.gemini_api_key[:10]}...")
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        api_key = api_key or settings.gemini_api_key
+        if not api_key:
+            logger.warning("No Gemini API key configured")
+        base_url = base_url or settings.gemini_base_url or None
+        if base_url:
+            logger.warning("Gemini requests go to %s instead of the Google API", base_url)
         
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+        # One client holds one pooled async HTTP connection set; every concurrent
+        # elicitation reuses its keep-alive connections instead of opening new ones
+        http_options = types.HttpOptions(
+            base_url=base_url,
+            async_client_args={
+                "limits": httpx.Limits(
+                    max_connections=settings.gemini_max_connections,
+                    max_keepalive_connections=settings.gemini_max_connections
+                )
+            }
+        )
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
         self.model = "gemini-2.0-flash-lite"
-        print(f"🤖 Model set to: {self.model}")
-        print(f"✅ GeminiService initialized successfully")
         
-    def generate_elicitation_content(self, project_idea: str) -> Dict[str, Any]:
+        # Client-side quota: requests wait for a token and a free slot, and 429s or
+        # transient errors are retried with jittered backoff within the deadline
+        self.limiter = RateLimitedCaller(
+            name="Gemini",
+            requests_per_minute=settings.gemini_requests_per_minute,
+            burst=settings.gemini_burst,
+            max_concurrency=settings.gemini_max_concurrency,
+            max_retries=settings.gemini_max_retries,
+            backoff_base=settings.gemini_backoff_base,
+            backoff_max=settings.gemini_backoff_max,
+            deadline=settings.gemini_deadline,
+            is_retryable=_is_retryable,
+            is_quota_error=_is_quota_error
+        )
+        
+        # Fail fast while Gemini is down; recovery and health checks use a cheap
+        # model metadata lookup instead of a generation
+        self.breaker = CircuitBreaker(
+            name="Gemini",
+            probe=self._probe,
+            failure_threshold=settings.gemini_breaker_failure_threshold,
+            reset_timeout=settings.gemini_breaker_reset_timeout,
+            health_ttl=settings.gemini_health_ttl
+        )
+        
+        # Fingerprint of the prompt template, generation settings and response
+        # schema for cache keys
+        self.prompt_version = content_hash(
+            self._build_elicitation_prompt("{project_idea}"),
+            self._generation_config().model_dump(mode="json", exclude_none=True, exclude={"response_schema"}),
+            ElicitationResponse.model_json_schema()
+        )
+        
+        # Completions that did not validate against ElicitationResponse
+        self.parse_failures = 0
+        self.responses_parsed = 0
+        logger.info("GeminiService initialized with model %s", self.model)
+        
+    async def generate_elicitation_content_async(self, project_idea: str) -> Dict[str, Any]:
         """
         Generate clarifying questions and user personas from a project idea.
         
+        The request is awaited on the event loop, so a single worker can keep many
+        Gemini calls in flight over the shared connection pool.
+        
         Args:
             project_idea (str): The user's initial project idea
             
@@ -34,132 +105,202 @@ class GeminiService:
             Dict containing questions, personas, summary, and next steps
         """
         try:
-            print(f"🔍 Starting elicitation for project idea: {project_idea[:100]}...")
-            print(f"🔑 Using Gemini API key: {settings.gemini_api_key[:10] if settings.gemini_api_key else 'NOT SET'}...")
-            print(f"🤖 Using model: {self.model}")
+            prompt = self._build_elicitation_prompt(project_idea)
+            logger.debug("Sending async elicitation request to %s (prompt %d characters)", self.model, len(prompt))
+            response = await self._guarded("generate", lambda: self.client.aio.models.generate_content(
+                model=self.model,
+                contents=prompt,
+                config=self._generation_config()
+            ))
+            
+            logger.debug("Received Gemini response (%d characters)", len(response.text or ""))
+            return self._parse_elicitation_response(response.text)
+            
+        except (QuotaExceededError, UpstreamUnavailableError, CircuitOpenError):
+            raise
+        except Exception as e:
+            logger.exception("Error generating elicitation content: %s", e)
+            raise Exception(f"Failed to generate elicitation content: {str(e)}")
+    
+    async def stream_elicitation_content(self, project_idea: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream an elicitation, yielding each question and persona as soon as it is complete.
+        
+        Items are picked out of the partial completion by an incremental JSON
+        parser while Gemini is still generating. The final ``result`` event is
+        the whole completion parsed by _parse_elicitation_response, so it is
+        authoritative and still falls back to canned data on malformed output.
+        
+        Args:
+            project_idea (str): The user's initial project idea
             
+        Yields:
+            ``{"event": "question" | "persona", "data": {...}}`` items, then
+            ``{"event": "result", "data": {...}}`` with the full parsed response
+        """
+        try:
             prompt = self._build_elicitation_prompt(project_idea)
-            print(f"📝 Generated prompt length: {len(prompt)} characters")
-            print(f"📝 Prompt preview: {prompt[:200]}...")
+            parser = IncrementalArrayParser(frozenset({"questions", "personas"}))
+            item_models = {"questions": ("question", ClarifyingQuestion), "personas": ("persona", UserPersona)}
             
-            print("🚀 Sending request to Gemini API...")
-            response = self.client.models.generate_content(
+            logger.debug("Sending streaming elicitation request to %s (prompt %d characters)", self.model, len(prompt))
+            # Opening the stream and its first chunk are retried; once items have
+            # been sent a retry would repeat them
+            stream = self._guarded_stream("stream", lambda: self.client.aio.models.generate_content_stream(
                 model=self.model,
                 contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.7,
-                    max_output_tokens=2048
-                    # thinking_config=types.ThinkingConfig(thinking_budget=12544)
-                )
-            )
-            
-            print("✅ Received response from Gemini API")
-            print(f"📄 Response type: {type(response)}")
-            print(f"📄 Response text length: {len(response.text) if hasattr(response, 'text') else 'No text attribute'}")
+                config=self._generation_config()
+            ))
+            async for chunk in stream:
+                for array_key, item in parser.feed(chunk.text or ""):
+                    event, model = item_models[array_key]
+                    try:
+                        yield {"event": event, "data": model(**item).model_dump()}
+                    except (TypeError, ValueError) as e:
+                        # Incomplete items are left to the final parse
+                        logger.warning("Skipping malformed streamed %s: %s", event, e)
             
-            # Parse the response
-            content = response.text
-            print(f"📄 Raw response content: {content}")
-            return self._parse_elicitation_response(content)
+            logger.debug("Gemini stream finished (%d characters)", len(parser.text))
+            yield {"event": "result", "data": self._parse_elicitation_response(parser.text)}
             
+        except (QuotaExceededError, UpstreamUnavailableError, CircuitOpenError):
+            raise
         except Exception as e:
-            print(f"❌ Error in generate_elicitation_content: {str(e)}")
-            print(f"❌ Error type: {type(e)}")
-            import traceback
-            print(f"❌ Full traceback: {traceback.format_exc()}")
-            logger.error(f"Error generating elicitation content: {str(e)}")
+            logger.exception("Error streaming elicitation content: %s", e)
             raise Exception(f"Failed to generate elicitation content: {str(e)}")
     
+    async def _guarded(self, operation: str, request):
+        """
+        Run a Gemini call through the circuit breaker and the rate limiter.
+        
+        Every attempt's round trip is recorded in the ``praxify_gemini_request_seconds``
+        histogram, separately from time spent waiting on the limiter.
+        
+        Raises:
+            CircuitOpenError: Without calling Gemini while the circuit is open
+        """
+        async def timed_request():
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await request()
+                outcome = "ok"
+                return result
+            except errors.APIError as e:
+                outcome = str(e.code)
+                raise
+            finally:
+                gemini_request_seconds.observe(time.perf_counter() - started, operation=operation, outcome=outcome)
+        
+        self.breaker.check()
+        try:
+            result = await self.limiter.call(timed_request)
+        except QuotaExceededError as e:
+            # Gemini answering 429 through every retry counts; local throttling does not
+            if e.upstream:
+                self.breaker.record_failure()
+            raise
+        except UpstreamUnavailableError:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+    
+    async def _guarded_stream(self, operation: str, open_stream) -> AsyncIterator[Any]:
+        """
+        Iterate a Gemini stream through the circuit breaker and the rate limiter.
+        
+        The request and every chunk run under the limiter, which holds a
+        concurrency slot for the whole stream. The breaker records the outcome
+        only once the stream has finished or failed, and the whole stream's
+        duration is recorded in ``praxify_gemini_request_seconds``.
+        
+        Raises:
+            CircuitOpenError: Without calling Gemini while the circuit is open
+        """
+        self.breaker.check()
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            async for chunk in self.limiter.stream(open_stream):
+                yield chunk
+            outcome = "ok"
+            self.breaker.record_success()
+        except QuotaExceededError as e:
+            if e.upstream:
+                outcome = "429"
+                self.breaker.record_failure()
+            else:
+                outcome = None  # turned away by the local limiter before any request
+            raise
+        except UpstreamUnavailableError:
+            self.breaker.record_failure()
+            raise
+        except errors.APIError as e:
+            outcome = str(e.code)
+            raise
+        finally:
+            if outcome:
+                gemini_request_seconds.observe(time.perf_counter() - started, operation=operation, outcome=outcome)
+    
+    async def _probe(self) -> Dict[str, Any]:
+        """Cheap reachability and credentials check: fetch the model's metadata."""
+        model = await self.client.aio.models.get(model=self.model)
+        return {"model": model.name, "input_token_limit": model.input_token_limit}
+    
+    async def health(self) -> Dict[str, Any]:
+        """Cached Gemini probe result plus circuit state."""
+        return await self.breaker.health()
+    
+    def _generation_config(self) -> types.GenerateContentConfig:
+        """Generation settings shared by the sync and async elicitation paths."""
+        # JSON mode constrained to the ElicitationResponse schema: the model can only
+        # produce output with the fields, types and ordering of the Pydantic models
+        return types.GenerateContentConfig(
+            temperature=0.7,
+            max_output_tokens=2048,
+            response_mime_type="application/json",
+            response_schema=ElicitationResponse
+            # thinking_config=types.ThinkingConfig(thinking_budget=12544)
+        )
+    
     def _build_elicitation_prompt(self, project_idea: str) -> str:
-        """Build the prompt for elicitation analysis."""
+        """Build the prompt for elicitation analysis (the output shape comes from the response schema)."""
         return f"""
-You are an expert requirements analyst helping to clarify a software project idea. 
-Analyze the following project idea and provide:
-
-1. 5-8 clarifying questions to better understand the requirements
-2. 2-3 user personas that would use this system
-3. A brief summary of the analysis
-4. Recommended next steps that can be done right now while writing the requirements
+You are an expert requirements analyst helping to clarify a software project idea.
+For the project idea below, provide 5-8 clarifying questions, 2-3 user personas
+who would use the system, a brief summary of your analysis, and next steps that
+can be done right now while writing the requirements.
 
 Project Idea: {project_idea}
 
-Please respond in the following JSON format:
-{{
-    "questions": [
-        {{
-            "question": "What specific problem are you trying to solve?",
-            "category": "functional",
-            "priority": "high"
-        }}
-    ],
-    "personas": [
-        {{
-            "name": "Primary User",
-            "role": "End User",
-            "description": "Description of the persona",
-            "goals": ["Goal 1", "Goal 2"],
-            "pain_points": ["Pain point 1", "Pain point 2"]
-        }}
-    ],
-    "summary": "Brief analysis of the project idea",
-    "next_steps": ["Step 1", "Step 2", "Step 3"]
-}}
-
-Focus on:
-- Uncovering hidden requirements
-- Identifying stakeholders
-- Understanding business context
-- Technical feasibility considerations
-- User experience requirements
-
-Choose question categories from this list: functional, technical, business, user, legal/compliance
-
-Ensure all questions are specific and actionable.
-Provide your response in a friendly and conversational tone. Use Bahasa Indonesia.
+Focus on uncovering hidden requirements, identifying stakeholders, the business
+context, technical feasibility and user experience requirements. Make every
+question specific and actionable.
+Use a friendly, conversational tone in Bahasa Indonesia.
 """
     
     def _parse_elicitation_response(self, content: str) -> Dict[str, Any]:
-        """Parse the Gemini response into structured data."""
+        """
+        Validate a schema-constrained completion against ElicitationResponse.
+        
+        Output that still fails validation (e.g. truncated at max_output_tokens) is
+        counted in ``parse_failures`` and ``praxify_gemini_parse_failures_total``
+        and answered with fallback data marked ``is_fallback``, which callers
+        pass on to clients and never cache.
+        """
         try:
-            print(f"🔍 Parsing response content...")
-            print(f"📄 Content length: {len(content)}")
-            print(f"📄 Content preview: {content[:500]}...")
-            
-            # Extract JSON from the response
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            
-            print(f"🔍 JSON start index: {start_idx}")
-            print(f"🔍 JSON end index: {end_idx}")
+            parsed = ElicitationResponse.model_validate_json(content)
+            self.responses_parsed += 1
+            logger.debug("Parsed response: %d questions, %d personas", len(parsed.questions), len(parsed.personas))
+            return parsed.model_dump()
             
-            if start_idx == -1 or end_idx == 0:
-                print(f"❌ No JSON brackets found in response")
-                print(f"📄 Full content: {content}")
-                raise ValueError("No JSON found in response")
-            
-            json_str = content[start_idx:end_idx]
-            print(f"📄 Extracted JSON string: {json_str}")
-            
-            parsed_data = json.loads(json_str)
-            print(f"✅ Successfully parsed JSON")
-            print(f"📊 Parsed data keys: {list(parsed_data.keys())}")
-            
-            # Validate required fields
-            required_fields = ['questions', 'personas', 'summary', 'next_steps']
-            for field in required_fields:
-                if field not in parsed_data:
-                    print(f"❌ Missing required field: {field}")
-                    raise ValueError(f"Missing required field: {field}")
-                else:
-                    print(f"✅ Found required field: {field}")
-            
-            print(f"✅ All required fields present")
-            return parsed_data
-            
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON decode error: {str(e)}")
-            print(f"📄 JSON string that failed: {json_str}")
-            logger.error(f"Failed to parse JSON response: {str(e)}")
+        except ValidationError as e:
+            self.parse_failures += 1
+            gemini_parse_failures_total.inc()
+            logger.error("Gemini response did not match the elicitation schema (%d failures so far): %s",
+                         self.parse_failures, e)
+            logger.debug("Content that failed: %.500s", content)
             # Fallback: return a basic structure
             fallback_data = {
                 "questions": [
@@ -179,17 +320,22 @@ Provide your response in a friendly and conversational tone. Use Bahasa Indonesi
                     }
                 ],
                 "summary": "Analysis of your project idea",
-                "next_steps": ["Define specific requirements", "Identify stakeholders", "Create user stories"]
+                "next_steps": ["Define specific requirements", "Identify stakeholders", "Create user stories"],
+                "is_fallback": True
             }
-            print(f"🔄 Using fallback data: {fallback_data}")
             return fallback_data
-        except Exception as e:
-            print(f"❌ Error parsing elicitation response: {str(e)}")
-            print(f"❌ Error type: {type(e)}")
-            import traceback
-            print(f"❌ Full traceback: {traceback.format_exc()}")
-            logger.error(f"Error parsing elicitation response: {str(e)}")
-            raise Exception(f"Failed to parse elicitation response: {str(e)}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Parse outcomes of Gemini completions for health reporting."""
+        total = self.responses_parsed + self.parse_failures
+        return {
+            "model": self.model,
+            "responses_parsed": self.responses_parsed,
+            "parse_failures": self.parse_failures,
+            "parse_failure_rate": round(self.parse_failures / total, 4) if total else 0.0,
+            "quota": self.limiter.stats(),
+            "circuit": self.breaker.stats()
+        }
 
 # Create a singleton instance
 gemini_service = GeminiService() 
\ No newline at end of file
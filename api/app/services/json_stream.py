@@ -0,0 +1,95 @@
+import json
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalArrayParser:
+    """
+    Incremental JSON scanner for streamed model output.
+
+    Text is fed in arbitrary chunks. Whenever an object inside one of the
+    watched top-level arrays (e.g. ``"questions": [{...}, {...}]``) is closed,
+    it is decoded and returned straight away, long before the whole document
+    is complete. Anything before the first ``{`` (such as a Markdown code
+    fence) is ignored. The scanner only tracks nesting, strings and escapes,
+    so each character is looked at once no matter how the text is chunked.
+    """
+
+    def __init__(self, array_keys: FrozenSet[str]):
+        self.array_keys = array_keys
+        self.text = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None
+        self._current_array: Optional[str] = None
+        self._item_start: Optional[int] = None
+        self.decode_errors = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Add a chunk of text.
+
+        Args:
+            chunk (str): The next piece of streamed text
+
+        Returns:
+            (array key, decoded object) pairs for the items completed by this chunk
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+
+        for index in range(self._position, len(text)):
+            char = text[index]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        # Strings directly inside the top-level object are keys or
+                        # scalar values; the one before a "[" is that array's key
+                        self._last_key = text[self._string_start + 1:index]
+                continue
+
+            if char == '"':
+                if self._depth > 0:
+                    self._in_string = True
+                    self._string_start = index
+            elif char in "{[":
+                if self._depth == 0 and char != "{":
+                    continue
+                self._depth += 1
+                if self._depth == 2 and char == "[":
+                    self._current_array = self._last_key if self._last_key in self.array_keys else None
+                elif self._depth == 3 and char == "{" and self._current_array is not None:
+                    self._item_start = index
+            elif char in "}]" and self._depth > 0:
+                if self._depth == 3 and char == "}" and self._item_start is not None:
+                    item = self._decode(text[self._item_start:index + 1])
+                    if item is not None:
+                        completed.append((self._current_array, item))
+                    self._item_start = None
+                elif self._depth == 2:
+                    self._current_array = None
+                self._depth -= 1
+
+        self._position = len(text)
+        return completed
+
+    def _decode(self, item_text: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(item_text)
+        except json.JSONDecodeError as e:
+            # The final parse of the whole text decides what to do with it
+            self.decode_errors += 1
+            logger.warning("Could not decode streamed item: %s", e)
+            return None
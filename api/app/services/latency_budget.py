@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class StageCostModel:
+    """
+    Predicts how long an analysis stage will take on a document.
+
+    Each stage costs a fixed overhead plus a per-character rate. The rate
+    starts from a conservative prior and follows an exponentially weighted
+    moving average of the rates observed since, so estimates track the
+    hardware and the loaded model. Every process keeps its own model: pool
+    workers learn from the documents they validate.
+    """
+
+    def __init__(self, priors: Dict[str, Tuple[float, float]], smoothing: float = 0.2):
+        """
+        Args:
+            priors (Dict[str, Tuple[float, float]]): Per stage, (overhead seconds, seconds per character)
+            smoothing (float): Weight of the newest observation in the moving average
+        """
+        self.overheads = {stage: overhead for stage, (overhead, _) in priors.items()}
+        self.rates = {stage: rate for stage, (_, rate) in priors.items()}
+        self.smoothing = smoothing
+        self.observations: Dict[str, int] = {stage: 0 for stage in priors}
+        self._lock = threading.Lock()
+
+    def estimate(self, stage: str, chars: int) -> float:
+        """Expected seconds for ``stage`` on a document of ``chars`` characters."""
+        return self.overheads.get(stage, 0.0) + self.rates.get(stage, 0.0) * chars
+
+    def observe(self, stage: str, chars: int, seconds: float) -> None:
+        """Fold a measured stage duration into the stage's rate."""
+        if chars <= 0:
+            return
+        rate = max(seconds - self.overheads.get(stage, 0.0), 0.0) / chars
+        with self._lock:
+            previous = self.rates.get(stage)
+            self.rates[stage] = rate if previous is None else previous + self.smoothing * (rate - previous)
+            self.observations[stage] = self.observations.get(stage, 0) + 1
+
+    def fits(self, stage: str, chars: int, deadline: Optional[float]) -> bool:
+        """
+        Whether the stage is expected to finish before the deadline.
+
+        Args:
+            stage (str): Stage name
+            chars (int): Document length in characters
+            deadline (float): Absolute ``time.time()`` by which the result is due, or None for no budget
+        """
+        if deadline is None:
+            return True
+        return time.time() + self.estimate(stage, chars) <= deadline
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {
+                "overhead_ms": round(self.overheads.get(stage, 0.0) * 1000, 3),
+                "ms_per_1000_chars": round(rate * 1_000_000, 4),
+                "observations": self.observations.get(stage, 0)
+            }
+            for stage, rate in self.rates.items()
+        }
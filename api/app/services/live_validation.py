@@ -0,0 +1,236 @@
+import hashlib
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from app.models.validation import IssueType, Severity
+from app.services.cache import LRUCache
+from app.services.validation_pool import validation_pool
+from app.services.validation_service import validation_service, SEVERITY_WEIGHTS
+
+logger = logging.getLogger(__name__)
+
+
+class LiveEditError(ValueError):
+    """Raised for edits that do not apply to the session's document."""
+
+
+class _Line:
+    """One line of the session document and its cached analysis."""
+    __slots__ = ("id", "text", "analysis")
+
+    def __init__(self, line_id: int, text: str, analysis: Dict[str, Any]):
+        self.id = line_id
+        self.text = text
+        self.analysis = analysis
+
+
+class LiveValidationSession:
+    """
+    Server-side state for a live (WebSocket) validation session.
+
+    The document is held as lines. Each line keeps its rule and NER analysis,
+    cached by line hash, so an edit only re-analyses the lines it touches.
+    Document-level results (missing sections, stakeholder identification,
+    score, word count and per-type counts) are kept as running aggregates that
+    are adjusted for the removed and inserted lines instead of being
+    recomputed from scratch.
+
+    Issue ids are stable for as long as their line is unchanged: line issues
+    are ``L<line id>.<n>`` and document-level issues ``D.<name>``.
+    """
+
+    def __init__(self, focus_areas: Optional[List[str]] = None, max_chars: int = 10000):
+        self.stage_names = [stage.name for stage in validation_service.plan_stages(focus_areas)]
+        self.max_chars = max_chars
+        self.lines: List[_Line] = []
+        self._next_id = 0
+        self._analysis_cache = LRUCache(max_entries=4096, ttl_seconds=3600)
+
+        # Running aggregates over all lines
+        self.chars = -1  # joining N lines adds N - 1 newlines
+        self.word_count = 0
+        self.non_blank_lines = 0
+        self.person_lines = 0
+        self.role_lines = 0
+        self.section_counts: Counter = Counter()
+        self.type_counts: Counter = Counter()
+        self.line_deduction = 0
+        self.critical_count = 0
+        self.entity_label_count = 0
+        self.incomplete_lines = 0
+
+        self.document_issues: Dict[str, Dict[str, Any]] = {}
+
+    async def load(self, document: str) -> Dict[str, Any]:
+        """Replace the whole document and return a full snapshot."""
+        await self.edit(0, len(self.lines), document.split('\n'))
+        return self.snapshot()
+
+    async def edit(self, start: int, end: int, new_lines: List[str]) -> Dict[str, Any]:
+        """
+        Replace lines ``start`` to ``end`` (0-based, end exclusive) with ``new_lines``.
+
+        Returns:
+            Delta with the added issues, the ids of removed issues, the line shift
+            for issues after the edit, and the updated score and summary
+        """
+        if not 0 <= start <= end <= len(self.lines):
+            raise LiveEditError(f"Edit range {start}:{end} is outside the document ({len(self.lines)} lines)")
+
+        removed_chars = sum(len(line.text) + 1 for line in self.lines[start:end])
+        added_chars = sum(len(text) + 1 for text in new_lines)
+        if self.chars - removed_chars + added_chars > self.max_chars:
+            raise LiveEditError(f"Document would exceed {self.max_chars} characters")
+
+        # Analyse only lines we have not seen before, plus surviving lines that are
+        # still waiting for NER because the model was loading when they were analysed
+        waiting = [line for line in self.lines[:start] + self.lines[end:] if not line.analysis["complete"]]
+        analyses = await self._analyse(new_lines + [line.text for line in waiting])
+        new_analyses = analyses[:len(new_lines)]
+        catch_up = analyses[len(new_lines):]
+
+        added: List[Dict[str, Any]] = []
+        removed: List[str] = []
+
+        for line in self.lines[start:end]:
+            removed.extend(issue_id for issue_id, _ in self._line_issues(line))
+            self._account(line.analysis, line.text, -1)
+
+        inserted = []
+        for text, analysis in zip(new_lines, new_analyses):
+            line = _Line(self._next_id, text, analysis)
+            self._next_id += 1
+            self._account(analysis, text, +1)
+            inserted.append(line)
+        self.lines[start:end] = inserted
+
+        for index, line in enumerate(inserted, start + 1):
+            added.extend(self._with_position(issue_id, issue, index) for issue_id, issue in self._line_issues(line))
+
+        # Swap in completed analyses for lines that were waiting on the model
+        for line, analysis in zip(waiting, catch_up):
+            if analysis["complete"]:
+                removed.extend(issue_id for issue_id, _ in self._line_issues(line))
+                self._account(line.analysis, line.text, -1)
+                line.analysis = analysis
+                self._account(analysis, line.text, +1)
+                index = self.lines.index(line) + 1
+                added.extend(self._with_position(issue_id, issue, index) for issue_id, issue in self._line_issues(line))
+
+        doc_added, doc_removed = self._refresh_document_issues()
+        added.extend(doc_added)
+        removed.extend(doc_removed)
+
+        delta = {
+            "type": "delta",
+            "added": added,
+            "removed": removed,
+            "line_shift": {"after_line": end, "delta": len(new_lines) - (end - start)}
+        }
+        delta.update(self._totals())
+        return delta
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All current issues plus totals."""
+        issues = [
+            self._with_position(issue_id, issue, index)
+            for index, line in enumerate(self.lines, 1)
+            for issue_id, issue in self._line_issues(line)
+        ]
+        issues.extend({"id": issue_id, **issue} for issue_id, issue in self.document_issues.items())
+        snapshot = {"type": "snapshot", "issues": issues}
+        snapshot.update(self._totals())
+        return snapshot
+
+    async def _analyse(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyses for the given line texts, from the hash cache where possible."""
+        keys = [hashlib.sha1(text.encode("utf-8")).hexdigest() for text in texts]
+        results: List[Optional[Dict[str, Any]]] = [self._analysis_cache.get(key) for key in keys]
+
+        pending = {}
+        for index, (key, result) in enumerate(zip(keys, results)):
+            if result is None:
+                pending.setdefault(key, []).append(index)
+
+        if pending:
+            unique_texts = [texts[indexes[0]] for indexes in pending.values()]
+            fresh = await validation_pool.analyse_lines(unique_texts, self.stage_names)
+            for (key, indexes), analysis in zip(pending.items(), fresh):
+                if analysis["complete"]:
+                    self._analysis_cache.set(key, analysis)
+                for index in indexes:
+                    results[index] = analysis
+        return results
+
+    def _line_issues(self, line: _Line):
+        for number, issue in enumerate(line.analysis["issues"]):
+            yield f"L{line.id}.{number}", issue
+
+    @staticmethod
+    def _with_position(issue_id: str, issue: Dict[str, Any], line_number: int) -> Dict[str, Any]:
+        # Offsets from line-by-line analysis are relative to the line and shift with
+        # every edit; live issues are addressed by id and line number instead
+        return {**issue, "id": issue_id, "line_number": line_number, "start_char": None, "end_char": None}
+
+    def _account(self, analysis: Dict[str, Any], text: str, sign: int) -> None:
+        """Add (sign=+1) or remove (sign=-1) one line's contribution to the aggregates."""
+        self.chars += sign * (len(text) + 1)
+        self.word_count += sign * len(text.split())
+        self.non_blank_lines += sign * bool(text.strip())
+        self.person_lines += sign * analysis["has_person"]
+        self.role_lines += sign * analysis["mentions_roles"]
+        self.incomplete_lines += sign * (not analysis["complete"])
+        for section_name in analysis["sections"]:
+            self.section_counts[section_name] += sign
+        for issue in analysis["issues"]:
+            self._account_issue(issue, sign)
+
+    def _account_issue(self, issue: Dict[str, Any], sign: int) -> None:
+        severity = Severity(issue["severity"])
+        self.type_counts[IssueType(issue["type"])] += sign
+        self.line_deduction += sign * SEVERITY_WEIGHTS.get(severity, 1)
+        self.critical_count += sign * (severity == Severity.CRITICAL)
+        self.entity_label_count += sign * any(label in issue["context"] for label in ["PERSON", "ORG", "PRODUCT"])
+
+    def _refresh_document_issues(self):
+        """Re-derive document-level issues from the aggregates and diff them."""
+        current: Dict[str, Dict[str, Any]] = {}
+        if "completeness" in self.stage_names:
+            for section_name in validation_service.required_sections:
+                if self.section_counts[section_name] <= 0:
+                    issue = validation_service._missing_section_issue(section_name)
+                    current[f"D.missing_{section_name}"] = issue.model_dump(mode="json")
+        if "ner" in self.stage_names and self.incomplete_lines == 0:
+            for issue in validation_service._stakeholder_issues(self.person_lines > 0, self.role_lines > 0):
+                current["D.stakeholders"] = issue.model_dump(mode="json")
+
+        added, removed = [], []
+        for issue_id in self.document_issues.keys() - current.keys():
+            self._account_issue(self.document_issues[issue_id], -1)
+            removed.append(issue_id)
+        for issue_id in current.keys() - self.document_issues.keys():
+            self._account_issue(current[issue_id], +1)
+            added.append({"id": issue_id, **current[issue_id]})
+        self.document_issues = current
+        return added, removed
+
+    def _totals(self) -> Dict[str, Any]:
+        """Score, summary and counts from the running aggregates."""
+        issue_count = sum(self.type_counts.values())
+        score = validation_service._score_from_deduction(self.line_deduction) if self.non_blank_lines else 0.0
+        type_counts = {issue_type.value: count for issue_type, count in self.type_counts.items() if count}
+        return {
+            "score": score,
+            "summary": validation_service._summarize(type_counts, issue_count, score),
+            "suggestions": validation_service._suggest(
+                issue_types=set(issue_type for issue_type, count in self.type_counts.items() if count),
+                issue_count=issue_count,
+                has_critical=self.critical_count > 0,
+                mentions_entities=self.entity_label_count > 0
+            ),
+            "word_count": self.word_count,
+            "issue_count": issue_count,
+            "degraded": self.incomplete_lines > 0,
+            "stages_run": self.stage_names
+        }
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import (
+    microbatch_window_seconds, microbatch_max_size, microbatch_size,
+    microbatch_wait_seconds, microbatch_flushes_total
+)
+from app.services.validation_pool import validation_pool
+
+logger = logging.getLogger(__name__)
+
+# Called as run_batch(documents, focus_areas, mode=mode)
+BatchRunner = Callable[..., Awaitable[List[Dict[str, Any]]]]
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single-document validations into batches.
+
+    Requests with the same focus areas and mode that arrive within ``window`` seconds
+    of each other (or until ``max_batch_size`` of them are waiting) are handed
+    to ``run_batch`` together, so spaCy parses them with one ``nlp.pipe`` call
+    instead of one ``nlp(document)`` call each. Every caller gets back its own
+    result, or its own error.
+    """
+
+    def __init__(self, name: str, run_batch: BatchRunner, window: float, max_batch_size: int):
+        self.name = name
+        self.run_batch = run_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        # Waiting requests per mode and focus-area key: (document, future) pairs,
+        # the focus areas to validate with, when the batch opened and its flush timer
+        self._pending: Dict[Tuple[str, ...], List[Tuple[str, asyncio.Future]]] = {}
+        self._focus_areas: Dict[Tuple[str, ...], Optional[List[str]]] = {}
+        self._opened: Dict[Tuple[str, ...], float] = {}
+        self._timers: Dict[Tuple[str, ...], asyncio.TimerHandle] = {}
+        self._running: Set[asyncio.Task] = set()
+
+        self.submitted = 0
+        self.batched = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+        microbatch_window_seconds.set(window)
+        microbatch_max_size.set(max_batch_size)
+
+    async def submit(self, document: str, focus_areas: Optional[List[str]] = None, mode: str = "standard") -> Dict[str, Any]:
+        """
+        Validate one document as part of the next batch.
+
+        Args:
+            document (str): The document to validate
+            focus_areas (List[str]): Areas to focus on
+            mode (str): Validation mode ("fast", "standard" or "deep")
+
+        Returns:
+            The document's validation result
+
+        Raises:
+            Exception: The document's own error, or the batch's error (e.g. a
+                saturated or timed-out pool) for every document in it
+        """
+        self.submitted += 1
+        areas = tuple(sorted(area.strip().lower() for area in focus_areas)) if focus_areas else ()
+        key = (mode,) + areas
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._pending.setdefault(key, [])
+        if not batch:
+            self._focus_areas[key] = focus_areas
+            self._opened[key] = time.perf_counter()
+            self._timers[key] = loop.call_later(self.window, self._flush, key, "window")
+        batch.append((document, future))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key, "full")
+
+        outcome = await future
+        if "error" in outcome:
+            # Re-raise a failed pool chunk's own error (e.g. PoolTimeoutError)
+            raise outcome.get("exception") or Exception(outcome["error"])
+        return outcome["result"]
+
+    def _flush(self, key: Tuple[str, ...], reason: str) -> None:
+        """Send the waiting requests for ``key`` off as one batch."""
+        batch = self._pending.pop(key, None)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        focus_areas = self._focus_areas.pop(key, None)
+        opened = self._opened.pop(key, time.perf_counter())
+        if not batch:
+            return
+
+        self.batches += 1
+        self.batched += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        microbatch_size.observe(len(batch))
+        microbatch_wait_seconds.observe(time.perf_counter() - opened)
+        microbatch_flushes_total.inc(reason=reason)
+        logger.debug("Flushing %s micro-batch of %d documents (%s)", self.name, len(batch), reason)
+
+        task = asyncio.ensure_future(self._run(batch, focus_areas, key[0]))
+        # Keep a reference so the task is not garbage collected while it runs
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]], focus_areas: Optional[List[str]], mode: str) -> None:
+        try:
+            outcomes = await self.run_batch([document for document, _ in batch], focus_areas, mode=mode)
+        except Exception as e:
+            for _, future in batch:
+                # Callers that gave up (e.g. disconnected) have cancelled futures
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), outcome in zip(batch, outcomes):
+            if not future.done():
+                future.set_result(outcome)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+            "submitted": self.submitted,
+            "batches": self.batches,
+            "mean_batch_size": round(self.batched / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "waiting": sum(len(batch) for batch in self._pending.values())
+        }
+
+
+# Create a singleton instance
+validation_batcher = MicroBatcher(
+    name="validation",
+    run_batch=validation_pool.validate_batch,
+    window=settings.validation_microbatch_window_ms / 1000,
+    max_batch_size=settings.validation_microbatch_max_size
+)
@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class QuotaExceededError(Exception):
+    """
+    Raised when a call cannot be made within its deadline because of rate limits.
+
+    ``upstream`` is True when the upstream itself kept answering with quota
+    errors, and False when the local token bucket turned the call away.
+    """
+
+    def __init__(self, message: str, retry_after: float, upstream: bool = False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.upstream = upstream
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised when retryable upstream errors persist until the deadline."""
+
+
+class TokenBucket:
+    """
+    Asyncio token bucket.
+
+    Refills at ``rate_per_minute / 60`` tokens per second up to ``burst`` tokens.
+    Callers wait for a token instead of being rejected, unless the wait would
+    run past their deadline.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, deadline: float) -> float:
+        """
+        Take one token, waiting for the refill if needed.
+
+        Args:
+            deadline (float): time.monotonic() value by which the token is needed
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            QuotaExceededError: If no token will be available before the deadline
+        """
+        # The lock queues waiters in arrival order, so tokens are handed out fairly
+        async with self._lock:
+            self._refill()
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if time.monotonic() + wait > deadline:
+                raise QuotaExceededError(f"Rate limit reached; next request slot in {wait:.1f}s", retry_after=wait)
+            if wait:
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= 1
+            return wait
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the upstream answered 429."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class RateLimitedCaller:
+    """
+    Runs upstream calls under a token bucket, a concurrency cap and a retry policy.
+
+    Retryable failures are retried with exponential backoff and full jitter
+    (sleep uniformly between 0 and ``min(backoff_max, backoff_base * 2**attempt)``)
+    as long as the total deadline allows. Quota errors from the upstream also
+    drain the local bucket so other callers back off too.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float,
+        burst: int,
+        max_concurrency: int,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        deadline: float,
+        is_retryable: Callable[[Exception], bool],
+        is_quota_error: Callable[[Exception], bool]
+    ):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.bucket = TokenBucket(requests_per_minute, burst)
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.is_retryable = is_retryable
+        self.is_quota_error = is_quota_error
+
+        self._recent_requests: deque = deque()
+        self.in_flight = 0
+        self.requests = 0
+        self.succeeded = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self.upstream_quota_errors = 0
+        self.rejected = 0
+        self.gave_up = 0
+
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Call ``request()`` with rate limiting, a concurrency cap and retries.
+
+        Raises:
+            QuotaExceededError: If the rate limit (local or upstream) outlasts the deadline
+            UpstreamUnavailableError: If retryable errors outlast the retries or the deadline
+        """
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            await self._acquire(deadline)
+            try:
+                result = await asyncio.wait_for(request(), timeout=max(0.0, deadline - time.monotonic()))
+                self.succeeded += 1
+                return result
+            except asyncio.TimeoutError:
+                error = UpstreamUnavailableError(f"{self.name} did not answer within {self.deadline}s")
+            except Exception as e:
+                if not self.is_retryable(e):
+                    raise
+                error = e
+            finally:
+                self._release()
+
+            await self._back_off(error, attempt, deadline)
+            attempt += 1
+
+    async def stream(self, open_stream: Callable[[], Awaitable[AsyncIterator[T]]]) -> AsyncIterator[T]:
+        """
+        Iterate a streamed upstream response under the same limits as call().
+
+        Opening the stream and waiting for its first chunk are retried like a
+        call, since nothing has reached the caller yet. The concurrency slot is
+        held until the stream ends or is closed, and every chunk must arrive
+        within the deadline. Errors after the first chunk are not retried (the
+        chunks already yielded would be repeated) but are raised as
+        QuotaExceededError or UpstreamUnavailableError, as after exhausted retries.
+        """
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            await self._acquire(deadline)
+            try:
+                stream = await asyncio.wait_for(open_stream(), timeout=max(0.0, deadline - time.monotonic()))
+                chunks = stream.__aiter__()
+                first = await asyncio.wait_for(chunks.__anext__(), timeout=max(0.0, deadline - time.monotonic()))
+                break
+            except StopAsyncIteration:
+                self._release()
+                self.succeeded += 1
+                return
+            except asyncio.TimeoutError:
+                error = UpstreamUnavailableError(f"{self.name} did not answer within {self.deadline}s")
+            except Exception as e:
+                if not self.is_retryable(e):
+                    self._release()
+                    raise
+                error = e
+            self._release()
+            await self._back_off(error, attempt, deadline)
+            attempt += 1
+
+        try:
+            yield first
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=max(0.0, deadline - time.monotonic()))
+                except StopAsyncIteration:
+                    break
+                yield chunk
+            self.succeeded += 1
+        except asyncio.TimeoutError:
+            self.gave_up += 1
+            raise UpstreamUnavailableError(f"{self.name} stream did not finish within {self.deadline}s")
+        except Exception as e:
+            if not self.is_retryable(e):
+                raise
+            self.gave_up += 1
+            logger.warning("%s stream failed after the first chunk: %s", self.name, e)
+            if self.is_quota_error(e):
+                self.upstream_quota_errors += 1
+                self.bucket.drain()
+                raise QuotaExceededError(f"{self.name} quota exhausted: {str(e)}", retry_after=1.0, upstream=True)
+            raise UpstreamUnavailableError(f"{self.name} unavailable: {str(e)}")
+        finally:
+            self._release()
+
+    async def _acquire(self, deadline: float) -> None:
+        """Wait for a token and a concurrency slot."""
+        try:
+            self.throttled_seconds += await self.bucket.acquire(deadline)
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+        except QuotaExceededError:
+            self.rejected += 1
+            raise
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise UpstreamUnavailableError(f"All {self.max_concurrency} {self.name} request slots stayed busy")
+
+        self.in_flight += 1
+        self.requests += 1
+        self._recent_requests.append(time.monotonic())
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    async def _back_off(self, error: Exception, attempt: int, deadline: float) -> None:
+        """
+        Sleep before the next attempt after a retryable ``error``.
+
+        Raises:
+            QuotaExceededError: If the error was a quota error and no retry is left
+            UpstreamUnavailableError: If no retry is left for any other error
+        """
+        quota_error = self.is_quota_error(error)
+        if quota_error:
+            self.upstream_quota_errors += 1
+            self.bucket.drain()
+
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+            self.gave_up += 1
+            logger.warning("Giving up on %s after %d attempts: %s", self.name, attempt + 1, error)
+            if quota_error:
+                raise QuotaExceededError(f"{self.name} quota exhausted: {str(error)}", retry_after=delay or 1.0,
+                                         upstream=True)
+            raise UpstreamUnavailableError(f"{self.name} unavailable: {str(error)}")
+
+        self.retries += 1
+        logger.info("Retrying %s in %.2fs (attempt %d): %s", self.name, delay, attempt + 2, error)
+        await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Quota usage and retry counters."""
+        window_start = time.monotonic() - 60
+        while self._recent_requests and self._recent_requests[0] < window_start:
+            self._recent_requests.popleft()
+        last_minute = len(self._recent_requests)
+        return {
+            "requests_per_minute_limit": self.requests_per_minute,
+            "requests_last_minute": last_minute,
+            "quota_utilisation": round(last_minute / self.requests_per_minute, 2) if self.requests_per_minute else 0.0,
+            "tokens_available": round(self.bucket.available, 2),
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "retries": self.retries,
+            "upstream_quota_errors": self.upstream_quota_errors,
+            "throttled_seconds": round(self.throttled_seconds, 2),
+            "rejected": self.rejected,
+            "gave_up": self.gave_up
+        }
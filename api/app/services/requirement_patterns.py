@@ -0,0 +1,127 @@
+from typing import Dict, List, NamedTuple
+
+import numpy
+from spacy.attrs import IDX, LENGTH, SENT_START
+from spacy.language import Language
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
+from spacy.vocab import Vocab
+
+# Doc extension (doc._.requirement_patterns) the component stores its matches in
+PATTERN_MATCHES = "requirement_patterns"
+
+# Phrases are matched as whole tokens, where the checks they replaced tested
+# substrings of the lowercased sentence. This is intended and changes results
+# only where a phrase sat inside another word or across a longer phrase:
+#   - "incorrect" or "goodness" no longer count as vague modifiers
+#   - "may become" or "will bear" no longer count as "<modal> be"
+#   - "subsystem", "ecosystem" or "toolbar" are no longer technical context,
+#     so plurals are listed explicitly below
+#   - "specification" or "conversion" no longer make the context specific
+# test_validation_service.py checks parity with the substring checks otherwise.
+
+# Modal verbs that make "the system <modal> be ..." a vague requirement
+MODALS = ["should", "must", "will", "can", "may"]
+
+# Modifiers that make an entity description vague, in reporting priority
+VAGUE_MODIFIERS = ["appropriate", "suitable", "good", "proper", "correct"]
+
+# Words that place a product or organisation in a technical context, and words
+# that show the context already pins it down
+TECHNICAL_CONTEXT = ["system", "systems", "platform", "platforms", "tool", "tools"]
+SPECIFICITY = ["version", "versions", "specific", "particular"]
+
+PHRASES = {
+    "THE_SYSTEM": ["the system"],
+    "MODAL_BE": [f"{modal} be" for modal in MODALS],
+    "VAGUE_MODIFIER": VAGUE_MODIFIERS,
+    "TECHNICAL_CONTEXT": TECHNICAL_CONTEXT,
+    "SPECIFICITY": SPECIFICITY
+}
+
+if not Doc.has_extension(PATTERN_MATCHES):
+    Doc.set_extension(PATTERN_MATCHES, default=None)
+
+
+class PatternMatch(NamedTuple):
+    """A requirement pattern match, as character offsets of the match and of its sentence."""
+    label: str
+    start: int
+    end: int
+    sentence_start: int
+    sentence_end: int
+
+
+class RequirementPatterns:
+    """
+    Pipeline component that matches the phrases NER-enhanced validation checks.
+
+    Runs a spaCy PhraseMatcher over token LOWER attributes in the same pass as
+    NER and stores every match with the bounds of its sentence in
+    ``doc._.requirement_patterns``, so the validation checks read matches
+    instead of lowercasing and scanning every sentence in Python. Matches are
+    stored as plain tuples so they survive Doc serialisation (nlp.pipe with
+    n_process > 1).
+    """
+
+    def __init__(self, vocab: Vocab):
+        self.matcher = PhraseMatcher(vocab, attr="LOWER")
+        for label, phrases in PHRASES.items():
+            self.matcher.add(label, [Doc(vocab, words=phrase.split()) for phrase in phrases])
+        self.labels = {vocab.strings[label]: label for label in PHRASES}
+
+    def __call__(self, doc: Doc) -> Doc:
+        matches = self.matcher(doc)
+        if not matches:
+            doc._.set(PATTERN_MATCHES, [])
+            return doc
+
+        token_starts = doc.to_array(IDX)
+        token_ends = token_starts + doc.to_array(LENGTH)
+        if doc.has_annotation("SENT_START"):
+            sentence_starts = numpy.flatnonzero(doc.to_array(SENT_START) == 1)
+        else:
+            sentence_starts = numpy.zeros(1, dtype=int)
+        sentence_ends = numpy.append(sentence_starts[1:], len(doc))
+        match_ids, starts, ends = numpy.array(matches, dtype=numpy.uint64).T
+        starts, ends = starts.astype(int), ends.astype(int)
+        # Index of the sentence each match starts in
+        sentences = numpy.searchsorted(sentence_starts, starts, side="right") - 1
+
+        doc._.set(PATTERN_MATCHES, list(zip(
+            [self.labels[match_id] for match_id in match_ids.tolist()],
+            token_starts[starts].tolist(),
+            token_ends[ends - 1].tolist(),
+            token_starts[sentence_starts[sentences]].tolist(),
+            token_ends[sentence_ends[sentences] - 1].tolist()
+        )))
+        return doc
+
+
+@Language.factory("requirement_patterns")
+def create_requirement_patterns(nlp: Language, name: str) -> RequirementPatterns:
+    return RequirementPatterns(nlp.vocab)
+
+
+def sentence_matches(doc: Doc) -> Dict[int, Dict[str, List[PatternMatch]]]:
+    """
+    Group a parsed document's pattern matches by the sentence they occur in.
+
+    Documents parsed without the component (e.g. by a pipeline built outside
+    load_pipeline) are matched here instead.
+
+    Args:
+        doc (Doc): The parsed document
+
+    Returns:
+        Matches per label, keyed by the start character of their sentence
+    """
+    matches = doc._.get(PATTERN_MATCHES)
+    if matches is None:
+        matches = RequirementPatterns(doc.vocab)(doc)._.get(PATTERN_MATCHES)
+
+    grouped: Dict[int, Dict[str, List[PatternMatch]]] = {}
+    for match in matches:
+        match = PatternMatch(*match)
+        grouped.setdefault(match.sentence_start, {}).setdefault(match.label, []).append(match)
+    return grouped
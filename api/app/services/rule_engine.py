@@ -0,0 +1,224 @@
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from app.models.validation import IssueType, Severity
+
+
+def line_starts(document: str) -> List[int]:
+    """Return the character offset at which every line of the document starts."""
+    starts = [0]
+    index = document.find('\n')
+    while index != -1:
+        starts.append(index + 1)
+        index = document.find('\n', index + 1)
+    return starts
+
+
+def line_number_at(starts: List[int], offset: int) -> int:
+    """Map a character offset to its 1-based line number."""
+    return bisect_right(starts, offset)
+
+
+class KeywordMatcher:
+    """
+    Precompiled matcher for a set of keywords and multi-word phrases.
+
+    All keywords are folded into a single alternation regex wrapped in a
+    lookahead, so one ``finditer`` pass over the document finds every keyword
+    at every position (including phrases that overlap, e.g. "mudah" inside
+    "mudah digunakan") with the same ``\\b`` semantics as searching for each
+    keyword on its own.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(keywords)
+        self._canonical = {keyword.lower(): keyword for keyword in self.keywords}
+        self._rank = {keyword: rank for rank, keyword in enumerate(self.keywords)}
+
+        # Longest alternatives first so the regex reports the longest keyword
+        # starting at a position; shorter keywords sharing that start are
+        # recovered through the prefix table below.
+        ordered = sorted(self._canonical, key=len, reverse=True)
+        alternation = "|".join(re.escape(keyword) for keyword in ordered)
+        self._pattern = re.compile(rf'(?=\b({alternation})\b)', re.IGNORECASE)
+
+        # For each keyword, the shorter keywords that also match at its start
+        # position (a prefix that ends on a word boundary inside the keyword).
+        self._prefixes: Dict[str, List[str]] = {
+            keyword: [
+                other for other in self._canonical
+                if other != keyword and re.match(rf'\b{re.escape(other)}\b', keyword)
+            ]
+            for keyword in self._canonical
+        }
+
+    def scan(self, document: str, starts: Optional[List[int]] = None) -> Dict[int, List[str]]:
+        """
+        Scan the whole document once.
+
+        Args:
+            document (str): Text to scan
+            starts (List[int]): The document's line_starts, if already computed
+
+        Returns:
+            Dict mapping 1-based line numbers to the keywords found on that line,
+            each keyword listed once and in the order the keywords were given
+        """
+        starts = starts if starts is not None else line_starts(document)
+        hits: Dict[int, Set[str]] = {}
+
+        for match in self._pattern.finditer(document):
+            found = match.group(1).lower()
+            keyword = self._canonical.get(found)
+            if keyword is None:
+                continue
+            line_hits = hits.setdefault(line_number_at(starts, match.start()), set())
+            line_hits.add(keyword)
+            for prefix in self._prefixes[found]:
+                line_hits.add(self._canonical[prefix])
+
+        return {
+            line_num: sorted(line_hits, key=self._rank.__getitem__)
+            for line_num, line_hits in hits.items()
+        }
+
+
+class RuleCategory(NamedTuple):
+    """A named group of regex rules that all raise the same kind of issue."""
+    name: str
+    issue_type: IssueType
+    severity: Severity
+    suggestion: str
+    patterns: List[str]
+
+
+class RuleMatch(NamedTuple):
+    """A single rule hit inside a document."""
+    category: RuleCategory
+    text: str
+    start: int
+    end: int
+
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Split a ``\\b(a|b|c)\\b`` rule into its top-level alternatives."""
+    wrapped = re.fullmatch(r'\\b\((.*)\)\\b', pattern)
+    body = wrapped.group(1) if wrapped else pattern
+
+    alternatives, depth, current, escaped = [], 0, [], False
+    for char in body:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            alternatives.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    alternatives.append(''.join(current))
+    return [alternative for alternative in alternatives if alternative]
+
+
+def _literal(alternative: str) -> str:
+    """Best-effort plain-text form of an alternative, used for overlap reporting."""
+    return re.sub(r'\\(.)', r'\1', alternative).lower()
+
+
+class CompiledRules:
+    """
+    Merge several rule categories into one compiled regex.
+
+    Every category becomes a named group, duplicate alternatives (compared
+    case-insensitively, within and across categories) are dropped, and the
+    remaining alternatives are ordered longest first so multi-word phrases
+    win over their single-word prefixes. A whole document is classified with
+    a single ``finditer`` pass.
+
+    Only conflicts between categories are reported in ``duplicates`` and
+    ``overlaps``: a repeat inside one category raises the same issue either
+    way, so it is dropped silently.
+    """
+
+    def __init__(self, categories: Iterable[RuleCategory]):
+        self.categories = list(categories)
+        self._by_name = {category.name: category for category in self.categories}
+        self._rank = {category.name: rank for rank, category in enumerate(self.categories)}
+
+        self.duplicates: List[str] = []
+        self.overlaps: List[str] = []
+        self.alternatives: Dict[str, List[str]] = {}
+
+        seen: Dict[str, Tuple[str, str]] = {}
+        for category in self.categories:
+            kept = []
+            for pattern in category.patterns:
+                for alternative in _split_alternatives(pattern):
+                    key = alternative.lower()
+                    if key in seen:
+                        first, first_category = seen[key]
+                        if first_category != category.name:
+                            self.duplicates.append(
+                                f"'{alternative}' in {category.name} duplicates '{first}' in {first_category}"
+                            )
+                        continue
+                    seen[key] = (alternative, category.name)
+                    kept.append(alternative)
+            kept.sort(key=lambda alternative: len(_literal(alternative)), reverse=True)
+            self.alternatives[category.name] = kept
+
+        # Alternatives that also match inside another category's (e.g. 'manual'
+        # inside 'manual process') can only be reported once per position.
+        for name, alternatives in self.alternatives.items():
+            for alternative in alternatives:
+                for other_name, others in self.alternatives.items():
+                    if other_name == name:
+                        continue
+                    for other in others:
+                        if re.search(rf'\b{alternative}\b', _literal(other), re.IGNORECASE):
+                            self.overlaps.append(
+                                f"'{_literal(alternative)}' ({name}) also matches inside "
+                                f"'{_literal(other)}' ({other_name})"
+                            )
+
+        groups = "|".join(
+            f"(?P<{name}>{'|'.join(alternatives)})"
+            for name, alternatives in self.alternatives.items()
+            if alternatives
+        )
+        self.pattern = re.compile(rf'\b(?:{groups})\b', re.IGNORECASE)
+
+    def scan(self, document: str, starts: Optional[List[int]] = None) -> Dict[int, List[RuleMatch]]:
+        """
+        Classify the whole document in one pass.
+
+        Args:
+            document (str): Text to scan
+            starts (List[int]): The document's line_starts, if already computed
+
+        Returns:
+            Dict mapping 1-based line numbers to the rule matches on that line,
+            grouped in category order and then by position
+        """
+        starts = starts if starts is not None else line_starts(document)
+        hits: Dict[int, List[RuleMatch]] = {}
+
+        for match in self.pattern.finditer(document):
+            category = self._by_name[match.lastgroup]
+            hits.setdefault(line_number_at(starts, match.start()), []).append(
+                RuleMatch(category, match.group(), match.start(), match.end())
+            )
+
+        for line_hits in hits.values():
+            line_hits.sort(key=lambda hit: (self._rank[hit.category.name], hit.start))
+        return hits
+
+    def report(self) -> List[str]:
+        """Human-readable notes about duplicates and overlaps removed at compile time."""
+        return [f"duplicate: {note}" for note in self.duplicates] + \
+            [f"overlap: {note}" for note in self.overlaps]
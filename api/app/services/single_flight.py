@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single upstream call.
+
+    The first caller for a key runs the work; callers arriving while it is in
+    flight wait on the same task and get the same result (or exception). The
+    key is forgotten as soon as the call finishes, so this only deduplicates
+    overlapping requests; results are not kept (that is the caches' job).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, work: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``work()`` once per key among concurrent callers.
+
+        Args:
+            key (str): Identity of the request, e.g. a content hash
+            work: Zero-argument coroutine function doing the upstream call
+
+        Returns:
+            The result of the shared call
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug("Joining in-flight %s call (%d in flight)", self.name, len(self._in_flight))
+        else:
+            self.executed += 1
+            task = asyncio.ensure_future(work())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shield the shared task so one caller disconnecting does not cancel it
+        # for everybody else waiting on it
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight)
+        }
+
+
+# Create singleton instances
+elicitation_flights = SingleFlight("elicitation")
+validation_flights = SingleFlight("validation")
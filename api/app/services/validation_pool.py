@@ -0,0 +1,314 @@
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_worker(ready_workers) -> None:
+    """Set up logging and start loading the spaCy model once per worker process."""
+    from app.core.logging_config import configure_logging
+    configure_logging(settings.log_level, settings.log_format)
+    
+    from app.services.validation_service import validation_service
+
+    def mark_ready():
+        with ready_workers.get_lock():
+            ready_workers.value += 1
+
+    validation_service.start_model_loading(on_ready=mark_ready)
+
+
+def _noop() -> None:
+    """Submitted at start-up to make the executor spawn its workers."""
+
+
+def _validate_in_worker(
+    document: str,
+    focus_areas: Optional[List[str]],
+    mode: str,
+    deadline: Optional[float]
+) -> Dict[str, Any]:
+    """Run a full document validation inside a pool worker."""
+    from app.services.validation_service import validation_service
+    return validation_service.validate_document(document, focus_areas, mode, deadline)
+
+
+def _validate_batch_in_worker(
+    documents: List[str],
+    focus_areas: Optional[List[str]],
+    batch_size: Optional[int],
+    mode: str
+) -> List[Dict[str, Any]]:
+    """Validate a batch of documents with nlp.pipe inside a pool worker."""
+    from app.services.validation_service import validation_service
+    return validation_service.validate_documents(documents, focus_areas, batch_size, mode=mode)
+
+
+def _run_stage_in_worker(stage_name: str, document: str, deadline: Optional[float]) -> Dict[str, Any]:
+    """Run one analysis stage inside a pool worker (streamed validation)."""
+    from app.services.validation_service import validation_service
+    return validation_service.run_stage(stage_name, document, deadline)
+
+
+def _analyse_lines_in_worker(lines: List[str], stage_names: List[str]) -> List[Dict[str, Any]]:
+    """Analyse individual lines inside a pool worker (live validation sessions)."""
+    from app.services.validation_service import validation_service
+    return validation_service.analyse_lines(lines, stage_names)
+
+
+def _ruleset_version_in_worker() -> str:
+    """Fingerprint of the rule lists the workers validate with."""
+    from app.services.validation_service import validation_service
+    return validation_service.ruleset_version
+
+
+class PoolSaturatedError(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class PoolTimeoutError(Exception):
+    """Raised when a validation task does not finish within the configured timeout."""
+
+
+class ValidationPool:
+    """
+    Runs CPU-bound validation work off the event loop.
+
+    Uses a process pool by default (each worker holds its own warm spaCy model)
+    or a thread pool sharing the in-process service. Requests beyond
+    ``size + queue_depth`` are rejected instead of queueing without bound.
+    """
+
+    def __init__(self, executor_type: str, size: int, queue_depth: int, timeout: float):
+        self.executor_type = executor_type
+        self.size = size
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._executor: Optional[Executor] = None
+        self._ruleset_version: Optional[str] = None
+        self._ruleset_flight = SingleFlight("ruleset version")
+        self._ready_workers = None
+
+        self.in_flight = 0
+        self._slots_lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def start(self) -> None:
+        """
+        Create the executor and begin loading spaCy models in the background.
+
+        Process workers are spawned immediately and each loads its own model;
+        tasks reaching a worker whose model is not ready yet get rule-only,
+        degraded results instead of waiting.
+        """
+        if self._executor is not None:
+            return
+
+        if self.executor_type == "process":
+            context = multiprocessing.get_context("spawn")
+            self._ready_workers = context.Value("i", 0)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=context,
+                initializer=_warm_worker,
+                initargs=(self._ready_workers,)
+            )
+            for _ in range(self.size):
+                self._executor.submit(_noop)
+        else:
+            from app.services.validation_service import validation_service
+            validation_service.start_model_loading()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.size,
+                thread_name_prefix="validation"
+            )
+        logger.info("Validation pool started: %d %s workers, queue depth %d", self.size, self.executor_type, self.queue_depth)
+
+    def shutdown(self) -> None:
+        """Stop the executor, cancelling tasks that have not started yet."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def validate(
+        self,
+        document: str,
+        focus_areas: Optional[List[str]] = None,
+        mode: str = "standard",
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Validate a document on the pool (``deadline`` is an absolute ``time.time()``)."""
+        return await self.run(_validate_in_worker, document, focus_areas, mode, deadline)
+
+    async def validate_batch(
+        self,
+        documents: List[str],
+        focus_areas: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+        mode: str = "standard"
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate many documents on the pool, in input order.
+        
+        The documents are split into one contiguous chunk per worker so every
+        worker pipes its share through spaCy concurrently; a micro-batch of a
+        few concurrent requests is spread over the pool rather than serialised
+        on one worker. ``batch_size`` only sets the nlp.pipe batch inside a worker,
+        and each chunk may take ``timeout`` seconds per nlp.pipe batch it holds.
+        
+        A chunk that fails as a whole (timed out, saturated pool, dead worker)
+        gives ``{"error": "...", "exception": e}`` for each of its documents
+        instead of failing the other chunks.
+        """
+        if not documents:
+            return []
+        batch_size = batch_size or settings.validation_batch_size
+        chunk_size = -(-len(documents) // self.size)
+        chunks = [documents[start:start + chunk_size] for start in range(0, len(documents), chunk_size)]
+        results = await asyncio.gather(*(
+            self.run(
+                _validate_batch_in_worker, chunk, focus_areas, batch_size, mode,
+                timeout=self.timeout * -(-len(chunk) // batch_size)
+            )
+            for chunk in chunks
+        ), return_exceptions=True)
+        outcomes = []
+        for chunk, chunk_results in zip(chunks, results):
+            if isinstance(chunk_results, BaseException):
+                if not isinstance(chunk_results, Exception):
+                    raise chunk_results
+                error = str(chunk_results) or type(chunk_results).__name__
+                logger.warning("Batch chunk of %d documents failed: %s", len(chunk), error)
+                outcomes.extend({"error": error, "exception": chunk_results} for _ in chunk)
+            else:
+                outcomes.extend(chunk_results)
+        return outcomes
+
+    async def run_stage(self, stage_name: str, document: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Run one analysis stage on the pool."""
+        return await self.run(_run_stage_in_worker, stage_name, document, deadline)
+
+    async def analyse_lines(self, lines: List[str], stage_names: List[str]) -> List[Dict[str, Any]]:
+        """Analyse individual lines on the pool."""
+        return await self.run(_analyse_lines_in_worker, lines, stage_names)
+
+    async def ruleset_version(self) -> str:
+        """Rule-set fingerprint of the workers, fetched once and then memoised."""
+        if self._ruleset_version is None:
+            # A burst of first requests shares one lookup instead of filling the pool
+            self._ruleset_version = await self._ruleset_flight.do(
+                "ruleset", lambda: self.run(_ruleset_version_in_worker)
+            )
+        return self._ruleset_version
+
+    async def run(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Submit a picklable, module-level function to the pool and await its result.
+
+        ``timeout`` overrides the pool's task timeout for longer tasks.
+
+        Raises:
+            PoolSaturatedError: If the pool and its queue are already full
+            PoolTimeoutError: If the task does not finish within ``timeout`` seconds
+        """
+        timeout = timeout or self.timeout
+        if self.in_flight >= self.size + self.queue_depth:
+            self.rejected += 1
+            raise PoolSaturatedError(
+                f"Validation pool is saturated ({self.in_flight} tasks in flight)"
+            )
+
+        self.start()
+        with self._slots_lock:
+            self.in_flight += 1
+        future = None
+        try:
+            if self.executor_type == "thread":
+                # Carry the request id over to log lines written by the worker thread
+                future = self._executor.submit(contextvars.copy_context().run, func, *args)
+            else:
+                future = self._executor.submit(func, *args)
+            # The slot is released when the task really finishes, not when its caller
+            # stops waiting, so timed-out tasks still running keep counting
+            future.add_done_callback(self._release_slot)
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            # A running task cannot be interrupted; cancelling only stops it (and
+            # frees its slot) if it has not started yet
+            future.cancel()
+            self.timed_out += 1
+            raise PoolTimeoutError(f"Validation did not finish within {timeout} seconds")
+        except BrokenProcessPool:
+            self.failed += 1
+            logger.error("Validation worker process died; restarting the pool")
+            self.shutdown()
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            if future is None:
+                self._release_slot()
+
+    def _release_slot(self, _future: Optional[Future] = None) -> None:
+        # Done callbacks run on the worker thread (or the pool's management thread)
+        with self._slots_lock:
+            self.in_flight -= 1
+
+    def model_status(self) -> Dict[str, Any]:
+        """Readiness of the spaCy model(s) the pool validates with."""
+        if self.executor_type == "process":
+            ready_workers = self._ready_workers.value if self._ready_workers is not None else 0
+            return {
+                "ready": ready_workers > 0,
+                "ready_workers": ready_workers,
+                "workers": self.size
+            }
+
+        from app.services.validation_service import validation_service
+        return {
+            "ready": validation_service.is_ready,
+            "status": validation_service.model_status,
+            "error": validation_service.model_error
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Current pool utilisation for health reporting."""
+        busy = min(self.in_flight, self.size)
+        return {
+            "executor": self.executor_type,
+            "started": self._executor is not None,
+            "workers": self.size,
+            "busy_workers": busy,
+            "queued": self.in_flight - busy,
+            "queue_depth": self.queue_depth,
+            "utilisation": round(busy / self.size, 2) if self.size else 0.0,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "task_timeout_seconds": self.timeout
+        }
+
+
+# Create a singleton instance
+validation_pool = ValidationPool(
+    executor_type=settings.validation_executor,
+    size=settings.validation_pool_size,
+    queue_depth=settings.validation_queue_depth,
+    timeout=settings.validation_task_timeout
+)
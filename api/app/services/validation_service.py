@@ -1,26 +1,99 @@
 import re
 import logging
-from typing import List, Dict, Any, Tuple
+import threading
+import time
+from typing import List, Dict, Any, Tuple, Callable, Optional, FrozenSet, NamedTuple, Iterator, Union
 from app.models.validation import ValidationIssue, IssueType, Severity
-import json
+from app.services.rule_engine import KeywordMatcher, CompiledRules, RuleCategory
+from app.services.cache import content_hash
+from app.services.analysed_document import AnalysedDocument
+from app.services.latency_budget import StageCostModel
+from app.services.requirement_patterns import PHRASES as REQUIREMENT_PHRASES, VAGUE_MODIFIERS
+from app.core.config import settings
 import spacy
 from spacy.tokens import Doc
 
 logger = logging.getLogger(__name__)
 
+# spaCy pipeline profiles. NER-enhanced validation only reads doc.ents, ent.sent
+# and doc.sents, so the opt-in "ner" profile drops the tagger, attribute ruler,
+# lemmatizer and parser and takes sentence boundaries from the fast senter.
+# Senter boundaries differ from the parser's, which changes the sentence
+# context of NER issues and the short-sentence "the system" check, so "full"
+# stays the default.
+PIPELINE_PROFILES = {
+    "full": {"exclude": [], "enable": []},
+    "ner": {"exclude": ["tagger", "attribute_ruler", "lemmatizer", "parser"], "enable": ["senter"]}
+}
+
+def load_pipeline(model: str, profile: str = "full") -> spacy.language.Language:
+    """
+    Load a spaCy model with the components required by a pipeline profile.
+    
+    Args:
+        model (str): Installed spaCy model name, e.g. "en_core_web_sm"
+        profile (str): Key of PIPELINE_PROFILES
+        
+    Returns:
+        The loaded pipeline
+    """
+    if profile not in PIPELINE_PROFILES:
+        raise ValueError(f"Unknown spaCy pipeline profile '{profile}'. Choose from {list(PIPELINE_PROFILES)}")
+    
+    components = PIPELINE_PROFILES[profile]
+    nlp = spacy.load(model, exclude=components["exclude"])
+    for name in components["enable"]:
+        if name in nlp.disabled:
+            nlp.enable_pipe(name)
+        elif name == "senter" and name not in nlp.pipe_names and "sentencizer" not in nlp.pipe_names:
+            # Models without a trained senter fall back to the rule-based sentencizer
+            nlp.add_pipe("sentencizer", first=True)
+    # Match the entity and sentence patterns in the same pass as NER
+    nlp.add_pipe("requirement_patterns", last=True)
+    return nlp
+
+# Quality score deduction per issue severity
+SEVERITY_WEIGHTS = {
+    Severity.LOW: 1,
+    Severity.MEDIUM: 3,
+    Severity.HIGH: 5,
+    Severity.CRITICAL: 10
+}
+
+# Validation modes and the stages each runs: "fast" answers with compiled rules
+# only, "standard" adds NER and completeness, "deep" adds the expensive checks
+STANDARD_MODES = frozenset({"standard", "deep"})
+ALL_MODES = frozenset({"fast"}) | STANDARD_MODES
+
+# Stage cost priors as (overhead seconds, seconds per character), deliberately
+# pessimistic; StageCostModel replaces the rates with measured ones
+STAGE_COST_PRIORS = {
+    "rules": (0.0001, 2e-6),
+    "ner": (0.001, 1.5e-5),
+    "completeness": (0.00005, 2.5e-7),
+    "consistency": (0.00005, 1e-6)
+}
+
+# Lines whose word sets overlap at least this much (Jaccard) are near-duplicates
+DUPLICATE_SIMILARITY = 0.7
+WORD_PATTERN = re.compile(r"\w+")
+
+class AnalysisStage(NamedTuple):
+    """A validation stage, the focus areas it serves and the modes it runs in."""
+    name: str
+    focus_areas: FrozenSet[str]
+    requires_model: bool
+    run: Callable[[AnalysedDocument], List[ValidationIssue]]
+    modes: FrozenSet[str] = ALL_MODES
+
 class ValidationService:
     def __init__(self):
-        # Initialize spaCy NER model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-            print(f"✅ spaCy NER model loaded successfully")
-        except OSError:
-            print(f"⚠️ spaCy model not found. Installing...")
-            import subprocess
-            import sys
-            subprocess.check_call([sys.executable, "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
-            print(f"✅ spaCy NER model installed and loaded")
+        # spaCy NER model is loaded in the background (see start_model_loading) so the
+        # service can answer rule-only requests while it is still loading
+        self.nlp = None
+        self.model_status = "not_loaded"
+        self.model_error: Optional[str] = None
+        self._model_thread: Optional[threading.Thread] = None
         
         # Ambiguous keywords (vague terms that are too subjective for technical specs)
         self.ambiguous_words = {
@@ -56,6 +129,9 @@ class ValidationService:
             "sekitar", "kira-kira", "hampir", "kurang lebih"
         }
         
+        # Compile all ambiguous words into one matcher so a document is scanned once
+        self.ambiguous_matcher = KeywordMatcher(self.ambiguous_words)
+        
         # Vague phrases that indicate incompleteness
         self.vague_phrases = [
             r"\b(to be determined|TBD|tbd)\b",
@@ -92,6 +168,31 @@ class ValidationService:
             r"\b(jika tersedia|jika memungkinkan)\b"
         ]
         
+        # Merge the three rule lists into one compiled pattern with a group per category
+        self.rule_engine = CompiledRules([
+            RuleCategory(
+                name="vagueness",
+                issue_type=IssueType.VAGUENESS,
+                severity=Severity.HIGH,
+                suggestion="Provide specific details instead of vague terms",
+                patterns=self.vague_phrases
+            ),
+            RuleCategory(
+                name="technical_debt",
+                issue_type=IssueType.TECHNICAL_DEBT,
+                severity=Severity.MEDIUM,
+                suggestion="Consider long-term implications and proper solutions",
+                patterns=self.technical_debt_indicators
+            ),
+            RuleCategory(
+                name="business_risk",
+                issue_type=IssueType.BUSINESS_RISK,
+                severity=Severity.HIGH,
+                suggestion="Clarify dependencies and assumptions",
+                patterns=self.business_risk_indicators
+            )
+        ])
+        
         # Required sections for completeness check
         self.required_sections = {
             "users": [
@@ -116,247 +217,641 @@ class ValidationService:
             ]
         }
         
-        print(f"🔧 Initializing ValidationService...")
-        print(f"📝 Loaded {len(self.ambiguous_words)} ambiguous words")
-        print(f"📝 Loaded {len(self.vague_phrases)} vague phrase patterns")
-        print(f"📝 Loaded {len(self.required_sections)} required section patterns")
-        print(f"🤖 NER model: {self.nlp.meta.get('name', 'Unknown')}")
-        print(f"✅ ValidationService initialized successfully")
+        # One compiled pattern per required section (any of its patterns marks it present)
+        self.section_patterns = {
+            section_name: re.compile("|".join(patterns), re.IGNORECASE)
+            for section_name, patterns in self.required_sections.items()
+        }
+        
+        # Analysis stages in execution order; only stages serving a requested focus area run
+        self.stages = [
+            AnalysisStage(
+                name="rules",
+                focus_areas=frozenset({"ambiguity", "clarity", "vagueness", "technical_debt", "business_risk"}),
+                requires_model=False,
+                run=self._rule_based_validation
+            ),
+            AnalysisStage(
+                name="ner",
+                focus_areas=frozenset({"clarity", "completeness", "entities", "vagueness"}),
+                requires_model=True,
+                run=self._ner_enhanced_validation,
+                modes=STANDARD_MODES
+            ),
+            AnalysisStage(
+                name="completeness",
+                focus_areas=frozenset({"completeness"}),
+                requires_model=False,
+                run=self._completeness_check,
+                modes=STANDARD_MODES
+            ),
+            AnalysisStage(
+                name="consistency",
+                focus_areas=frozenset({"ambiguity", "clarity", "consistency"}),
+                requires_model=False,
+                run=self._consistency_check,
+                modes=frozenset({"deep"})
+            )
+        ]
+        
+        # Expected stage durations, for skipping stages that would overrun a deadline
+        self.stage_costs = StageCostModel(STAGE_COST_PRIORS)
+        
+        # Fingerprint of every rule list and the stage plan; cached results from
+        # another rule set never match
+        self.ruleset_version = content_hash(
+            sorted(self.ambiguous_words),
+            self.vague_phrases,
+            self.technical_debt_indicators,
+            self.business_risk_indicators,
+            self.required_sections,
+            REQUIREMENT_PHRASES,
+            [(stage.name, sorted(stage.focus_areas), sorted(stage.modes)) for stage in self.stages]
+        )
+        
+        for note in self.rule_engine.report():
+            logger.warning("Rule set %s", note)
+        logger.info(
+            "ValidationService initialized: %d ambiguous words, %d vague phrase patterns, "
+            "%d rule alternatives, %d required sections, rule set %s, NER model %s (loaded in background)",
+            len(self.ambiguous_words), len(self.vague_phrases),
+            sum(len(alts) for alts in self.rule_engine.alternatives.values()),
+            len(self.required_sections), self.ruleset_version[:12], settings.spacy_model
+        )
+    
+    @property
+    def is_ready(self) -> bool:
+        """Whether the spaCy model is loaded and NER-enhanced validation is available."""
+        return self.model_status == "ready"
+    
+    def start_model_loading(self, on_ready: Optional[Callable[[], None]] = None) -> None:
+        """
+        Load the spaCy model on a background thread.
+        
+        Safe to call more than once; only the first call starts loading.
+        
+        Args:
+            on_ready (Callable): Optional callback invoked once the model is ready
+        """
+        if self._model_thread is not None:
+            return
+        self.model_status = "loading"
+        self._model_thread = threading.Thread(
+            target=self.load_model,
+            args=(on_ready,),
+            name="spacy-model-loader",
+            daemon=True
+        )
+        self._model_thread.start()
+    
+    def load_model(self, on_ready: Optional[Callable[[], None]] = None) -> None:
+        """Load the spaCy model, downloading it first if allowed and missing."""
+        self.model_status = "loading"
+        try:
+            try:
+                nlp = load_pipeline(settings.spacy_model, settings.spacy_pipeline_profile)
+            except OSError:
+                if not settings.spacy_auto_download:
+                    raise
+                logger.warning("spaCy model %s not found. Installing...", settings.spacy_model)
+                import subprocess
+                import sys
+                subprocess.check_call([sys.executable, "-m", "spacy", "download", settings.spacy_model])
+                nlp = load_pipeline(settings.spacy_model, settings.spacy_pipeline_profile)
+            
+            # Run once so the first real request does not pay lazy initialisation costs
+            nlp("Warm up the validation pipeline.")
+            self.nlp = nlp
+            self.model_status = "ready"
+            logger.info("spaCy NER model loaded: %s (%s profile: %s)",
+                        nlp.meta.get("name", "Unknown"), settings.spacy_pipeline_profile, nlp.pipe_names)
+            if on_ready is not None:
+                on_ready()
+        except Exception as e:
+            self.model_status = "failed"
+            self.model_error = str(e)
+            logger.error("Failed to load spaCy model %s: %s", settings.spacy_model, e)
     
-    def validate_document(self, document: str, focus_areas: List[str] = None) -> Dict[str, Any]:
+    def plan_stages(self, focus_areas: Optional[List[str]] = None, mode: str = "standard") -> List[AnalysisStage]:
+        """
+        Select the analysis stages needed for the requested focus areas and mode.
+        
+        No focus areas, or only unrecognised ones, selects every stage of the mode.
+        
+        Args:
+            focus_areas (List[str]): Areas to focus on
+            mode (str): "fast", "standard" or "deep"
+        """
+        if mode not in ALL_MODES:
+            raise ValueError(f"Unknown validation mode '{mode}'. Choose from {sorted(ALL_MODES)}")
+        stages = [stage for stage in self.stages if mode in stage.modes]
+        if not focus_areas:
+            return stages
+        
+        requested = {area.strip().lower() for area in focus_areas}
+        planned = [stage for stage in stages if stage.focus_areas & requested]
+        if not planned and not any(stage.focus_areas & requested for stage in self.stages):
+            logger.warning("No stage serves focus areas %s; running all %s stages", focus_areas, mode)
+            return stages
+        return planned
+    
+    def validate_document(
+        self,
+        document: str,
+        focus_areas: List[str] = None,
+        mode: str = "standard",
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Validate a requirements document for various quality issues using classic CS rule-based techniques.
         
         Args:
             document (str): The document to validate
             focus_areas (List[str]): Areas to focus on (ambiguity, completeness, clarity, etc.)
+            mode (str): "fast", "standard" or "deep", see plan_stages
+            deadline (float): Absolute ``time.time()`` the result is due by; a stage
+                expected to finish after it is skipped
             
         Returns:
-            Dict containing validation results
+            Dict containing validation results. ``stages_run`` lists the analysis
+            stages that ran and ``stages_skipped`` those skipped for the deadline
+            (the fast tier always runs, see build_result for partial results);
+            ``degraded`` is True when the spaCy model was not ready yet and the NER
+            stage had to be skipped. ``timings`` maps each stage (and ``scoring``)
+            to its duration in seconds, for metrics.
         """
         try:
-            print(f"🔍 Starting document validation...")
-            print(f"📄 Document length: {len(document)} characters")
-            print(f"🎯 Focus areas: {focus_areas}")
+            logger.debug("Starting document validation: %d characters, focus areas %s, %s mode",
+                         len(document), focus_areas, mode)
             
-            # Rule-based validation using classic CS pattern matching
-            issues = self._rule_based_validation(document)
-            print(f"✅ Rule-based validation found {len(issues)} issues")
+            # Index the document once; every stage reads from the same analysis
+            analysed = AnalysedDocument(document)
             
-            # NER-enhanced validation
-            ner_issues = self._ner_enhanced_validation(document)
-            print(f"✅ NER-enhanced validation found {len(ner_issues)} issues")
+            # Run only the stages that serve the requested focus areas and mode
+            all_issues = []
+            stages_run = []
+            stages_skipped = []
+            timings = {}
+            degraded = False
+            for stage in self.plan_stages(focus_areas, mode):
+                # NER-enhanced validation is skipped while the model is still loading
+                if stage.requires_model and not self.is_ready:
+                    degraded = True
+                    logger.warning("spaCy model not ready (%s); skipping %s stage", self.model_status, stage.name)
+                    continue
+                if not self._fits_deadline(stage, len(document), deadline):
+                    logger.debug("Skipping %s stage: expected to overrun the deadline", stage.name)
+                    stages_skipped.append(stage.name)
+                    continue
+                stage_started = time.perf_counter()
+                stage_issues = stage.run(analysed)
+                timings[stage.name] = time.perf_counter() - stage_started
+                self.stage_costs.observe(stage.name, len(document), timings[stage.name])
+                logger.debug("%s stage found %d issues", stage.name, len(stage_issues))
+                all_issues.extend(stage_issues)
+                stages_run.append(stage.name)
             
-            # Completeness check
-            completeness_issues = self._completeness_check(document)
-            print(f"✅ Completeness check found {len(completeness_issues)} issues")
-            
-            # Combine all issues
-            all_issues = issues + ner_issues + completeness_issues
-            print(f"✅ Total validation found {len(all_issues)} issues")
-            
-            # Calculate quality score
-            score = self._calculate_quality_score(document, all_issues)
-            print(f"📊 Quality score: {score}")
+            logger.debug("Total validation found %d issues", len(all_issues))
+            scoring_started = time.perf_counter()
+            result = self.build_result(document, all_issues, stages_run, degraded, stages_skipped, mode)
+            timings["scoring"] = time.perf_counter() - scoring_started
+            result["timings"] = timings
+            return result
             
-            # Generate summary and suggestions
-            summary = self._generate_summary(all_issues, score)
-            suggestions = self._generate_suggestions(all_issues)
+        except Exception as e:
+            logger.exception("Error validating document: %s", e)
+            raise Exception(f"Failed to validate document: {str(e)}")
+    
+    def _fits_deadline(self, stage: AnalysisStage, chars: int, deadline: Optional[float]) -> bool:
+        """Whether to run a stage under the deadline; the fast tier (compiled rules) always runs."""
+        return "fast" in stage.modes or self.stage_costs.fits(stage.name, chars, deadline)
+    
+    def run_stage(self, stage_name: str, document: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run a single analysis stage, for callers that report stages as they finish.
+        
+        Args:
+            stage_name (str): Name of a stage from plan_stages
+            document (str): The document to validate
+            deadline (float): Absolute ``time.time()`` the result is due by
             
-            return {
-                "issues": all_issues,
-                "summary": summary,
-                "score": score,
-                "suggestions": suggestions,
-                "word_count": len(document.split()),
-                "issue_count": len(all_issues)
-            }
+        Returns:
+            Dict with the stage ``name``, its ``issues``, ``skipped`` with the
+            ``reason`` ("model_not_ready" while the spaCy model loads, "deadline"
+            when the stage is expected to overrun the deadline) and ``seconds``
+        """
+        stage = next((stage for stage in self.stages if stage.name == stage_name), None)
+        if stage is None:
+            raise ValueError(f"Unknown analysis stage '{stage_name}'")
+        
+        if stage.requires_model and not self.is_ready:
+            logger.warning("spaCy model not ready (%s); skipping %s stage", self.model_status, stage.name)
+            return {"name": stage.name, "issues": [], "skipped": True, "reason": "model_not_ready", "seconds": 0.0}
+        if not self._fits_deadline(stage, len(document), deadline):
+            logger.debug("Skipping %s stage: expected to overrun the deadline", stage.name)
+            return {"name": stage.name, "issues": [], "skipped": True, "reason": "deadline", "seconds": 0.0}
+        
+        started = time.perf_counter()
+        issues = stage.run(AnalysedDocument(document))
+        seconds = time.perf_counter() - started
+        self.stage_costs.observe(stage.name, len(document), seconds)
+        return {"name": stage.name, "issues": issues, "skipped": False, "reason": None, "seconds": seconds}
+    
+    def validate_documents(
+        self,
+        documents: List[str],
+        focus_areas: List[str] = None,
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+        mode: str = "standard"
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate many documents at once.
+        
+        The rule stage scans all documents in one pass of each compiled matcher
+        and the NER stage parses them with ``nlp.pipe`` instead of one
+        ``nlp(document)`` call per document. Results match validate_document.
+        
+        Args:
+            documents (List[str]): The documents to validate
+            focus_areas (List[str]): Areas to focus on, applied to every document
+            batch_size (int): Documents per nlp.pipe batch (default from settings)
+            n_process (int): Processes nlp.pipe parses with (default from settings)
+            mode (str): "fast", "standard" or "deep", applied to every document
             
+        Returns:
+            One dict per document, in input order: ``{"result": {...}}`` as returned
+            by validate_document, or ``{"error": "..."}`` if that document failed.
+            The rule stage's ``timings`` are the batch scan time divided evenly,
+            and the NER stage's include the document's share of nlp.pipe.
+        """
+        stages = self.plan_stages(focus_areas, mode)
+        stage_names = [stage.name for stage in stages]
+        run_ner = "ner" in stage_names and self.is_ready
+        degraded = "ner" in stage_names and not self.is_ready
+        if degraded:
+            logger.warning("spaCy model not ready (%s); skipping ner stage for %d documents",
+                           self.model_status, len(documents))
+        
+        rules_started = time.perf_counter()
+        rule_issues = self._rule_based_validation_batch(documents) if "rules" in stage_names else None
+        rules_seconds = (time.perf_counter() - rules_started) / max(len(documents), 1)
+        docs = self._parse_documents(
+            documents,
+            batch_size or settings.validation_batch_size,
+            n_process or settings.validation_batch_n_process
+        ) if run_ner else iter([None] * len(documents))
+        
+        results = []
+        # Per stage, characters validated and seconds spent, for the cost model
+        totals: Dict[str, List[float]] = {}
+        for index, document in enumerate(documents):
+            try:
+                # nlp.pipe parses a whole batch when the first of its documents is requested
+                parse_started = time.perf_counter()
+                doc = next(docs)
+                parse_seconds = time.perf_counter() - parse_started
+                if isinstance(doc, Exception):
+                    raise doc
+                analysed = AnalysedDocument(document, doc)
+                issues = []
+                stages_run = []
+                timings = {}
+                for stage in stages:
+                    stage_started = time.perf_counter()
+                    if stage.name == "rules":
+                        issues.extend(rule_issues[index])
+                        timings["rules"] = rules_seconds
+                    elif stage.name == "ner":
+                        if doc is None:
+                            continue
+                        issues.extend(self._ner_doc_issues(analysed))
+                        timings["ner"] = parse_seconds + time.perf_counter() - stage_started
+                    else:
+                        issues.extend(stage.run(analysed))
+                        timings[stage.name] = time.perf_counter() - stage_started
+                    stages_run.append(stage.name)
+                    stage_totals = totals.setdefault(stage.name, [0, 0.0])
+                    stage_totals[0] += len(document)
+                    stage_totals[1] += timings[stage.name]
+                scoring_started = time.perf_counter()
+                result = self.build_result(document, issues, stages_run, degraded, mode=mode)
+                timings["scoring"] = time.perf_counter() - scoring_started
+                result["timings"] = timings
+                results.append({"result": result})
+            except Exception as e:
+                logger.warning("Batch document %d failed: %s", index, e)
+                results.append({"error": f"Failed to validate document: {str(e)}"})
+        
+        # One observation per stage: the first document's timing carries the whole nlp.pipe batch
+        for stage_name, (chars, seconds) in totals.items():
+            self.stage_costs.observe(stage_name, chars, seconds)
+        
+        logger.debug("Batch validation of %d documents: %d failed", len(documents),
+                     sum(1 for result in results if "error" in result))
+        return results
+    
+    def _parse_documents(self, documents: List[str], batch_size: int, n_process: int) -> Iterator[Union[Doc, Exception]]:
+        """
+        Parse documents with nlp.pipe, yielding a Doc (or the error) per document in order.
+        
+        nlp.pipe stops at the first failing document, so the remaining documents are
+        then parsed one at a time and only the failing ones yield their exception.
+        """
+        parsed = 0
+        try:
+            for doc in self.nlp.pipe(documents, batch_size=batch_size, n_process=n_process):
+                parsed += 1
+                yield doc
+            return
         except Exception as e:
-            print(f"❌ Error in validate_document: {str(e)}")
-            print(f"❌ Error type: {type(e)}")
-            import traceback
-            print(f"❌ Full traceback: {traceback.format_exc()}")
-            logger.error(f"Error validating document: {str(e)}")
-            raise Exception(f"Failed to validate document: {str(e)}")
+            logger.warning("nlp.pipe failed after %d of %d documents (%s); parsing the rest one at a time",
+                           parsed, len(documents), e)
+        
+        for document in documents[parsed:]:
+            try:
+                yield self.nlp(document)
+            except Exception as e:
+                yield e
+    
+    def build_result(
+        self,
+        document: str,
+        issues: List[ValidationIssue],
+        stages_run: List[str],
+        degraded: bool,
+        stages_skipped: Optional[List[str]] = None,
+        mode: str = "standard"
+    ) -> Dict[str, Any]:
+        """
+        Score, summary and suggestions for the issues collected from the stages.
+        
+        A result missing stages skipped for the deadline says so in its summary.
+        When no stage ran at all there is nothing to score, and ``score`` is None
+        rather than a clean 100.
+        """
+        if stages_skipped and not stages_run:
+            score = None
+            summary = (f"Partial result: no analysis finished within the deadline "
+                       f"({', '.join(stages_skipped)} skipped), so the document was not scored.")
+        else:
+            # Calculate quality score
+            score = self._calculate_quality_score(document, issues)
+            logger.debug("Quality score: %s", score)
+            summary = self._generate_summary(issues, score)
+            if stages_skipped:
+                summary = f"Partial result ({', '.join(stages_skipped)} skipped to meet the deadline). {summary}"
+        suggestions = self._generate_suggestions(issues)
+        
+        return {
+            "issues": issues,
+            "summary": summary,
+            "score": score,
+            "suggestions": suggestions,
+            "word_count": len(document.split()),
+            "issue_count": len(issues),
+            "degraded": degraded,
+            "stages_run": stages_run,
+            "stages_skipped": stages_skipped or [],
+            "mode": mode
+        }
+    
+    def analyse_lines(self, lines: List[str], stage_names: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyse lines independently of each other, for incremental (live) validation.
+        
+        Args:
+            lines (List[str]): Line texts to analyse
+            stage_names (List[str]): Planned stages, see plan_stages
+            
+        Returns:
+            One dict per line with JSON-ready ``issues`` (rule and NER issues for that
+            line), the required ``sections`` it mentions, and the ``has_person`` /
+            ``mentions_roles`` flags used by the stakeholder check. ``complete`` is
+            False when NER was planned but the model was not ready yet.
+        """
+        run_ner = "ner" in stage_names and self.is_ready
+        docs = self.nlp.pipe(lines) if run_ner else [None] * len(lines)
+        
+        analyses = []
+        for line, doc in zip(lines, docs):
+            analysed = AnalysedDocument(line, doc)
+            issues = self._rule_based_validation(analysed) if "rules" in stage_names else []
+            if doc is not None:
+                issues.extend(self._ner_issues(analysed))
+            analyses.append({
+                "issues": [issue.model_dump(mode="json") for issue in issues],
+                "sections": self._sections_in(line) if "completeness" in stage_names else [],
+                "has_person": doc is not None and any(ent.label_ == "PERSON" for ent in doc.ents),
+                "mentions_roles": self._mentions_roles(analysed.lower),
+                "complete": run_ner or "ner" not in stage_names
+            })
+        return analyses
     
-    def _rule_based_validation(self, document: str) -> List[ValidationIssue]:
+    def _rule_based_validation(self, analysed: AnalysedDocument) -> List[ValidationIssue]:
         """Perform rule-based validation using classic CS pattern matching techniques."""
-        issues = []
-        lines = document.split('\n')
+        # Find ambiguous words and rule matches for every line in a single pass each
+        issues = self._rule_issues(
+            analysed.lines,
+            self.ambiguous_matcher.scan(analysed.text, analysed.line_starts),
+            self.rule_engine.scan(analysed.text, analysed.line_starts)
+        )
+        logger.debug("Rule-based validation completed: %d issues found", len(issues))
+        return issues
+    
+    def _rule_based_validation_batch(self, documents: List[str]) -> List[List[ValidationIssue]]:
+        """
+        Rule-based validation of many documents with one scan of each matcher.
         
-        print(f"🔍 Performing rule-based validation...")
+        The documents are joined by newlines and scanned together. No rule or
+        keyword can match across a line break, so each document's hits are its
+        own lines' hits, renumbered from 1.
+        """
+        combined = '\n'.join(documents)
+        ambiguous_hits = self.ambiguous_matcher.scan(combined)
+        rule_hits = self.rule_engine.scan(combined)
         
+        results = []
+        first_line = 0
+        for document in documents:
+            lines = document.split('\n')
+            line_range = range(first_line + 1, first_line + len(lines) + 1)
+            results.append(self._rule_issues(
+                lines,
+                {line_num - first_line: ambiguous_hits[line_num] for line_num in line_range if line_num in ambiguous_hits},
+                {line_num - first_line: rule_hits[line_num] for line_num in line_range if line_num in rule_hits}
+            ))
+            first_line += len(lines)
+        return results
+    
+    def _rule_issues(self, lines: List[str], ambiguous_hits: Dict[int, List[str]], rule_hits: Dict[int, list]) -> List[ValidationIssue]:
+        """Turn per-line keyword and rule hits into issues."""
+        issues = []
         for line_num, line in enumerate(lines, 1):
             # Check for ambiguous words
-            for word in self.ambiguous_words:
-                if re.search(rf'\b{re.escape(word)}\b', line, re.IGNORECASE):
-                    # Generate specific suggestions based on word type
-                    suggestion = self._generate_ambiguity_suggestion(word)
-                    issues.append(ValidationIssue(
-                        type=IssueType.AMBIGUITY,
-                        severity=Severity.MEDIUM,
-                        word_or_phrase=word,
-                        context=line.strip(),
-                        suggestion=suggestion,
-                        line_number=line_num
-                    ))
-            
-            # Check for vague phrases
-            for pattern in self.vague_phrases:
-                matches = re.finditer(pattern, line, re.IGNORECASE)
-                for match in matches:
-                    issues.append(ValidationIssue(
-                        type=IssueType.VAGUENESS,
-                        severity=Severity.HIGH,
-                        word_or_phrase=match.group(),
-                        context=line.strip(),
-                        suggestion="Provide specific details instead of vague terms",
-                        line_number=line_num
-                    ))
-            
-            # Check for technical debt indicators
-            for pattern in self.technical_debt_indicators:
-                matches = re.finditer(pattern, line, re.IGNORECASE)
-                for match in matches:
-                    issues.append(ValidationIssue(
-                        type=IssueType.TECHNICAL_DEBT,
-                        severity=Severity.MEDIUM,
-                        word_or_phrase=match.group(),
-                        context=line.strip(),
-                        suggestion="Consider long-term implications and proper solutions",
-                        line_number=line_num
-                    ))
+            for word in ambiguous_hits.get(line_num, []):
+                # Generate specific suggestions based on word type
+                suggestion = self._generate_ambiguity_suggestion(word)
+                issues.append(ValidationIssue(
+                    type=IssueType.AMBIGUITY,
+                    severity=Severity.MEDIUM,
+                    word_or_phrase=word,
+                    context=line.strip(),
+                    suggestion=suggestion,
+                    line_number=line_num
+                ))
             
-            # Check for business risk indicators
-            for pattern in self.business_risk_indicators:
-                matches = re.finditer(pattern, line, re.IGNORECASE)
-                for match in matches:
-                    issues.append(ValidationIssue(
-                        type=IssueType.BUSINESS_RISK,
-                        severity=Severity.HIGH,
-                        word_or_phrase=match.group(),
-                        context=line.strip(),
-                        suggestion="Clarify dependencies and assumptions",
-                        line_number=line_num
-                    ))
-        
-        print(f"📊 Rule-based validation completed: {len(issues)} issues found")
+            # Check for vague phrases, technical debt and business risk indicators
+            for match in rule_hits.get(line_num, []):
+                issues.append(ValidationIssue(
+                    type=match.category.issue_type,
+                    severity=match.category.severity,
+                    word_or_phrase=match.text,
+                    context=line.strip(),
+                    suggestion=match.category.suggestion,
+                    line_number=line_num
+                ))
         return issues
     
-    def _ner_enhanced_validation(self, document: str) -> List[ValidationIssue]:
+    def _ner_enhanced_validation(self, analysed: AnalysedDocument) -> List[ValidationIssue]:
         """Perform NER-enhanced validation using spaCy."""
-        issues = []
-        
-        print(f"🔍 Performing NER-enhanced validation...")
-        
         # Process document with spaCy
-        doc = self.nlp(document)
+        if analysed.doc is None:
+            analysed.doc = self.nlp(analysed.text)
+        return self._ner_doc_issues(analysed)
+    
+    def _ner_doc_issues(self, analysed: AnalysedDocument) -> List[ValidationIssue]:
+        """NER-enhanced issues for an already parsed document."""
+        issues = self._ner_issues(analysed)
+        issues.extend(self._check_stakeholders(analysed))
+        
+        logger.debug("NER-enhanced validation completed: %d issues found", len(issues))
+        return issues
+    
+    def _ner_issues(self, analysed: AnalysedDocument) -> List[ValidationIssue]:
+        """Entity and sentence-level issues; these only depend on the sentences they occur in."""
+        issues = []
         
         # Extract entities and their context
-        entities = self._extract_entities(doc)
-        print(f"📊 Found {len(entities)} entities in document")
+        entities = self._extract_entities(analysed)
+        logger.debug("Found %d entities in document", len(entities))
         
         # Analyze entities for validation issues
         for entity in entities:
-            issue = self._analyze_entity_for_issues(entity, doc)
+            issue = self._analyze_entity_for_issues(entity)
             if issue:
                 issues.append(issue)
         
         # Check for entity-related patterns
-        entity_pattern_issues = self._check_entity_patterns(doc)
+        entity_pattern_issues = self._check_entity_patterns(analysed)
         issues.extend(entity_pattern_issues)
         
-        print(f"📊 NER-enhanced validation completed: {len(issues)} issues found")
         return issues
     
-    def _extract_entities(self, doc: Doc) -> List[Dict[str, Any]]:
+    def _extract_entities(self, analysed: AnalysedDocument) -> List[Dict[str, Any]]:
         """Extract named entities from the document."""
         entities = []
         
-        for ent in doc.ents:
+        for ent in analysed.doc.ents:
+            sentence = ent.sent
+            matches = analysed.sentence_matches.get(sentence.start_char, {})
             entities.append({
                 "text": ent.text,
                 "label": ent.label_,
                 "start": ent.start_char,
                 "end": ent.end_char,
-                "context": ent.sent.text.strip()
+                "line_number": analysed.line_at(ent.start_char),
+                "context": sentence.text.strip(),
+                "matches": matches,
+                "vague_modifiers": [analysed.lower[match.start:match.end] for match in matches.get("VAGUE_MODIFIER", [])]
             })
         
         return entities
     
-    def _analyze_entity_for_issues(self, entity: Dict[str, Any], doc: Doc) -> ValidationIssue:
+    def _analyze_entity_for_issues(self, entity: Dict[str, Any]) -> ValidationIssue:
         """Analyze an entity for potential validation issues."""
         text = entity["text"]
         label = entity["label"]
         context = entity["context"]
+        matches = entity["matches"]
         
         # Check for vague entity descriptions
-        if label in ["PERSON", "ORG", "PRODUCT"]:
-            # Look for vague modifiers around the entity
-            vague_modifiers = ["appropriate", "suitable", "good", "proper", "correct"]
-            for modifier in vague_modifiers:
-                if modifier.lower() in context.lower():
-                    return ValidationIssue(
-                        type=IssueType.VAGUENESS,
-                        severity=Severity.MEDIUM,
-                        word_or_phrase=f"{modifier} {text}",
-                        context=context,
-                        suggestion=f"Specify what makes {text} appropriate/suitable (e.g., 'experienced in Python development', 'certified in AWS')",
-                        line_number=None
-                    )
+        if label in ["PERSON", "ORG", "PRODUCT"] and "VAGUE_MODIFIER" in matches:
+            # Vague modifiers in the entity's sentence, reported in VAGUE_MODIFIERS order
+            modifier = min(entity["vague_modifiers"], key=VAGUE_MODIFIERS.index)
+            return ValidationIssue(
+                type=IssueType.VAGUENESS,
+                severity=Severity.MEDIUM,
+                word_or_phrase=f"{modifier} {text}",
+                context=context,
+                suggestion=f"Specify what makes {text} appropriate/suitable (e.g., 'experienced in Python development', 'certified in AWS')",
+                line_number=entity["line_number"],
+                start_char=entity["start"],
+                end_char=entity["end"]
+            )
         
         # Check for missing specificity in technical entities
         if label in ["PRODUCT", "ORG"]:
-            if any(word in context.lower() for word in ["system", "platform", "tool"]):
-                if not any(word in context.lower() for word in ["version", "specific", "particular", "version"]):
-                    return ValidationIssue(
-                        type=IssueType.INCOMPLETENESS,
-                        severity=Severity.MEDIUM,
-                        word_or_phrase=text,
-                        context=context,
-                        suggestion=f"Specify version or specific details for {text} (e.g., 'Python 3.11', 'AWS Lambda')",
-                        line_number=None
-                    )
+            if "TECHNICAL_CONTEXT" in matches and "SPECIFICITY" not in matches:
+                return ValidationIssue(
+                    type=IssueType.INCOMPLETENESS,
+                    severity=Severity.MEDIUM,
+                    word_or_phrase=text,
+                    context=context,
+                    suggestion=f"Specify version or specific details for {text} (e.g., 'Python 3.11', 'AWS Lambda')",
+                    line_number=entity["line_number"],
+                    start_char=entity["start"],
+                    end_char=entity["end"]
+                )
         
         return None
     
-    def _check_entity_patterns(self, doc: Doc) -> List[ValidationIssue]:
+    def _check_entity_patterns(self, analysed: AnalysedDocument) -> List[ValidationIssue]:
         """Check for problematic patterns involving entities."""
         issues = []
         
-        # Check for "the system" without proper context
-        for sent in doc.sents:
-            sent_text = sent.text.lower()
-            if "the system" in sent_text and len(sent_text.split()) < 10:
-                # Look for vague descriptions
-                vague_words = ["should", "must", "will", "can", "may"]
-                for word in vague_words:
-                    if f"{word} be" in sent_text:
-                        issues.append(ValidationIssue(
-                            type=IssueType.VAGUENESS,
-                            severity=Severity.HIGH,
-                            word_or_phrase="the system",
-                            context=sent.text.strip(),
-                            suggestion="Specify which system component and what behavior is expected",
-                            line_number=None
-                        ))
-                        break
-        
-        # Check for missing stakeholder identification
-        person_entities = [ent for ent in doc.ents if ent.label_ == "PERSON"]
-        if not person_entities and any(word in doc.text.lower() for word in ["user", "admin", "manager"]):
-            issues.append(ValidationIssue(
-                type=IssueType.INCOMPLETENESS,
-                severity=Severity.MEDIUM,
-                word_or_phrase="stakeholder identification",
-                context="Document structure",
-                suggestion="Identify specific stakeholders by name or role (e.g., 'System Administrator', 'End Users')",
-                line_number=None
-            ))
+        # Check for "the system" with a modal "... be" in short sentences
+        for matches in analysed.sentence_matches.values():
+            if "THE_SYSTEM" not in matches or "MODAL_BE" not in matches:
+                continue
+            match = matches["THE_SYSTEM"][0]
+            context = analysed.text[match.sentence_start:match.sentence_end].strip()
+            if len(context.split()) < 10:
+                issues.append(ValidationIssue(
+                    type=IssueType.VAGUENESS,
+                    severity=Severity.HIGH,
+                    word_or_phrase="the system",
+                    context=context,
+                    suggestion="Specify which system component and what behavior is expected",
+                    line_number=analysed.line_at(match.start),
+                    start_char=match.start,
+                    end_char=match.end
+                ))
         
         return issues
     
+    def _check_stakeholders(self, analysed: AnalysedDocument) -> List[ValidationIssue]:
+        """Document-level check for missing stakeholder identification."""
+        has_person = any(ent.label_ == "PERSON" for ent in analysed.doc.ents)
+        return self._stakeholder_issues(has_person, self._mentions_roles(analysed.lower))
+    
+    def _mentions_roles(self, text_lower: str) -> bool:
+        """Whether the lowercased text refers to generic roles instead of named stakeholders."""
+        return any(word in text_lower for word in ["user", "admin", "manager"])
+    
+    def _stakeholder_issues(self, has_person: bool, mentions_roles: bool) -> List[ValidationIssue]:
+        """Flag documents that mention roles but never name a person."""
+        if has_person or not mentions_roles:
+            return []
+        return [ValidationIssue(
+            type=IssueType.INCOMPLETENESS,
+            severity=Severity.MEDIUM,
+            word_or_phrase="stakeholder identification",
+            context="Document structure",
+            suggestion="Identify specific stakeholders by name or role (e.g., 'System Administrator', 'End Users')",
+            line_number=None
+        )]
+    
     def _generate_ambiguity_suggestion(self, word: str) -> str:
         """Generate specific suggestions for ambiguous words."""
         word_lower = word.lower()
@@ -385,57 +880,89 @@ class ValidationService:
         else:
             return f"Replace '{word}' with specific, measurable criteria"
     
-    def _completeness_check(self, document: str) -> List[ValidationIssue]:
+    def _completeness_check(self, analysed: AnalysedDocument) -> List[ValidationIssue]:
         """Check if basic sections have been described (completeness check)."""
-        issues = []
+        # Check each required section
+        found_sections = self._sections_in(analysed.text)
+        issues = [
+            self._missing_section_issue(section_name)
+            for section_name in self.required_sections
+            if section_name not in found_sections
+        ]
         
-        print(f"🔍 Performing completeness check...")
+        logger.debug("Completeness check completed: %d missing sections found", len(issues))
+        return issues
+    
+    def _sections_in(self, text: str) -> List[str]:
+        """Names of the required sections the text mentions."""
+        return [
+            section_name for section_name, pattern in self.section_patterns.items()
+            if pattern.search(text)
+        ]
+    
+    def _missing_section_issue(self, section_name: str) -> ValidationIssue:
+        return ValidationIssue(
+            type=IssueType.INCOMPLETENESS,
+            severity=Severity.HIGH,
+            word_or_phrase=f"Missing {section_name} section",
+            context="Document structure",
+            suggestion=f"Add a section describing {section_name} and their requirements",
+            line_number=None
+        )
+    
+    def _consistency_check(self, analysed: AnalysedDocument) -> List[ValidationIssue]:
+        """
+        Flag requirement lines that repeat an earlier line almost word for word (deep mode only).
         
-        # Check each required section
-        for section_name, patterns in self.required_sections.items():
-            section_found = False
-            
-            for pattern in patterns:
-                if re.search(pattern, document, re.IGNORECASE):
-                    section_found = True
+        Compares every pair of lines with at least four words by the Jaccard
+        similarity of their word sets, so the cost grows with the square of the
+        line count. Near-duplicates are where two versions of a requirement drift
+        apart (e.g. "within 5 seconds" and "within 3 seconds").
+        """
+        issues = []
+        seen: List[Tuple[int, FrozenSet[str]]] = []
+        for line_num, line_lower in enumerate(analysed.lower.split('\n'), 1):
+            words = frozenset(WORD_PATTERN.findall(line_lower))
+            if len(words) < 4:
+                continue
+            for earlier_num, earlier_words in seen:
+                # Jaccard similarity is at most the size ratio of the two sets
+                if min(len(words), len(earlier_words)) < DUPLICATE_SIMILARITY * max(len(words), len(earlier_words)):
+                    continue
+                if len(words & earlier_words) >= DUPLICATE_SIMILARITY * len(words | earlier_words):
+                    line = analysed.lines[line_num - 1].strip()
+                    issues.append(ValidationIssue(
+                        type=IssueType.AMBIGUITY,
+                        severity=Severity.MEDIUM,
+                        word_or_phrase=line if len(line) <= 60 else line[:57] + "...",
+                        context=line,
+                        suggestion=f"This repeats line {earlier_num}; merge the two or state which one applies",
+                        line_number=line_num
+                    ))
                     break
-            
-            if not section_found:
-                issues.append(ValidationIssue(
-                    type=IssueType.INCOMPLETENESS,
-                    severity=Severity.HIGH,
-                    word_or_phrase=f"Missing {section_name} section",
-                    context="Document structure",
-                    suggestion=f"Add a section describing {section_name} and their requirements",
-                    line_number=None
-                ))
+            seen.append((line_num, words))
         
-        print(f"📊 Completeness check completed: {len(issues)} missing sections found")
+        logger.debug("Consistency check completed: %d near-duplicate lines found", len(issues))
         return issues
     
-
-    
     def _calculate_quality_score(self, document: str, issues: List[ValidationIssue]) -> float:
         """Calculate overall quality score (0-100)."""
         if not document.strip():
             return 0.0
         
+        # Deduct points based on issue severity and frequency
+        total_deduction = sum(self._issue_deduction(issue) for issue in issues)
+        return self._score_from_deduction(total_deduction)
+    
+    def _issue_deduction(self, issue: ValidationIssue) -> int:
+        """Points an issue takes off the quality score."""
+        return SEVERITY_WEIGHTS.get(issue.severity, 1)
+    
+    def _score_from_deduction(self, total_deduction: int) -> float:
+        """Quality score (0-100) for a non-empty document with the given total deduction."""
         # Base score starts at 100
         score = 100.0
         
-        # Deduct points based on issue severity and frequency
-        severity_weights = {
-            Severity.LOW: 1,
-            Severity.MEDIUM: 3,
-            Severity.HIGH: 5,
-            Severity.CRITICAL: 10
-        }
-        
-        total_deduction = 0
-        for issue in issues:
-            deduction = severity_weights.get(issue.severity, 1)
-            total_deduction += deduction
-        
         # Calculate score (minimum 0)
         score = max(0.0, score - total_deduction)
         
@@ -446,18 +973,22 @@ class ValidationService:
     
     def _generate_summary(self, issues: List[ValidationIssue], score: float) -> str:
         """Generate a summary of validation results."""
-        if not issues:
-            return f"Excellent! Your document has a quality score of {score}/100 with no issues found."
-        
         issue_types = {}
         for issue in issues:
             issue_types[issue.type.value] = issue_types.get(issue.type.value, 0) + 1
         
+        return self._summarize(issue_types, len(issues), score)
+    
+    def _summarize(self, issue_types: Dict[str, int], issue_count: int, score: float) -> str:
+        """Summary text from per-type issue counts."""
+        if not issue_count:
+            return f"Excellent! Your document has a quality score of {score}/100 with no issues found."
+        
         summary_parts = [f"Quality score: {score}/100"]
         
         if issue_types:
-            type_summary = ", ".join([f"{count} {issue_type}" for issue_type, count in issue_types.items()])
-            summary_parts.append(f"Issues found: {len(issues)} ({type_summary})")
+            type_summary = ", ".join([f"{count} {issue_type}" for issue_type, count in issue_types.items() if count])
+            summary_parts.append(f"Issues found: {issue_count} ({type_summary})")
         
         if score < 50:
             summary_parts.append("Significant improvements needed.")
@@ -470,19 +1001,24 @@ class ValidationService:
     
     def _generate_suggestions(self, issues: List[ValidationIssue]) -> List[str]:
         """Generate general improvement suggestions."""
+        return self._suggest(
+            issue_types={issue.type for issue in issues},
+            issue_count=len(issues),
+            has_critical=any(issue.severity == Severity.CRITICAL for issue in issues),
+            mentions_entities=any(self._mentions_entity_label(issue) for issue in issues)
+        )
+    
+    def _mentions_entity_label(self, issue: ValidationIssue) -> bool:
+        return any(entity in issue.context for entity in ['PERSON', 'ORG', 'PRODUCT'])
+    
+    def _suggest(self, issue_types: set, issue_count: int, has_critical: bool, mentions_entities: bool) -> List[str]:
+        """Suggestions from which issue types are present and a few document-wide facts."""
         suggestions = []
         
-        if not issues:
+        if not issue_count:
             suggestions.append("Great job! Your document is well-written and clear.")
             return suggestions
         
-        # Group issues by type for targeted suggestions
-        issue_types = {}
-        for issue in issues:
-            if issue.type not in issue_types:
-                issue_types[issue.type] = []
-            issue_types[issue.type].append(issue)
-        
         # Generate type-specific suggestions
         if IssueType.AMBIGUITY in issue_types:
             suggestions.append("Replace ambiguous terms with specific, measurable criteria.")
@@ -500,15 +1036,14 @@ class ValidationService:
             suggestions.append("Clarify dependencies, assumptions, and business constraints.")
         
         # NER-enhanced suggestions
-        ner_issues = [issue for issue in issues if hasattr(issue, 'context') and any(entity in issue.context for entity in ['PERSON', 'ORG', 'PRODUCT'])]
-        if ner_issues:
+        if mentions_entities:
             suggestions.append("Specify version numbers, qualifications, and specific details for mentioned entities (people, organizations, products).")
         
         # General suggestions
-        if len(issues) > 10:
+        if issue_count > 10:
             suggestions.append("Consider breaking down complex requirements into smaller, more specific items.")
         
-        if any(issue.severity == Severity.CRITICAL for issue in issues):
+        if has_critical:
             suggestions.append("Address critical issues first as they may impact project success.")
         
         return suggestions
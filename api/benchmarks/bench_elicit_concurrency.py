@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sync and async Gemini elicitation paths against a local fake
+Gemini endpoint (no network, no quota).
+
+Each simulated Gemini call sleeps for a fixed latency. With the blocking client
+a single event loop can only run one call at a time, so throughput stays at
+about 1/latency. With the async client throughput grows with the number of
+concurrent calls the shared connection pool can keep in flight.
+
+Usage:
+    python benchmarks/bench_elicit_concurrency.py --latency 0.5 --requests 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")  # the module-level service needs a key
+# Lift the client-side quota so the benchmark measures connection concurrency, not the limiter
+os.environ.setdefault("GEMINI_REQUESTS_PER_MINUTE", "1000000")
+os.environ.setdefault("GEMINI_BURST", "1000")
+os.environ.setdefault("GEMINI_MAX_CONCURRENCY", "1000")
+
+from app.services.gemini_service import GeminiService  # noqa: E402
+from fake_gemini import FakeGeminiProfile, build_fake_gemini, start_server  # noqa: E402
+
+
+def generate_blocking(service: GeminiService, project_idea: str) -> dict:
+    """
+    The old blocking elicitation call, kept here only as the benchmark baseline.
+
+    It bypasses the rate limiter and circuit breaker, so it must not be used by
+    the application.
+    """
+    response = service.client.models.generate_content(
+        model=service.model,
+        contents=service._build_elicitation_prompt(project_idea),
+        config=service._generation_config()
+    )
+    return service._parse_elicitation_response(response.text)
+
+
+async def run_sync_path(service: GeminiService, total: int, concurrency: int) -> float:
+    """Blocking client called from coroutines, as the controller used to do."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            generate_blocking(service, "Aplikasi pemesanan untuk restoran lokal")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - started
+
+
+async def run_async_path(service: GeminiService, total: int, concurrency: int) -> float:
+    """Async client awaited on the event loop."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await service.generate_elicitation_content_async("Aplikasi pemesanan untuk restoran lokal")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - started
+
+
+async def run_benchmark(service: GeminiService, requests: int, levels: list) -> list:
+    """Run both paths at every concurrency level on one event loop, as uvicorn would."""
+    results = []
+    for concurrency in levels:
+        sync_total = min(requests, 8)  # the blocking path is serial; keep it short
+        sync_elapsed = await run_sync_path(service, sync_total, concurrency)
+        async_elapsed = await run_async_path(service, requests, concurrency)
+        results.append((concurrency, sync_total / sync_elapsed, requests / async_elapsed))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="simulated Gemini latency in seconds")
+    parser.add_argument("--requests", type=int, default=64, help="requests per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    args = parser.parse_args()
+
+    base_url = start_server(build_fake_gemini(FakeGeminiProfile(latency=args.latency, latency_distribution="fixed")))
+    service = GeminiService(api_key="benchmark-key", base_url=base_url)
+
+    # Logging is left unconfigured (warnings only) so it does not skew timings
+    results = asyncio.run(run_benchmark(service, args.requests, args.concurrency))
+
+    print(f"Fake Gemini latency: {args.latency:.3f}s, one event loop, one worker")
+    print(f"{'concurrency':>12} {'sync req/s':>12} {'async req/s':>12} {'speed-up':>10}")
+    for concurrency, sync_rps, async_rps in results:
+        print(f"{concurrency:>12} {sync_rps:>12.2f} {async_rps:>12.2f} {async_rps / sync_rps:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
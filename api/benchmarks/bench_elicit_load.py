@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Load-test /api/elicit (or /api/elicit/stream) against the offline fake Gemini.
+
+Starts benchmarks/fake_gemini.py with the given latency and failure profile,
+points GeminiService at it through GEMINI_BASE_URL, serves the real API with
+uvicorn with the elicitation cache off and fires unique ideas at it (so
+neither caching nor request coalescing hides the upstream). Reports throughput, latency percentiles,
+HTTP status counts, how the fake answered and how many completions fell back
+because they did not parse. With --stream, time to the first streamed item is
+reported as well.
+
+The client-side quota is lifted by default so the upstream profile decides
+throughput; pass --rpm to measure with a realistic limiter instead.
+
+Usage:
+    python benchmarks/bench_elicit_load.py --requests 200 --concurrency 32 --latency 0.3
+    python benchmarks/bench_elicit_load.py --quota-rate 0.1 --partial-rate 0.05 --stream
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fake_gemini import build_fake_gemini, profile_arguments, profile_from_arguments, start_server  # noqa: E402
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples) + 0.5) - 1))
+    return samples[index]
+
+
+async def one_request(client: httpx.AsyncClient, index: int, stream: bool) -> tuple:
+    """Returns (status, seconds to the whole response, seconds to the first item or None)."""
+    body = {"idea": f"Aplikasi pemesanan online untuk restoran lokal nomor {index}"}
+    started = time.perf_counter()
+    if not stream:
+        response = await client.post("/api/elicit", json=body)
+        return response.status_code, time.perf_counter() - started, None
+
+    first_item = None
+    status = 200
+    async with client.stream("POST", "/api/elicit/stream?format=ndjson", json=body) as response:
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if event["event"] in ("question", "persona") and first_item is None:
+                first_item = time.perf_counter() - started
+            elif event["event"] == "error":
+                status = event.get("status", 500)
+    return status, time.perf_counter() - started, first_item
+
+
+async def run_load(base_url: str, requests: int, concurrency: int, stream: bool) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        async def limited(index: int):
+            async with semaphore:
+                return await one_request(client, index, stream)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(limited(index) for index in range(requests)))
+        return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--stream", action="store_true", help="use /api/elicit/stream and time the first item")
+    parser.add_argument("--rpm", type=float, default=1_000_000, help="client-side Gemini requests per minute")
+    profile_arguments(parser)
+    args = parser.parse_args()
+
+    fake = build_fake_gemini(profile_from_arguments(args))
+    fake_url = start_server(fake)
+
+    # Settings are read when the app is imported, so configure it first
+    os.environ.update({
+        "GEMINI_BASE_URL": fake_url,
+        "GEMINI_API_KEY": "load-test-key",
+        "GEMINI_REQUESTS_PER_MINUTE": str(args.rpm),
+        "GEMINI_BURST": str(max(1, min(int(args.rpm), 1000))),
+        "GEMINI_MAX_CONCURRENCY": str(max(args.concurrency, 8)),
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "ERROR"),
+        "VALIDATION_EXECUTOR": "thread",
+        "ELICITATION_CACHE_ENABLED": "false"
+    })
+    from main import app
+    from app.services.gemini_service import gemini_service
+
+    api_url = start_server(app)
+    results, elapsed = asyncio.run(run_load(api_url, args.requests, args.concurrency, args.stream))
+
+    latencies = sorted(seconds for _, seconds, _ in results)
+    first_items = sorted(first for _, _, first in results if first is not None)
+    statuses = Counter(status for status, _, _ in results)
+    stats = gemini_service.stats()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, fake latency {args.latency}s "
+          f"({args.latency_distribution}), {'streaming' if args.stream else 'unary'}")
+    print(f"throughput      {args.requests / elapsed:.1f} req/s")
+    print(f"latency ms      p50 {percentile(latencies, 0.5) * 1000:.0f}  p95 {percentile(latencies, 0.95) * 1000:.0f}  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.0f}  max {latencies[-1] * 1000:.0f}")
+    if first_items:
+        print(f"first item ms   p50 {percentile(first_items, 0.5) * 1000:.0f}  "
+              f"p99 {percentile(first_items, 0.99) * 1000:.0f}")
+    print(f"HTTP statuses   {dict(sorted(statuses.items()))}")
+    print(f"fake served     {dict(fake.state.served)}")
+    print(f"parsed          {stats['responses_parsed']} ok, {stats['parse_failures']} fell back "
+          f"({stats['parse_failure_rate']:.1%})")
+    print(f"limiter         {stats['quota']['retries']} retries, {stats['quota']['upstream_quota_errors']} upstream 429s, "
+          f"circuit {stats['circuit']['state']}")
+
+
+if __name__ == "__main__":
+    main()
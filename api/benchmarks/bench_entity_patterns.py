@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Compare the requirement_patterns PhraseMatcher component with the sentence loops it replaced.
+
+NER-enhanced validation used to lowercase and split every sentence of the
+parsed document in Python, and test modal "... be" and vague-modifier
+substrings one at a time. The requirement_patterns component now matches
+these phrases on token LOWER attributes in the same pipeline pass as NER. This
+script times both on sentence-heavy documents (many short sentences), which
+is where the per-sentence Python work dominated:
+
+    loops     parse without the component, then the old sentence loops
+    matcher   parse with the component, then the checks reading its matches
+
+Both the checks alone (on an already parsed document) and parse plus checks
+are reported. Requires the spaCy model, e.g. en_core_web_sm.
+
+Usage:
+    python benchmarks/bench_entity_patterns.py
+    python benchmarks/bench_entity_patterns.py --sizes 2000 10000 --profile full
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_validation import time_target  # noqa: E402
+from app.models.validation import IssueType, Severity, ValidationIssue  # noqa: E402
+from app.services.analysed_document import AnalysedDocument  # noqa: E402
+from app.services.requirement_patterns import MODALS, VAGUE_MODIFIERS  # noqa: E402
+from app.services.validation_service import load_pipeline, validation_service  # noqa: E402
+
+# Short requirement sentences, so documents have many sentences per character
+SENTENCES = [
+    "The system should be fast.",
+    "John Smith must be the appropriate owner.",
+    "Microsoft Azure hosts the platform.",
+    "Reports load in 2 seconds.",
+    "The system will be secure.",
+    "Google Cloud is a good tool.",
+    "Users can export PDF files.",
+    "The database may be slow.",
+]
+
+
+def build_document(target_chars: int) -> str:
+    """Repeat the short sentences until the document reaches the target size."""
+    parts, size, index = [], 0, 0
+    while size < target_chars:
+        sentence = SENTENCES[index % len(SENTENCES)]
+        parts.append(sentence)
+        size += len(sentence) + 1
+        index += 1
+    # A few sentences per line, as in pasted requirement lists
+    return "\n".join(" ".join(parts[i:i + 3]) for i in range(0, len(parts), 3))
+
+
+def sentence_loop_checks(document: str, doc) -> int:
+    """The checks as they were before the component: Python loops over sentence text."""
+    analysed = AnalysedDocument(document, doc)
+    issues = []
+    for sent in doc.sents:
+        context = sent.text.strip()
+        lower = context.lower()
+        if "the system" in lower and len(lower.split()) < 10:
+            for word in MODALS:
+                if f"{word} be" in lower:
+                    start = analysed.lower.find("the system", sent.start_char, sent.end_char)
+                    issues.append(ValidationIssue(
+                        type=IssueType.VAGUENESS, severity=Severity.HIGH, word_or_phrase="the system",
+                        context=context, suggestion="Specify which system component and what behavior is expected",
+                        line_number=analysed.line_at(start), start_char=start, end_char=start + len("the system")
+                    ))
+                    break
+    for ent in doc.ents:
+        context = ent.sent.text.strip()
+        lower = context.lower()
+        issue = None
+        if ent.label_ in ["PERSON", "ORG", "PRODUCT"]:
+            for modifier in VAGUE_MODIFIERS:
+                if modifier in lower:
+                    issue = (IssueType.VAGUENESS, f"{modifier} {ent.text}")
+                    break
+        if issue is None and ent.label_ in ["PRODUCT", "ORG"]:
+            if any(word in lower for word in ["system", "platform", "tool"]):
+                if not any(word in lower for word in ["version", "specific", "particular"]):
+                    issue = (IssueType.INCOMPLETENESS, ent.text)
+        if issue:
+            issues.append(ValidationIssue(
+                type=issue[0], severity=Severity.MEDIUM, word_or_phrase=issue[1], context=context,
+                suggestion="", line_number=analysed.line_at(ent.start_char),
+                start_char=ent.start_char, end_char=ent.end_char
+            ))
+    return len(issues)
+
+
+def matcher_checks(document: str, doc) -> int:
+    """The checks as NER-enhanced validation runs them now, reading the component's matches."""
+    return len(validation_service._ner_issues(AnalysedDocument(document, doc)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--profile", default="ner", choices=["ner", "full"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 20000],
+                        help="document sizes in characters")
+    parser.add_argument("--iterations", type=int, default=30, help="minimum timed runs per case")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="minimum timing per case")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    nlp = load_pipeline(args.model, args.profile)
+    without_component = [name for name in nlp.pipe_names if name != "requirement_patterns"]
+
+    def parse_without(document):
+        with nlp.select_pipes(enable=without_component):
+            return nlp(document)
+
+    print(f"model {args.model}, {args.profile} profile: {', '.join(nlp.pipe_names)}")
+    print(f"{'chars':>7} {'sents':>6} {'stage':>14} {'loops ms':>10} {'matcher ms':>11} {'speed-up':>9}")
+    for size in args.sizes:
+        document = build_document(size)
+        plain, matched = parse_without(document), nlp(document)
+        sentences = sum(1 for _ in matched.sents)
+        if sentence_loop_checks(document, plain) != matcher_checks(document, matched):
+            print(f"warning: the two versions disagree on the {len(document)}-character document")
+
+        cases = {
+            "checks": (lambda: sentence_loop_checks(document, plain), lambda: matcher_checks(document, matched)),
+            "parse+checks": (lambda: sentence_loop_checks(document, parse_without(document)),
+                             lambda: matcher_checks(document, nlp(document)))
+        }
+        for stage, (loops, matcher) in cases.items():
+            before = time_target(loops, args.iterations, args.min_seconds)["p50_ms"]
+            after = time_target(matcher, args.iterations, args.min_seconds)["p50_ms"]
+            print(f"{len(document):>7} {sentences:>6} {stage:>14} {before:>10.3f} {after:>11.3f} "
+                  f"{before / after:>8.2f}x", flush=True)
+
+
+if __name__ == "__main__":
+    main()
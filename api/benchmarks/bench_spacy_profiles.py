@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Compare spaCy pipeline profiles used by NER-enhanced validation.
+
+Every profile is measured in its own subprocess so resident memory is not
+shared between runs. Reports load time, documents per second and peak RSS
+(requires the spaCy model, e.g. en_core_web_sm, to be installed).
+
+Usage:
+    python benchmarks/bench_spacy_profiles.py --docs 200
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+SENTENCES = [
+    "The system should be fast and user-friendly.",
+    "John Smith should be the appropriate administrator for the platform.",
+    "Microsoft Azure will be the cloud platform for the reporting tool.",
+    "Users must be able to export monthly reports as PDF within 5 seconds.",
+    "The database should be good for our needs and handle 10,000 records.",
+    "Sistem harus cepat dan mudah digunakan oleh pengguna di Jakarta.",
+]
+
+
+def build_document(target_chars: int) -> str:
+    """Repeat the sample sentences until the document reaches the target size."""
+    lines, size, index = [], 0, 0
+    while size < target_chars:
+        sentence = SENTENCES[index % len(SENTENCES)]
+        lines.append(sentence)
+        size += len(sentence) + 1
+        index += 1
+    return "\n".join(lines)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(model: str, profile: str, docs: int, chars: int) -> dict:
+    """Load one profile and time it over the synthetic documents."""
+    from app.services.validation_service import load_pipeline
+
+    baseline_rss = peak_rss_mb()
+    started = time.perf_counter()
+    nlp = load_pipeline(model, profile)
+    load_seconds = time.perf_counter() - started
+
+    document = build_document(chars)
+    nlp(document)  # warm-up
+
+    started = time.perf_counter()
+    entity_count = 0
+    for _ in range(docs):
+        doc = nlp(document)
+        entity_count += sum(1 for ent in doc.ents if ent.sent is not None)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "profile": profile,
+        "components": nlp.pipe_names,
+        "load_seconds": round(load_seconds, 2),
+        "docs_per_second": round(docs / elapsed, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "model_rss_mb": round(peak_rss_mb() - baseline_rss, 1),
+        "entities_per_doc": entity_count // docs
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--profiles", nargs="+", default=["full", "ner"])
+    parser.add_argument("--docs", type=int, default=200, help="documents to process per profile")
+    parser.add_argument("--chars", type=int, default=2000, help="characters per document")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.model, args.child, args.docs, args.chars)))
+        return
+
+    results = []
+    for profile in args.profiles:
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", profile, "--model", args.model,
+             "--docs", str(args.docs), "--chars", str(args.chars)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{args.docs} documents of ~{args.chars} characters, model {args.model}")
+    print(f"{'profile':>8} {'docs/s':>9} {'load s':>7} {'peak RSS MB':>12} {'model MB':>9} {'ents/doc':>9}  components")
+    for result in results:
+        print(f"{result['profile']:>8} {result['docs_per_second']:>9} {result['load_seconds']:>7} "
+              f"{result['peak_rss_mb']:>12} {result['model_rss_mb']:>9} {result['entities_per_doc']:>9}  "
+              f"{', '.join(result['components'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Benchmark ValidationService.validate_document and each analysis stage.
+
+Documents are generated synthetically in three languages (English, Indonesian,
+mixed), two issue densities (clean text with no rule hits, and issue-dense text
+full of ambiguous words and vague phrases) and two layouts (many short lines,
+or the whole document on one long line), at sizes from 100 characters up to
+the 10,000-character API limit and beyond.
+
+For each corpus the full validation and every stage are timed separately.
+The benchmark reports throughput (documents and characters per second),
+p50/p99 latency and peak traced memory. Results can be saved as a baseline
+and later runs compared against it, so regressions in the rule engine or the
+spaCy pipeline are flagged. The process exits with status 1 when any p50
+regresses by more than the threshold.
+
+If the spaCy model is not installed, the NER stage is skipped and reported as
+such; the rule-based stages are still measured.
+
+Usage:
+    python benchmarks/bench_validation.py
+    python benchmarks/bench_validation.py --save benchmarks/baselines/validation.json
+    python benchmarks/bench_validation.py --compare benchmarks/baselines/validation.json
+    python benchmarks/bench_validation.py --sizes 1000 10000 --languages en --quick
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from itertools import product
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import settings
+from app.services.validation_service import validation_service
+
+# Sentences per language and density. Clean sentences trigger no rules; dense
+# ones hit ambiguous words, vague phrases, technical debt and business risk.
+SENTENCES = {
+    ("en", "clean"): [
+        "Users must be able to export monthly sales reports as PDF within 5 seconds.",
+        "The administrator can create, suspend and delete accounts from the dashboard.",
+        "Each order stores the customer name, delivery address and payment status.",
+        "Microsoft Azure hosts the reporting service in the Singapore region.",
+        "Jane Doe approves every purchase above 500 dollars before it is paid.",
+    ],
+    ("en", "dense"): [
+        "The system should be fast, user-friendly and flexible, etc.",
+        "Reports could maybe load quickly, with appropriate formats TBD.",
+        "We assume a temporary workaround for the legacy manual process if possible.",
+        "The interface might be simple and intuitive, and so on, depending on budget.",
+        "Search should be efficient and scalable for about 1000 users, subject to approval.",
+    ],
+    ("id", "clean"): [
+        "Pengguna dapat mengunduh laporan penjualan bulanan dalam format PDF dalam 5 detik.",
+        "Administrator dapat membuat, menangguhkan dan menghapus akun dari dasbor.",
+        "Setiap pesanan menyimpan nama pelanggan, alamat pengiriman dan status pembayaran.",
+        "Layanan laporan berjalan di pusat data Jakarta milik perusahaan.",
+        "Budi Santoso menyetujui setiap pembelian di atas 5 juta rupiah.",
+    ],
+    ("id", "dense"): [
+        "Sistem harus cepat, mudah digunakan dan fleksibel, dll.",
+        "Laporan mungkin dimuat dengan cepat dan sesuai kebutuhan, dan sebagainya.",
+        "Kami berasumsi ada perbaikan cepat sementara untuk proses manual yang lama.",
+        "Tampilan seharusnya sederhana dan intuitif jika memungkinkan.",
+        "Pencarian harus efisien untuk sekitar 1000 pengguna, bergantung pada anggaran.",
+    ],
+}
+SENTENCES[("mixed", "clean")] = [s for pair in zip(SENTENCES[("en", "clean")], SENTENCES[("id", "clean")]) for s in pair]
+SENTENCES[("mixed", "dense")] = [s for pair in zip(SENTENCES[("en", "dense")], SENTENCES[("id", "dense")]) for s in pair]
+
+DEFAULT_SIZES = [100, 1000, 5000, 10000, 20000]
+
+
+def build_document(language: str, density: str, layout: str, target_chars: int) -> str:
+    """Repeat the corpus sentences until the document reaches at least the target size."""
+    sentences = SENTENCES[(language, density)]
+    separator = "\n" if layout == "lines" else " "
+    parts, size, index = [], 0, 0
+    while size < target_chars:
+        sentence = sentences[index % len(sentences)]
+        parts.append(sentence)
+        size += len(sentence) + 1
+        index += 1
+    return separator.join(parts)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples) + 0.5) - 1))
+    return samples[index]
+
+
+def time_target(target: Callable[[], object], iterations: int, min_seconds: float) -> Dict[str, float]:
+    """Time a callable for at least ``iterations`` runs and ``min_seconds``, then once under tracemalloc."""
+    target()  # warm-up
+
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < iterations or time.perf_counter() - started < min_seconds:
+        run_started = time.perf_counter()
+        target()
+        samples.append(time.perf_counter() - run_started)
+    samples.sort()
+
+    # Memory is measured in a separate run: tracing slows allocation-heavy code
+    tracemalloc.start()
+    target()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(samples)
+    return {
+        "runs": len(samples),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 4),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "docs_per_second": round(len(samples) / total, 1),
+        "peak_kb": round(peak / 1024, 1)
+    }
+
+
+def run_suite(args) -> Dict[str, Dict[str, float]]:
+    """Benchmark every corpus; keys are ``language/density/layout/size/target``."""
+    results = {}
+    targets = ["validate"] + [stage.name for stage in validation_service.stages]
+    for language, density, layout, size in product(args.languages, args.densities, args.layouts, args.sizes):
+        document = build_document(language, density, layout, size)
+        for target in targets:
+            if target == "validate":
+                call = lambda: validation_service.validate_document(document)
+            else:
+                stage = next(stage for stage in validation_service.stages if stage.name == target)
+                if stage.requires_model and not validation_service.is_ready:
+                    continue
+                call = lambda stage=stage: validation_service.run_stage(stage.name, document)
+
+            measurement = time_target(call, args.iterations, args.min_seconds)
+            measurement["chars"] = len(document)
+            measurement["chars_per_second"] = round(measurement["docs_per_second"] * len(document))
+            key = f"{language}/{density}/{layout}/{size}/{target}"
+            results[key] = measurement
+            print(f"{key:<38} {measurement['runs']:>6} {measurement['p50_ms']:>10.3f} {measurement['p99_ms']:>10.3f} "
+                  f"{measurement['docs_per_second']:>10.1f} {measurement['chars_per_second']:>12} "
+                  f"{measurement['peak_kb']:>10.1f}", flush=True)
+    return results
+
+
+def environment() -> Dict[str, str]:
+    """What the numbers depend on; baselines from a different setup are not comparable."""
+    import spacy
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "spacy": spacy.__version__,
+        "spacy_model": settings.spacy_model if validation_service.is_ready else "not loaded",
+        "pipeline_profile": settings.spacy_pipeline_profile,
+        "ruleset_version": validation_service.ruleset_version
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict, threshold: float) -> List[str]:
+    """Cases whose p50 latency grew by more than ``threshold`` (a fraction) over the baseline."""
+    for key, value in baseline["environment"].items():
+        if environment().get(key) != value:
+            print(f"note: baseline {key} was {value!r}, now {environment().get(key)!r}")
+
+    regressions = []
+    for key, measurement in results.items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        change = measurement["p50_ms"] / previous["p50_ms"] - 1 if previous["p50_ms"] else 0.0
+        if change > threshold:
+            regressions.append(f"{key}: p50 {previous['p50_ms']:.3f} ms -> {measurement['p50_ms']:.3f} ms "
+                               f"(+{change:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="document sizes in characters")
+    parser.add_argument("--languages", nargs="+", default=["en", "id", "mixed"], choices=["en", "id", "mixed"])
+    parser.add_argument("--densities", nargs="+", default=["clean", "dense"], choices=["clean", "dense"])
+    parser.add_argument("--layouts", nargs="+", default=["lines", "single"], choices=["lines", "single"],
+                        help="many short lines, or one long line")
+    parser.add_argument("--iterations", type=int, default=50, help="minimum timed runs per case")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="minimum timing per case")
+    parser.add_argument("--quick", action="store_true", help="10 runs and 0.05s per case, for smoke runs")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p50 slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args()
+    if args.quick:
+        args.iterations, args.min_seconds = 10, 0.05
+
+    # Keep the service's own logging quiet so it does not skew timings
+    logging.basicConfig(level=logging.WARNING)
+    validation_service.load_model()
+    if not validation_service.is_ready:
+        print(f"spaCy model {settings.spacy_model} unavailable ({validation_service.model_error}); "
+              f"NER stage not measured")
+
+    print(f"{'case (language/density/layout/size/target)':<38} {'runs':>6} {'p50 ms':>10} {'p99 ms':>10} "
+          f"{'docs/s':>10} {'chars/s':>12} {'peak KB':>10}")
+    results = run_suite(args)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No p50 regressions over {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the Gemini REST API, for load tests with no network or quota.
+
+Implements the endpoints google-genai calls for elicitation:
+
+    POST /{version}/models/{model}:generateContent
+    POST /{version}/models/{model}:streamGenerateContent   (server-sent events)
+    GET  /{version}/models/{model}                         (health probe)
+
+Every generation draws a latency from the configured distribution, then
+answers with an injected 429 or 500, or with a canned completion that is valid,
+malformed (not JSON) or partial (JSON cut off, as when max_output_tokens is hit).
+Streamed completions are sent in small chunks with a delay between them.
+GET /_stats returns how many responses of each kind were served.
+
+Run it on its own and point the API at it:
+
+    python benchmarks/fake_gemini.py --port 8089 --latency 0.4 --quota-rate 0.05
+    GEMINI_BASE_URL=http://127.0.0.1:8089 GEMINI_API_KEY=fake uvicorn main:app
+
+or import build_fake_gemini / start_server from a benchmark script.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from typing import NamedTuple
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+CANNED_ELICITATION = {
+    "questions": [
+        {"question": "Siapa pengguna utama aplikasi ini?", "category": "user", "priority": "high"},
+        {"question": "Metode pembayaran apa saja yang harus didukung?", "category": "functional", "priority": "high"},
+        {"question": "Berapa banyak pesanan per jam pada jam sibuk?", "category": "technical", "priority": "medium"}
+    ],
+    "personas": [
+        {
+            "name": "Pelanggan",
+            "role": "End User",
+            "description": "Memesan makanan dari ponsel",
+            "goals": ["Memesan dengan cepat"],
+            "pain_points": ["Antrian panjang"]
+        },
+        {
+            "name": "Pemilik Restoran",
+            "role": "Admin",
+            "description": "Mengelola menu dan pesanan",
+            "goals": ["Melihat pesanan secara langsung"],
+            "pain_points": ["Pesanan telepon sering salah"]
+        }
+    ],
+    "summary": "Aplikasi pemesanan restoran",
+    "next_steps": ["Tentukan fitur inti"]
+}
+
+
+class FakeGeminiProfile(NamedTuple):
+    """Behaviour of the fake server. Rates are probabilities per generation request."""
+    latency: float = 0.3  # median seconds before the first byte
+    latency_distribution: str = "lognormal"  # "fixed", "uniform" (0..2x median) or "lognormal"
+    latency_sigma: float = 0.5  # lognormal shape; 0.5 puts p99 at about 3x the median
+    error_rate: float = 0.0  # 500 INTERNAL
+    quota_rate: float = 0.0  # 429 RESOURCE_EXHAUSTED
+    malformed_rate: float = 0.0  # 200 with text that is not JSON
+    partial_rate: float = 0.0  # 200 with JSON truncated half way, finishReason MAX_TOKENS
+    chunk_chars: int = 48  # characters per streamed chunk
+    chunk_delay: float = 0.01  # seconds between streamed chunks
+    seed: int = 0
+
+
+def _draw_latency(profile: FakeGeminiProfile, rng: random.Random) -> float:
+    if profile.latency_distribution == "fixed":
+        return profile.latency
+    if profile.latency_distribution == "uniform":
+        return rng.uniform(0, 2 * profile.latency)
+    return rng.lognormvariate(0, profile.latency_sigma) * profile.latency
+
+
+def _error_body(code: int, status: str, message: str) -> dict:
+    return {"error": {"code": code, "message": message, "status": status}}
+
+
+def _candidate(text: str, finish_reason: str = None) -> dict:
+    candidate = {"content": {"role": "model", "parts": [{"text": text}]}}
+    if finish_reason:
+        candidate["finishReason"] = finish_reason
+    return {"candidates": [candidate], "modelVersion": "fake-gemini"}
+
+
+def build_fake_gemini(profile: FakeGeminiProfile = FakeGeminiProfile()) -> Starlette:
+    """Build the fake API as a Starlette app (``app.state.served`` counts outcomes)."""
+    rng = random.Random(profile.seed)
+    served = Counter()
+    valid_text = json.dumps(CANNED_ELICITATION, ensure_ascii=False)
+
+    def pick_outcome() -> str:
+        roll = rng.random()
+        for outcome, rate in (("error", profile.error_rate), ("quota", profile.quota_rate),
+                              ("malformed", profile.malformed_rate), ("partial", profile.partial_rate)):
+            if roll < rate:
+                return outcome
+            roll -= rate
+        return "valid"
+
+    def completion(outcome: str) -> tuple:
+        if outcome == "malformed":
+            return "Maaf, berikut pertanyaan klarifikasi: 1) Siapa penggunanya?", "STOP"
+        if outcome == "partial":
+            return valid_text[:len(valid_text) // 2], "MAX_TOKENS"
+        return valid_text, "STOP"
+
+    async def models(request: Request):
+        model, _, action = request.path_params["model_action"].partition(":")
+        if request.method == "GET":
+            served["probe"] += 1
+            return JSONResponse({"name": f"models/{model}", "inputTokenLimit": 1048576, "outputTokenLimit": 8192})
+        if action not in ("generateContent", "streamGenerateContent"):
+            return JSONResponse(_error_body(404, "NOT_FOUND", f"Unknown action {action}"), status_code=404)
+
+        await asyncio.sleep(_draw_latency(profile, rng))
+        outcome = pick_outcome()
+        served[outcome] += 1
+        if outcome == "error":
+            return JSONResponse(_error_body(500, "INTERNAL", "Injected server error"), status_code=500)
+        if outcome == "quota":
+            return JSONResponse(_error_body(429, "RESOURCE_EXHAUSTED", "Injected quota exhaustion"), status_code=429)
+
+        text, finish_reason = completion(outcome)
+        if action == "generateContent":
+            return JSONResponse(_candidate(text, finish_reason))
+
+        async def chunks():
+            pieces = [text[i:i + profile.chunk_chars] for i in range(0, len(text), profile.chunk_chars)]
+            for index, piece in enumerate(pieces):
+                last = index == len(pieces) - 1
+                yield "data: " + json.dumps(_candidate(piece, finish_reason if last else None)) + "\r\n\r\n"
+                if not last:
+                    await asyncio.sleep(profile.chunk_delay)
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    async def stats(request: Request) -> JSONResponse:
+        return JSONResponse(dict(served))
+
+    app = Starlette(routes=[
+        Route("/_stats", stats, methods=["GET"]),
+        Route("/{version}/models/{model_action}", models, methods=["GET", "POST"])
+    ])
+    app.state.served = served
+    return app
+
+
+def start_server(app: Starlette) -> str:
+    """Run the fake endpoint on a free local port in a background thread."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the FakeGeminiProfile options to a command line parser."""
+    defaults = FakeGeminiProfile()
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="median latency in seconds")
+    parser.add_argument("--latency-distribution", choices=["fixed", "uniform", "lognormal"],
+                        default=defaults.latency_distribution)
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="share of 500 responses")
+    parser.add_argument("--quota-rate", type=float, default=defaults.quota_rate, help="share of 429 responses")
+    parser.add_argument("--malformed-rate", type=float, default=defaults.malformed_rate)
+    parser.add_argument("--partial-rate", type=float, default=defaults.partial_rate)
+    parser.add_argument("--chunk-chars", type=int, default=defaults.chunk_chars)
+    parser.add_argument("--chunk-delay", type=float, default=defaults.chunk_delay)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def profile_from_arguments(args: argparse.Namespace) -> FakeGeminiProfile:
+    return FakeGeminiProfile(**{field: getattr(args, field) for field in FakeGeminiProfile._fields})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    profile_arguments(parser)
+    args = parser.parse_args()
+
+    uvicorn.run(build_fake_gemini(profile_from_arguments(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
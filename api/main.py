@@ -1,25 +1,41 @@
+import time
 import warnings
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-import os
 
-from app.routers import elicit, validate
+# Load environment variables
+load_dotenv()
+
 from app.core.config import settings
+from app.core.logging_config import configure_logging, stop_logging, request_id_var, new_request_id
+from app.core.metrics import registry, http_requests_total, http_request_seconds
+
+# Configure logging before the services below are created, so their start-up messages use it
+configure_logging(settings.log_level, settings.log_format, settings.log_queue)
+
+from app.routers import elicit, validate
+from app.services.validation_pool import validation_pool
 
 # Suppress Pydantic field shadowing warnings from Google Generative AI SDK
 warnings.filterwarnings("ignore", message="Field name .* shadows an attribute in parent")
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+logger.info("Starting Praxify API")
+if not settings.gemini_api_key:
+    logger.warning("GEMINI_API_KEY not found in environment variables")
 
-# Debug environment variables
-print("🔧 Starting Praxify API...")
-print(f"🔑 GEMINI_API_KEY available: {bool(os.getenv('GEMINI_API_KEY'))}")
-if os.getenv('GEMINI_API_KEY'):
-    print(f"🔑 GEMINI_API_KEY preview: {os.getenv('GEMINI_API_KEY')[:10]}...")
-else:
-    print("❌ GEMINI_API_KEY not found in environment variables")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start validation workers up front so their models are warm before traffic arrives
+    validation_pool.start()
+    yield
+    validation_pool.shutdown()
+    stop_logging()
 
 # Create FastAPI app
 app = FastAPI(
@@ -27,7 +43,8 @@ app = FastAPI(
     description="AI-powered requirements elicitation and validation API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -39,6 +56,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """Tag every log line of a request with its id (taken from X-Request-ID when given)."""
+    request_id = request.headers.get("x-request-id") or new_request_id()
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    """Count requests by route and status and record their latency."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template rather than raw path to keep label cardinality bounded
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        http_requests_total.inc(route=route_path, method=request.method, status=status)
+        http_request_seconds.observe(time.perf_counter() - started, route=route_path, method=request.method)
+
 # Include routers
 app.include_router(elicit.router, prefix="/api", tags=["elicitation"])
 app.include_router(validate.router, prefix="/api", tags=["validation"])
@@ -51,6 +96,11 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "Praxify API"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (text exposition format 0.0.4)."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -58,4 +108,4 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=7001,
         reload=settings.reload
-    ) 
\ No newline at end of file
+    )
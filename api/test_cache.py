@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the validation result cache.
+Run with pytest or directly: python test_cache.py
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from app.services.cache import ElicitationCache, LRUCache, ValidationResultCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_lru_expires_entries():
+    cache = LRUCache(max_entries=2, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+
+
+def test_key_changes_with_rule_set_version():
+    key = ValidationResultCache.make_key("v1", "The system should be fast.", ["clarity", "ambiguity"])
+    assert key == ValidationResultCache.make_key("v1", "The system should be fast.", ["ambiguity", "clarity"])
+    assert key == ValidationResultCache.make_key("v1", "The system should be fast.", [" Ambiguity", "CLARITY"])
+    assert key != ValidationResultCache.make_key("v2", "The system should be fast.", ["clarity", "ambiguity"])
+    assert key != ValidationResultCache.make_key("v1", "The system should be fast.", ["clarity", "ambiguity"], "fast")
+
+
+def test_shared_tier_is_reused_across_instances():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        result = {"issues": [], "score": 100.0}
+        asyncio.run(ValidationResultCache(True, 8, 60, path).set("key", result))
+        other_worker = ValidationResultCache(True, 8, 60, path)
+        assert asyncio.run(other_worker.get("key")) == result
+        assert other_worker.shared.hits == 1
+
+
+def test_elicitation_key_ignores_whitespace_and_case():
+    key = ElicitationCache.make_key("A food  ordering app\n", "gemini", "prompt-v1")
+    assert key == ElicitationCache.make_key("a FOOD ordering app", "gemini", "prompt-v1")
+    assert key != ElicitationCache.make_key("a FOOD ordering app", "gemini", "prompt-v2")
+
+
+def test_elicitation_store_opens_on_first_use():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "elicitation.db")
+        cache = ElicitationCache(True, "sqlite", 8, 60, path, "elicitation_cache")
+        assert not os.path.exists(path)
+        asyncio.run(cache.set("key", {"questions": []}))
+        assert os.path.exists(path)
+        assert asyncio.run(cache.get("key")) == {"questions": []}
+
+
+if __name__ == "__main__":
+    test_lru_evicts_least_recently_used()
+    test_lru_expires_entries()
+    test_key_changes_with_rule_set_version()
+    test_shared_tier_is_reused_across_instances()
+    test_elicitation_key_ignores_whitespace_and_case()
+    test_elicitation_store_opens_on_first_use()
+    print("✅ Cache tests passed")
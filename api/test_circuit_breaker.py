@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the circuit breaker and cached health probing.
+Run with pytest or directly: python test_circuit_breaker.py
+"""
+
+import asyncio
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")  # the module-level service needs a key
+
+from google.genai import errors  # noqa: E402
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError  # noqa: E402
+from app.services.gemini_service import GeminiService, _is_quota_error, _is_retryable  # noqa: E402
+from app.services.rate_limit import QuotaExceededError, RateLimitedCaller  # noqa: E402
+
+
+def make_breaker(probe):
+    return CircuitBreaker(name="test", probe=probe, failure_threshold=3, reset_timeout=0.05, health_ttl=60)
+
+
+def test_opens_after_threshold_and_closes_after_background_probe():
+    upstream_up = False
+
+    async def probe():
+        if not upstream_up:
+            raise ConnectionError("down")
+        return "up"
+
+    async def run():
+        nonlocal upstream_up
+        breaker = make_breaker(probe)
+        for _ in range(3):
+            breaker.check()
+            breaker.record_failure()
+        try:
+            breaker.check()
+        except CircuitOpenError as e:
+            assert e.retry_after > 0
+        else:
+            raise AssertionError("expected the circuit to be open")
+
+        await asyncio.sleep(0.08)  # a failing background probe keeps it open
+        assert breaker.state == CircuitBreaker.OPEN
+        upstream_up = True
+        await asyncio.sleep(0.1)
+        return breaker
+
+    breaker = asyncio.run(run())
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.rejected == 1
+    assert breaker.probes >= 2
+
+
+def test_health_probe_is_cached():
+    calls = 0
+
+    async def probe():
+        nonlocal calls
+        calls += 1
+        return {"model": "test"}
+
+    async def run():
+        breaker = make_breaker(probe)
+        results = await asyncio.gather(*(breaker.health() for _ in range(5)))
+        results.append(await breaker.health())
+        return results
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert all(result["ok"] for result in results)
+
+
+def test_failing_streams_open_the_gemini_circuit():
+    service = GeminiService(api_key="test-key")
+    service.limiter = RateLimitedCaller(
+        name="Gemini", requests_per_minute=6000.0, burst=100, max_concurrency=4, max_retries=1,
+        backoff_base=0.001, backoff_max=0.001, deadline=1.0,
+        is_retryable=_is_retryable, is_quota_error=_is_quota_error
+    )
+    service.breaker = make_breaker(service._probe)
+
+    async def exhausted():
+        # Like generate_content_stream, the request only fails once iterated
+        raise errors.APIError(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}})
+        yield
+
+    async def open_stream():
+        return exhausted()
+
+    async def run():
+        outcomes = []
+        for _ in range(4):
+            try:
+                async for _ in service._guarded_stream("stream", open_stream):
+                    pass
+            except (QuotaExceededError, CircuitOpenError) as e:
+                outcomes.append(type(e))
+        service.breaker._probe_task.cancel()
+        return outcomes
+
+    outcomes = asyncio.run(run())
+    assert outcomes == [QuotaExceededError] * 3 + [CircuitOpenError]
+    assert service.breaker.state == CircuitBreaker.OPEN
+    assert service.limiter.upstream_quota_errors == 6
+
+
+if __name__ == "__main__":
+    test_opens_after_threshold_and_closes_after_background_probe()
+    test_health_probe_is_cached()
+    test_failing_streams_open_the_gemini_circuit()
+    print("✅ Circuit breaker tests passed")
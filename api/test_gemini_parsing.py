@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for schema-validated parsing of Gemini elicitation output.
+Run with pytest or directly: python test_gemini_parsing.py
+"""
+
+import asyncio
+import json
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")  # the module-level service needs a key
+
+from app.controllers.elicitation_controller import ElicitationController  # noqa: E402
+from app.core.metrics import registry  # noqa: E402
+from app.models.elicitation import ElicitationRequest  # noqa: E402
+from app.services.cache import elicitation_cache  # noqa: E402
+from app.services.gemini_service import GeminiService, gemini_service  # noqa: E402
+
+COMPLETION = {
+    "questions": [{"question": "Siapa pengguna utama?", "category": "user", "priority": "high"}],
+    "personas": [{
+        "name": "Pelanggan",
+        "role": "End User",
+        "description": "Memesan makanan dari ponsel",
+        "goals": ["Memesan dengan cepat"],
+        "pain_points": ["Antrian panjang"]
+    }],
+    "summary": "Aplikasi pemesanan restoran",
+    "next_steps": ["Tentukan fitur inti"]
+}
+
+
+def test_valid_completion_is_validated_directly():
+    service = GeminiService(api_key="test-key")
+    assert service._parse_elicitation_response(json.dumps(COMPLETION)) == COMPLETION
+    assert service.stats()["parse_failures"] == 0
+
+
+def parse_failures_exported():
+    for line in registry.render().splitlines():
+        if line.startswith("praxify_gemini_parse_failures_total "):
+            return float(line.split()[1])
+    return 0.0
+
+
+def test_truncated_completion_is_counted_and_falls_back():
+    service = GeminiService(api_key="test-key")
+    exported = parse_failures_exported()
+    result = service._parse_elicitation_response(json.dumps(COMPLETION)[:120])
+    assert result["is_fallback"]
+    assert service.stats()["parse_failures"] == 1
+    assert service.stats()["parse_failure_rate"] == 1.0
+    assert parse_failures_exported() == exported + 1
+
+
+def test_fallbacks_are_flagged_to_clients_and_not_cached():
+    fallback = GeminiService(api_key="test-key")._parse_elicitation_response("{")
+    cached = {}
+
+    async def generate(idea):
+        return fallback
+
+    async def cache_set(key, value):
+        cached[key] = value
+
+    original = gemini_service.generate_elicitation_content_async, elicitation_cache.set
+    gemini_service.generate_elicitation_content_async, elicitation_cache.set = generate, cache_set
+    try:
+        response = asyncio.run(ElicitationController.process_elicitation(
+            ElicitationRequest(idea="A food ordering app for restaurants", bypass_cache=True)
+        ))
+    finally:
+        gemini_service.generate_elicitation_content_async, elicitation_cache.set = original
+    assert response.is_fallback
+    assert cached == {}
+
+
+def test_prompt_version_tracks_the_response_schema():
+    service = GeminiService(api_key="test-key")
+    assert service.prompt_version == GeminiService(api_key="test-key").prompt_version
+    assert service._generation_config().response_mime_type == "application/json"
+
+
+if __name__ == "__main__":
+    test_valid_completion_is_validated_directly()
+    test_truncated_completion_is_counted_and_falls_back()
+    test_fallbacks_are_flagged_to_clients_and_not_cached()
+    test_prompt_version_tracks_the_response_schema()
+    print("✅ Gemini parsing tests passed")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental JSON parser used by streamed elicitation.
+Run with pytest or directly: python test_json_stream.py
+"""
+
+import json
+
+from app.services.json_stream import IncrementalArrayParser
+
+COMPLETION = "```json\n" + json.dumps({
+    "questions": [
+        {"question": "Siapa pengguna {utama}?", "category": "user", "priority": "high"},
+        {"question": "Apa \"target\" bisnisnya?", "category": "business", "priority": "medium"}
+    ],
+    "personas": [
+        {"name": "Pelanggan", "role": "End User", "description": "Memesan [makanan]",
+         "goals": ["Cepat"], "pain_points": ["Antrian"]}
+    ],
+    "summary": "Ringkasan {analisis}",
+    "next_steps": ["Tentukan fitur inti"]
+}, ensure_ascii=False) + "\n```"
+
+
+def parse_in_chunks(text, size):
+    parser = IncrementalArrayParser(frozenset({"questions", "personas"}))
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start:start + size]))
+    return items
+
+
+def test_items_are_emitted_for_any_chunking():
+    expected = json.loads(COMPLETION.strip("`json\n"))
+    for size in [1, 2, 7, 64, len(COMPLETION)]:
+        items = parse_in_chunks(COMPLETION, size)
+        assert [item for key, item in items if key == "questions"] == expected["questions"]
+        assert [item for key, item in items if key == "personas"] == expected["personas"]
+
+
+def test_item_is_emitted_as_soon_as_it_closes():
+    parser = IncrementalArrayParser(frozenset({"questions"}))
+    assert parser.feed('{"questions": [{"question": "A", "category": "user", "priority": "high"') == []
+    assert parser.feed('}, {"question": "B"') == [
+        ("questions", {"question": "A", "category": "user", "priority": "high"})
+    ]
+
+
+def test_truncated_completion_keeps_finished_items():
+    items = parse_in_chunks(COMPLETION[:COMPLETION.index("personas")], 5)
+    assert len(items) == 2
+
+
+if __name__ == "__main__":
+    test_items_are_emitted_for_any_chunking()
+    test_item_is_emitted_as_soon_as_it_closes()
+    test_truncated_completion_keeps_finished_items()
+    print("✅ Incremental JSON parser tests passed")
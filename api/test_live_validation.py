@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for live (WebSocket) validation sessions.
+Run with pytest or directly: python test_live_validation.py
+"""
+
+import asyncio
+
+from fastapi import FastAPI, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from app.routers.validate import router
+from app.services.live_validation import LiveValidationSession, LiveEditError
+from app.services.validation_pool import validation_pool
+
+model_ready = False
+
+
+async def fake_analyse_lines(lines, stage_names):
+    """One issue per non-blank line, quoting the line it was found on."""
+    return [{
+        "issues": [{
+            "type": "ambiguity",
+            "severity": "low",
+            "word_or_phrase": line.split()[0],
+            "context": line,
+            "suggestion": "",
+        }] if line.strip() else [],
+        "sections": [],
+        "has_person": False,
+        "mentions_roles": False,
+        "complete": model_ready
+    } for line in lines]
+
+
+def with_fake_pool(test):
+    def run():
+        global model_ready
+        original, validation_pool.analyse_lines = validation_pool.analyse_lines, fake_analyse_lines
+        model_ready = True
+        try:
+            test()
+        finally:
+            validation_pool.analyse_lines = original
+    run.__name__ = test.__name__
+    return run
+
+
+def contexts(snapshot):
+    return {issue["line_number"]: issue["context"] for issue in snapshot["issues"] if issue["id"].startswith("L")}
+
+
+@with_fake_pool
+def test_edit_returns_a_delta_for_the_changed_lines():
+    session = LiveValidationSession(["ambiguity"])
+
+    async def run():
+        await session.load("First line.\nSecond line.\nThird line.")
+        return await session.edit(1, 2, ["New second line.", "Inserted line."])
+
+    delta = asyncio.run(run())
+    assert delta["type"] == "delta"
+    assert delta["removed"] == ["L1.0"]
+    assert [(issue["id"], issue["line_number"]) for issue in delta["added"]] == [("L3.0", 2), ("L4.0", 3)]
+    assert delta["line_shift"] == {"after_line": 2, "delta": 1}
+    assert delta["issue_count"] == 4
+    assert contexts(session.snapshot()) == {
+        1: "First line.", 2: "New second line.", 3: "Inserted line.", 4: "Third line."
+    }
+
+
+@with_fake_pool
+def test_catch_up_keeps_each_line_with_its_own_analysis():
+    session = LiveValidationSession(["ambiguity"])
+
+    async def run():
+        global model_ready
+        model_ready = False
+        await session.load("Line zero is fast.\nLine one is secure.\nLine two is good.")
+        model_ready = True
+        # Removes a line that was still waiting for the model
+        return await session.edit(0, 1, ["Replacement line."])
+
+    delta = asyncio.run(run())
+    assert contexts(session.snapshot()) == {
+        1: "Replacement line.", 2: "Line one is secure.", 3: "Line two is good."
+    }
+    assert sorted(delta["removed"]) == ["L0.0", "L1.0", "L2.0"]
+    assert not delta["degraded"]
+
+
+@with_fake_pool
+def test_out_of_range_edits_are_rejected():
+    session = LiveValidationSession()
+
+    async def run():
+        await session.load("Only line.")
+        await session.edit(2, 3, ["x"])
+
+    try:
+        asyncio.run(run())
+    except LiveEditError:
+        pass
+    else:
+        raise AssertionError("expected LiveEditError")
+
+
+@with_fake_pool
+def test_malformed_messages_are_answered_without_closing_the_socket():
+    app = FastAPI()
+    app.include_router(router)
+
+    with TestClient(app).websocket_connect("/validate/live") as websocket:
+        for message in ["[]", '"x"', "not json", '{"type": "init", "document": 1}',
+                        '{"type": "init", "focus_areas": [1]}']:
+            websocket.send_text(message)
+            assert websocket.receive_json()["type"] == "error"
+
+        websocket.send_json({"type": "init", "document": "First line."})
+        assert websocket.receive_json()["type"] == "snapshot"
+        websocket.send_json({"type": "edit", "start": 0, "end": 1, "lines": [None]})
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_json({"type": "edit", "start": 0, "end": 1, "lines": ["Changed line."]})
+        assert websocket.receive_json()["type"] == "delta"
+
+
+def test_unexpected_errors_send_an_error_and_close_the_socket():
+    app = FastAPI()
+    app.include_router(router)
+
+    async def crash(lines, stage_names):
+        raise RuntimeError("worker crashed")
+
+    original, validation_pool.analyse_lines = validation_pool.analyse_lines, crash
+    try:
+        with TestClient(app).websocket_connect("/validate/live") as websocket:
+            websocket.send_json({"type": "init", "document": "First line."})
+            assert websocket.receive_json()["type"] == "error"
+            try:
+                websocket.receive_json()
+            except WebSocketDisconnect as e:
+                assert e.code == 1011
+            else:
+                raise AssertionError("expected the socket to close")
+    finally:
+        validation_pool.analyse_lines = original
+
+
+if __name__ == "__main__":
+    test_edit_returns_a_delta_for_the_changed_lines()
+    test_catch_up_keeps_each_line_with_its_own_analysis()
+    test_out_of_range_edits_are_rejected()
+    test_malformed_messages_are_answered_without_closing_the_socket()
+    test_unexpected_errors_send_an_error_and_close_the_socket()
+    print("✅ Live validation tests passed")
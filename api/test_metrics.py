@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus text exposition of the API metrics.
+Run with pytest or directly: python test_metrics.py
+"""
+
+from app.core.metrics import MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "Stage latency", buckets=(0.01, 0.1, 1.0), labelnames=["stage"])
+    for value in (0.005, 0.05, 0.05, 5.0):
+        histogram.observe(value, stage="rules")
+
+    text = registry.render()
+    assert "# TYPE stage_seconds histogram" in text
+    assert 'stage_seconds_bucket{stage="rules",le="0.01"} 1' in text
+    assert 'stage_seconds_bucket{stage="rules",le="0.1"} 3' in text
+    assert 'stage_seconds_bucket{stage="rules",le="1"} 3' in text
+    assert 'stage_seconds_bucket{stage="rules",le="+Inf"} 4' in text
+    assert 'stage_seconds_count{stage="rules"} 4' in text
+    assert 'stage_seconds_sum{stage="rules"} 5.105' in text
+
+
+def test_counter_labels_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ["route", "status"])
+    counter.inc(route='/api/"x"', status=200)
+    counter.inc(route='/api/"x"', status=200)
+    assert 'requests_total{route="/api/\\"x\\"",status="200"} 2' in registry.render()
+
+
+if __name__ == "__main__":
+    test_histogram_buckets_are_cumulative()
+    test_counter_labels_are_escaped()
+    print("✅ Metrics tests passed")
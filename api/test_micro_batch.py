@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for micro-batching of concurrent validation requests.
+Run with pytest or directly: python test_micro_batch.py
+"""
+
+import asyncio
+
+from app.services.micro_batch import MicroBatcher
+from app.services.validation_pool import ValidationPool, PoolTimeoutError
+
+
+def test_concurrent_requests_share_one_batch_in_order():
+    batches = []
+
+    async def run_batch(documents, focus_areas, mode):
+        batches.append(list(documents))
+        return [{"result": {"document": document}} for document in documents]
+
+    batcher = MicroBatcher("test", run_batch, window=0.01, max_batch_size=16)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(f"doc {index}", ["ambiguity"]) for index in range(5)))
+
+    results = asyncio.run(run())
+    assert batches == [[f"doc {index}" for index in range(5)]]
+    assert [result["document"] for result in results] == [f"doc {index}" for index in range(5)]
+
+
+def test_full_batch_flushes_before_the_window_and_errors_stay_per_document():
+    batches = []
+
+    async def run_batch(documents, focus_areas, mode):
+        batches.append(len(documents))
+        return [{"error": "bad document"} if document == "bad" else {"result": document} for document in documents]
+
+    # A window long enough that only the size limit can flush within the test
+    batcher = MicroBatcher("test", run_batch, window=10.0, max_batch_size=3)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(document) for document in ["a", "bad", "c"]), return_exceptions=True),
+            timeout=1.0
+        )
+
+    results = asyncio.run(run())
+    assert batches == [3]
+    assert results[0] == "a" and results[2] == "c"
+    assert isinstance(results[1], Exception) and "bad document" in str(results[1])
+    assert batcher.stats()["largest_batch"] == 3
+
+
+def test_different_focus_areas_and_modes_are_not_mixed():
+    batches = []
+
+    async def run_batch(documents, focus_areas, mode):
+        batches.append((tuple(documents), tuple(focus_areas or ()), mode))
+        return [{"result": document} for document in documents]
+
+    batcher = MicroBatcher("test", run_batch, window=0.01, max_batch_size=16)
+
+    async def run():
+        await asyncio.gather(batcher.submit("a", ["ambiguity"]), batcher.submit("b", ["completeness"]),
+                             batcher.submit("c", ["Ambiguity"]), batcher.submit("d", ["ambiguity"], "fast"))
+
+    asyncio.run(run())
+    assert sorted(batches) == [
+        (("a", "c"), ("ambiguity",), "standard"),
+        (("b",), ("completeness",), "standard"),
+        (("d",), ("ambiguity",), "fast")
+    ]
+
+
+def test_small_batches_are_spread_over_every_worker():
+    pool = ValidationPool("thread", size=4, queue_depth=16, timeout=5)
+    chunks = []
+
+    async def run(func, documents, *args, timeout=None):
+        chunks.append(list(documents))
+        return [{"result": {"document": document}} for document in documents]
+
+    pool.run = run
+    documents = [f"doc {index}" for index in range(6)]
+    results = asyncio.run(pool.validate_batch(documents, batch_size=32))
+    assert chunks == [["doc 0", "doc 1"], ["doc 2", "doc 3"], ["doc 4", "doc 5"]]
+    assert [result["result"]["document"] for result in results] == documents
+
+
+def test_pool_errors_of_a_failed_chunk_reach_the_caller():
+    async def run_batch(documents, focus_areas, mode):
+        error = PoolTimeoutError("Validation did not finish within 30.0 seconds")
+        return [{"error": str(error), "exception": error} for _ in documents]
+
+    batcher = MicroBatcher("test", run_batch, window=0.01, max_batch_size=16)
+    try:
+        asyncio.run(batcher.submit("doc"))
+    except PoolTimeoutError:
+        pass
+    else:
+        raise AssertionError("expected PoolTimeoutError")
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_one_batch_in_order()
+    test_full_batch_flushes_before_the_window_and_errors_stay_per_document()
+    test_different_focus_areas_and_modes_are_not_mixed()
+    test_small_batches_are_spread_over_every_worker()
+    test_pool_errors_of_a_failed_chunk_reach_the_caller()
+    print("✅ Micro-batching tests passed")
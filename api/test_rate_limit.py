@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the client-side rate limiter and retry policy used for Gemini.
+Run with pytest or directly: python test_rate_limit.py
+"""
+
+import asyncio
+import time
+
+from app.services.rate_limit import RateLimitedCaller, QuotaExceededError, UpstreamUnavailableError
+
+
+class FakeQuotaError(Exception):
+    pass
+
+
+def make_caller(**overrides):
+    options = dict(
+        name="test",
+        requests_per_minute=600.0,
+        burst=2,
+        max_concurrency=2,
+        max_retries=3,
+        backoff_base=0.01,
+        backoff_max=0.05,
+        deadline=2.0,
+        is_retryable=lambda e: isinstance(e, FakeQuotaError),
+        is_quota_error=lambda e: isinstance(e, FakeQuotaError)
+    )
+    options.update(overrides)
+    return RateLimitedCaller(**options)
+
+
+def test_bucket_throttles_beyond_burst():
+    caller = make_caller()  # 10 requests per second after a burst of 2
+
+    async def run():
+        started = time.monotonic()
+        await asyncio.gather(*(caller.call(lambda: asyncio.sleep(0, result="ok")) for _ in range(4)))
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(run())
+    assert elapsed >= 0.15
+    assert caller.stats()["requests"] == 4
+
+
+def test_quota_errors_are_retried_then_succeed():
+    caller = make_caller()
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise FakeQuotaError("429 RESOURCE_EXHAUSTED")
+        return "ok"
+
+    assert asyncio.run(caller.call(flaky)) == "ok"
+    assert caller.retries == 2
+    assert caller.upstream_quota_errors == 2
+
+
+def test_persistent_quota_errors_raise_quota_exceeded():
+    caller = make_caller(max_retries=1)
+
+    async def exhausted():
+        raise FakeQuotaError("429 RESOURCE_EXHAUSTED")
+
+    try:
+        asyncio.run(caller.call(exhausted))
+    except QuotaExceededError as e:
+        assert e.retry_after > 0
+    else:
+        raise AssertionError("expected QuotaExceededError")
+    assert caller.gave_up == 1
+
+
+def test_non_retryable_errors_propagate_and_slow_calls_hit_the_deadline():
+    caller = make_caller(deadline=0.1)
+
+    async def broken():
+        raise KeyError("bad request")
+
+    for request, expected in [(broken, KeyError), (lambda: asyncio.sleep(1), UpstreamUnavailableError)]:
+        try:
+            asyncio.run(caller.call(request))
+        except expected:
+            pass
+        else:
+            raise AssertionError(f"expected {expected.__name__}")
+
+
+def test_stream_retries_the_first_chunk_and_holds_its_slot():
+    caller = make_caller()
+    opened = 0
+    in_flight = []
+
+    async def chunks():
+        nonlocal opened
+        opened += 1
+        if opened < 3:
+            raise FakeQuotaError("429 RESOURCE_EXHAUSTED")  # raised lazily, on the first chunk
+        for chunk in ["a", "b", "c"]:
+            in_flight.append(caller.in_flight)
+            yield chunk
+
+    async def run():
+        return [chunk async for chunk in caller.stream(lambda: asyncio.sleep(0, result=chunks()))]
+
+    assert asyncio.run(run()) == ["a", "b", "c"]
+    assert in_flight == [1, 1, 1]
+    assert caller.in_flight == 0
+    assert caller.retries == 2
+    assert caller.upstream_quota_errors == 2
+    assert caller.succeeded == 1
+
+
+def test_stream_errors_are_mapped_like_calls():
+    async def exhausted():
+        raise FakeQuotaError("429 RESOURCE_EXHAUSTED")
+        yield
+
+    async def fails_midway():
+        yield "a"
+        raise FakeQuotaError("429 RESOURCE_EXHAUSTED")
+
+    for chunks in [exhausted, fails_midway]:
+        caller = make_caller(max_retries=1)
+
+        async def run():
+            return [chunk async for chunk in caller.stream(lambda: asyncio.sleep(0, result=chunks()))]
+
+        try:
+            asyncio.run(run())
+        except QuotaExceededError:
+            pass
+        else:
+            raise AssertionError("expected QuotaExceededError")
+        assert caller.gave_up == 1
+        assert caller.succeeded == 0
+        assert caller.in_flight == 0
+
+
+if __name__ == "__main__":
+    test_bucket_throttles_beyond_burst()
+    test_quota_errors_are_retried_then_succeed()
+    test_persistent_quota_errors_raise_quota_exceeded()
+    test_non_retryable_errors_propagate_and_slow_calls_hit_the_deadline()
+    test_stream_retries_the_first_chunk_and_holds_its_slot()
+    test_stream_errors_are_mapped_like_calls()
+    print("✅ Rate limiter tests passed")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the precompiled rule matching used by ValidationService.
+Run with pytest or directly: python test_rule_engine.py
+"""
+
+import re
+
+from app.models.validation import IssueType, Severity
+from app.services.analysed_document import AnalysedDocument
+from app.services.rule_engine import CompiledRules, RuleCategory
+from app.services.validation_service import validation_service
+
+SAMPLE_DOCUMENTS = [
+    """
+    The system should be fast and user-friendly.
+    Users can access the data when needed.
+    The application should handle errors appropriately.
+    Performance should be good under normal conditions.
+    The system will be scalable and reliable.
+    The interface should be intuitive and easy to use, EASY and Easy.
+    """,
+    """
+    Sistem harus cepat dan mudah digunakan.
+    Aplikasi harus mudah, mudah digunakan dan dapat diperluas.
+    Sistem akan skalabel dan handal, kira-kira 10 detik atau kurang lebih.
+    Data bisa jadi berubah, barangkali sekitar seminggu.
+    """,
+    "fast\n\nfast-ish, user-friendly!mudah digunakan\tmudah\n  roughly about around",
+    "No issues here at all.\nJust concrete numbers: 200 ms, 99.9% uptime.",
+    "",
+]
+
+
+def legacy_ambiguity_issues(document):
+    """The original per-line, per-word ambiguity check."""
+    found = []
+    for line_num, line in enumerate(document.split('\n'), 1):
+        for word in validation_service.ambiguous_words:
+            if re.search(rf'\b{re.escape(word)}\b', line, re.IGNORECASE):
+                found.append((line_num, word, line.strip()))
+    return found
+
+
+def compiled_ambiguity_issues(document):
+    """Ambiguity issues produced by the compiled single-pass matcher."""
+    return [
+        (issue.line_number, issue.word_or_phrase, issue.context)
+        for issue in validation_service._rule_based_validation(AnalysedDocument(document))
+        if issue.type == IssueType.AMBIGUITY
+    ]
+
+
+def test_compiled_matcher_matches_legacy_output():
+    for document in SAMPLE_DOCUMENTS:
+        assert compiled_ambiguity_issues(document) == legacy_ambiguity_issues(document)
+
+
+def test_multi_word_phrases_are_reported_with_their_parts():
+    hits = validation_service.ambiguous_matcher.scan("Harus mudah digunakan.\nDapat diperluas nanti.")
+    assert set(hits[1]) == {"mudah", "mudah digunakan"}
+    assert hits[2] == ["dapat diperluas"]
+
+
+def test_compiled_rules_drop_duplicate_alternatives():
+    engine = validation_service.rule_engine
+    alternatives = [alt.lower() for alts in engine.alternatives.values() for alt in alts]
+    assert len(alternatives) == len(set(alternatives))
+
+
+def test_only_conflicts_between_categories_are_reported():
+    engine = CompiledRules([
+        RuleCategory("vague", IssueType.VAGUENESS, Severity.LOW, "", [r'\b(TBD|tbd)\b', r'\b(TBD|manual)\b']),
+        RuleCategory("debt", IssueType.TECHNICAL_DEBT, Severity.LOW, "", [r'\b(manual process|Manual)\b']),
+    ])
+    assert engine.alternatives == {"vague": ["manual", "TBD"], "debt": ["manual process"]}
+    assert engine.duplicates == ["'Manual' in debt duplicates 'manual' in vague"]
+    assert engine.overlaps == ["'manual' (vague) also matches inside 'manual process' (debt)"]
+
+
+def test_compiled_rules_tag_each_match_once():
+    document = "A manual process is TBD.\nThis depends on a temporary workaround."
+    found = [
+        (issue.line_number, issue.type, issue.word_or_phrase)
+        for issue in validation_service._rule_based_validation(AnalysedDocument(document))
+        if issue.type != IssueType.AMBIGUITY
+    ]
+    assert found == [
+        (1, IssueType.VAGUENESS, "TBD"),
+        (1, IssueType.TECHNICAL_DEBT, "manual process"),
+        (2, IssueType.TECHNICAL_DEBT, "temporary"),
+        (2, IssueType.TECHNICAL_DEBT, "workaround"),
+        (2, IssueType.BUSINESS_RISK, "depends on"),
+    ]
+
+
+if __name__ == "__main__":
+    test_compiled_matcher_matches_legacy_output()
+    test_multi_word_phrases_are_reported_with_their_parts()
+    test_compiled_rules_drop_duplicate_alternatives()
+    test_only_conflicts_between_categories_are_reported()
+    test_compiled_rules_tag_each_match_once()
+    print("✅ Rule engine tests passed")
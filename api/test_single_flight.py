@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight coalescing of concurrent identical requests.
+Run with pytest or directly: python test_single_flight.py
+"""
+
+import asyncio
+
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flights = SingleFlight("test")
+    upstream_calls = 0
+
+    async def work():
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(0.05)
+        return {"answer": 42}
+
+    async def run():
+        return await asyncio.gather(*(flights.do("same-idea", work) for _ in range(30)))
+
+    results = asyncio.run(run())
+    assert upstream_calls == 1
+    assert all(result == {"answer": 42} for result in results)
+    assert flights.stats() == {"calls": 30, "executed": 1, "coalesced": 29, "in_flight": 0}
+
+
+def test_errors_reach_every_waiter_and_keys_are_released():
+    flights = SingleFlight("test")
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        results = await asyncio.gather(*(flights.do("key", failing) for _ in range(3)), return_exceptions=True)
+        # Once the call has finished the next request runs again
+        later = await flights.do("key", lambda: asyncio.sleep(0, result="ok"))
+        return results, later
+
+    results, later = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert later == "ok"
+    assert flights.executed == 2
+
+
+if __name__ == "__main__":
+    test_concurrent_identical_calls_share_one_execution()
+    test_errors_reach_every_waiter_and_keys_are_released()
+    print("✅ Single-flight tests passed")
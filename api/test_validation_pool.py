@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the validation worker pool's admission control.
+Run with pytest or directly: python test_validation_pool.py
+"""
+
+import asyncio
+import time
+
+from app.services.validation_pool import ValidationPool, PoolSaturatedError, PoolTimeoutError
+
+
+def test_timed_out_tasks_keep_their_slot_until_they_finish():
+    pool = ValidationPool("thread", size=1, queue_depth=0, timeout=0.05)
+
+    async def run():
+        try:
+            await pool.run(time.sleep, 0.3)
+        except PoolTimeoutError:
+            pass
+        else:
+            raise AssertionError("expected PoolTimeoutError")
+
+        # The worker is still busy with the timed-out task
+        assert pool.in_flight == 1
+        try:
+            await pool.run(time.sleep, 0)
+        except PoolSaturatedError:
+            pass
+        else:
+            raise AssertionError("expected PoolSaturatedError")
+
+        await asyncio.sleep(0.4)
+        assert pool.in_flight == 0
+        await pool.run(time.sleep, 0)
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert pool.timed_out == 1 and pool.rejected == 1 and pool.completed == 1
+
+
+def test_a_failed_chunk_only_fails_its_own_documents():
+    pool = ValidationPool("thread", size=2, queue_depth=0, timeout=1.0)
+    timeouts = []
+
+    async def fake_run(func, documents, focus_areas, batch_size, mode, timeout=None):
+        timeouts.append(timeout)
+        if "slow" in documents:
+            raise PoolTimeoutError(f"Validation did not finish within {timeout} seconds")
+        return [{"result": document} for document in documents]
+
+    pool.run = fake_run
+    outcomes = asyncio.run(pool.validate_batch(["a", "b", "c", "slow", "e"], batch_size=2))
+    assert [outcome.get("result") for outcome in outcomes[:3]] == ["a", "b", "c"]
+    assert [outcome["error"] for outcome in outcomes[3:]] == ["Validation did not finish within 1.0 seconds"] * 2
+    assert isinstance(outcomes[3]["exception"], PoolTimeoutError)
+    # Each chunk gets the task timeout once per nlp.pipe batch it holds
+    assert timeouts == [2.0, 1.0]
+
+
+if __name__ == "__main__":
+    test_timed_out_tasks_keep_their_slot_until_they_finish()
+    test_a_failed_chunk_only_fails_its_own_documents()
+    print("✅ Validation pool tests passed")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Tests for ValidationService stage planning.
+Run with pytest or directly: python test_validation_service.py
+"""
+
+import time
+
+import spacy
+
+from app.models.validation import IssueType
+from app.services.analysed_document import AnalysedDocument
+from app.services.requirement_patterns import MODALS, VAGUE_MODIFIERS
+from app.services.validation_service import validation_service
+
+
+def stage_names(focus_areas):
+    return [stage.name for stage in validation_service.plan_stages(focus_areas)]
+
+
+def test_default_focus_areas_run_every_stage():
+    assert stage_names(["ambiguity", "completeness", "clarity"]) == ["rules", "ner", "completeness"]
+    assert stage_names(None) == ["rules", "ner", "completeness"]
+
+
+def test_ambiguity_only_skips_ner():
+    assert stage_names(["ambiguity"]) == ["rules"]
+    assert stage_names(["Completeness"]) == ["ner", "completeness"]
+
+
+def test_unknown_focus_areas_run_every_stage():
+    assert stage_names(["readability"]) == ["rules", "ner", "completeness"]
+
+
+def test_response_lists_stages_that_ran():
+    result = validation_service.validate_document("The system should be fast.", ["ambiguity"])
+    assert result["stages_run"] == ["rules"]
+    assert not result["degraded"]
+
+
+def test_stages_run_one_at_a_time_match_full_validation():
+    document = "The system should be fast and user-friendly.\nFeatures: reporting, etc."
+    focus_areas = ["ambiguity", "completeness"]
+    issues, stages_run = [], []
+    for stage in validation_service.plan_stages(focus_areas):
+        stage_result = validation_service.run_stage(stage.name, document)
+        if not stage_result["skipped"]:
+            issues.extend(stage_result["issues"])
+            stages_run.append(stage.name)
+    streamed = validation_service.build_result(document, issues, stages_run, degraded=False)
+    full = validation_service.validate_document(document, focus_areas)
+    assert streamed["score"] == full["score"]
+    assert streamed["issues"] == full["issues"]
+    assert streamed["summary"] == full["summary"]
+
+
+def test_batch_validation_matches_single_documents_in_order():
+    documents = [
+        "The system should be fast and user-friendly, etc.",
+        "Users must export reports as PDF.\nTBD: the legacy manual process",
+        "Sistem harus cepat dan mudah digunakan, dll.",
+    ]
+    focus_areas = ["ambiguity", "completeness"]
+    batch = validation_service.validate_documents(documents, focus_areas)
+    assert len(batch) == len(documents)
+    for document, outcome in zip(documents, batch):
+        single = validation_service.validate_document(document, focus_areas)
+        assert outcome["result"]["issues"] == single["issues"]
+        assert outcome["result"]["score"] == single["score"]
+
+
+def test_sentence_issues_carry_line_numbers_and_offsets():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("requirement_patterns")
+    text = "Users can export reports as PDF.\nThe system should be fast."
+    analysed = AnalysedDocument(text, nlp(text))
+    assert analysed.line_at(0) == 1 and analysed.line_at(text.index("The system")) == 2
+
+    [issue] = validation_service._check_entity_patterns(analysed)
+    assert issue.line_number == 2
+    assert text[issue.start_char:issue.end_char] == "The system"
+
+
+def test_modes_select_stage_tiers():
+    assert [stage.name for stage in validation_service.plan_stages(None, "fast")] == ["rules"]
+    assert [stage.name for stage in validation_service.plan_stages(None, "deep")] == [
+        "rules", "ner", "completeness", "consistency"
+    ]
+    assert validation_service.plan_stages(["completeness"], "fast") == []
+
+    document = "Users must export reports within 5 seconds.\nUsers must export reports within 3 seconds."
+    result = validation_service.validate_document(document, ["consistency"], "deep")
+    assert result["mode"] == "deep" and result["stages_run"] == ["consistency"]
+    [issue] = result["issues"]
+    assert issue.line_number == 2 and "line 1" in issue.suggestion
+
+
+def test_stages_expected_to_overrun_the_deadline_are_skipped():
+    def without_ner(names):
+        # The ner stage is planned too, and skipped or degraded depending on whether
+        # an earlier test has loaded the model
+        return [name for name in names if name != "ner"]
+
+    document = "The system should be fast.\nUsers need reports."
+    expired = validation_service.validate_document(document, ["ambiguity", "completeness"], deadline=time.time())
+    assert expired["stages_run"] == ["rules"] and without_ner(expired["stages_skipped"]) == ["completeness"]
+    assert expired["issues"] and expired["score"] < 100
+    assert expired["summary"].startswith("Partial result")
+
+    unscored = validation_service.validate_document(document, ["completeness"], deadline=time.time())
+    assert unscored["stages_run"] == [] and without_ner(unscored["stages_skipped"]) == ["completeness"]
+    assert unscored["score"] is None and unscored["summary"].startswith("Partial result")
+
+    generous = validation_service.validate_document(document, ["ambiguity", "completeness"], deadline=time.time() + 60)
+    assert without_ner(generous["stages_run"]) == ["rules", "completeness"] and generous["stages_skipped"] == []
+
+
+def parse_with_entities(text, entities):
+    """Parse with the pattern component and set entities, as the model's NER would."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("requirement_patterns")
+    doc = nlp(text)
+    spans = []
+    for phrase, label in entities.items():
+        start = text.index(phrase)
+        spans.append(doc.char_span(start, start + len(phrase), label=label))
+    doc.ents = spans
+    return AnalysedDocument(text, doc)
+
+
+def substring_ner_issues(analysed):
+    """The entity and sentence checks as they were before requirement_patterns: substring tests."""
+    issues = []
+    for ent in analysed.doc.ents:
+        lower = ent.sent.text.strip().lower()
+        if ent.label_ in ["PERSON", "ORG", "PRODUCT"]:
+            modifier = next((modifier for modifier in VAGUE_MODIFIERS if modifier in lower), None)
+            if modifier:
+                issues.append((IssueType.VAGUENESS, f"{modifier} {ent.text}", ent.start_char))
+                continue
+        if ent.label_ in ["PRODUCT", "ORG"] and any(word in lower for word in ["system", "platform", "tool"]):
+            if not any(word in lower for word in ["version", "specific", "particular"]):
+                issues.append((IssueType.INCOMPLETENESS, ent.text, ent.start_char))
+    for sent in analysed.doc.sents:
+        lower = sent.text.strip().lower()
+        if "the system" in lower and len(lower.split()) < 10 and any(f"{word} be" in lower for word in MODALS):
+            issues.append((IssueType.VAGUENESS, "the system", analysed.lower.find("the system", sent.start_char)))
+    return issues
+
+
+def ner_issues(analysed):
+    return [(issue.type, issue.word_or_phrase, issue.start_char) for issue in validation_service._ner_issues(analysed)]
+
+
+def test_pattern_component_matches_the_substring_checks():
+    documents = [
+        ("John Smith should be the appropriate administrator. The system will use Python for development.",
+         {"John Smith": "PERSON", "Python": "PRODUCT"}),
+        ("Microsoft Azure will be the cloud platform. The database should be good for our needs.",
+         {"Microsoft Azure": "ORG"}),
+        ("The system must be secure. Google Cloud is a suitable tool.\nJira version 9 is the tracking tool.",
+         {"Google Cloud": "ORG", "Jira": "PRODUCT"}),
+        ("Acme Corp provides the proper platform and a correct, good tool for every specific team.",
+         {"Acme Corp": "ORG"}),
+        ("THE SYSTEM CAN BE SLOW. The system may be replaced, and the system should be documented in detail today.",
+         {}),
+        ("Oracle is the reporting system of this particular team. Slack is the chat tool we use.",
+         {"Oracle": "ORG", "Slack": "PRODUCT"}),
+    ]
+    for text, entities in documents:
+        analysed = parse_with_entities(text, entities)
+        assert sorted(ner_issues(analysed), key=str) == sorted(substring_ner_issues(analysed), key=str), text
+
+
+def test_pattern_component_matches_whole_words():
+    # Intended differences from the substring checks, see requirement_patterns
+    analysed = parse_with_entities("Acme Corp sends incorrect totals to the billing subsystem.", {"Acme Corp": "ORG"})
+    assert substring_ner_issues(analysed) == [(IssueType.VAGUENESS, "correct Acme Corp", 0)]
+    assert ner_issues(analysed) == []
+
+    analysed = parse_with_entities("The system may become slow.", {})
+    assert substring_ner_issues(analysed) and not ner_issues(analysed)
+
+    analysed = parse_with_entities("Jira is the tool named in the specification.", {"Jira": "PRODUCT"})
+    assert substring_ner_issues(analysed) == []
+    assert ner_issues(analysed) == [(IssueType.INCOMPLETENESS, "Jira", 0)]
+
+
+if __name__ == "__main__":
+    test_default_focus_areas_run_every_stage()
+    test_ambiguity_only_skips_ner()
+    test_unknown_focus_areas_run_every_stage()
+    test_response_lists_stages_that_ran()
+    test_stages_run_one_at_a_time_match_full_validation()
+    test_batch_validation_matches_single_documents_in_order()
+    test_sentence_issues_carry_line_numbers_and_offsets()
+    test_modes_select_stage_tiers()
+    test_stages_expected_to_overrun_the_deadline_are_skipped()
+    test_pattern_component_matches_the_substring_checks()
+    test_pattern_component_matches_whole_words()
+    print("✅ Validation service tests passed")